@@ -1,17 +1,37 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.conf import init_redis, close_redis
+from app.db.indexes import create_indexes
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.endpoints.admin import router as admin_router
 from app.endpoints.cars import router as cars_router
+from app.endpoints.scrape import router as scrape_router
 from app.endpoints.users import router as users_router
 from app.endpoints.auth import router as auth_router
+from app.utils.auth_cache import listen_for_invalidations
+from app.utils.car_events import car_event_broadcaster
 from app.utils.default_user import create_default_user
+from app.utils.passwords import password_executor
+from app.utils.scrape_jobs import scrape_job_manager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    init_redis()
+    await create_indexes()
     await create_default_user()
+    await ScrapeJobCRUD().fail_orphaned()
+    invalidation_listener = asyncio.create_task(listen_for_invalidations())
+    car_event_reader = asyncio.create_task(car_event_broadcaster.run())
     yield
+    invalidation_listener.cancel()
+    car_event_reader.cancel()
+    await scrape_job_manager.shutdown()
+    await close_redis()
+    password_executor.shutdown(wait=False)
     print("Application is shutting down.")
 
 
@@ -25,3 +45,5 @@ app = FastAPI(
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(users_router, prefix="/users", tags=["Users"])
 app.include_router(cars_router, prefix="/cars", tags=["Cars"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
+app.include_router(scrape_router, prefix="/scrape", tags=["Scrape"])
@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.conf import (
+    IMPORT_TIME_BUDGET_MS,
+    IMPORT_TIME_MODULES,
+    SNAPSHOT_DIR,
+    STALE_LISTING_DAYS,
+)
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from app.utils.import_time import measure_import_time
+
+
+async def snapshot(args: argparse.Namespace):
+    from app.utils.snapshot import write_snapshot
+
+    summary = await write_snapshot(args.output, incremental=not args.full)
+    print(f"Snapshot completed: {summary}")
+
+
+async def rebuild_stats(args: argparse.Namespace):
+    entries = await CarStatsCRUD().rebuild()
+    print(f"Stats rebuilt: {entries} make/model/year entries")
+
+
+async def archive_stale(args: argparse.Namespace):
+    seen_before = datetime.now() - timedelta(days=args.days)
+    archived = await CarCRUD().archive_stale(seen_before, source_site=args.site)
+    print(f"Archived {archived} stale listings")
+
+
+async def rebuild_clusters(args: argparse.Namespace):
+    clusters = await CarCRUD().rebuild_clusters()
+    print(f"Duplicate clusters rebuilt: {clusters} clusters")
+
+
+async def merge_listings(args: argparse.Namespace):
+    from app.db.indexes import create_indexes
+
+    counts = await CarCRUD().merge_duplicate_listings()
+    print(
+        f"Merged {counts['merged']} duplicate documents into their listings, "
+        f"archived {counts['archived']} documents without a listing URL"
+    )
+    await create_indexes()
+    print("Indexes created")
+
+
+async def import_time(args: argparse.Namespace):
+    modules = args.module or [
+        module.strip() for module in IMPORT_TIME_MODULES.split(",") if module.strip()
+    ]
+    over_budget = []
+    for module in modules:
+        total, imports = await measure_import_time(module, runs=args.runs)
+        print(f"{module}: {total:.0f} ms (budget {args.budget_ms} ms)")
+        for name, cumulative in imports[:5]:
+            print(f"    {cumulative:8.1f} ms  {name}")
+        if total > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the import time budget: {', '.join(over_budget)}")
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Car parser management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Write the cars collection to partitioned Parquet files"
+    )
+    snapshot_parser.add_argument("--output", default=SNAPSHOT_DIR)
+    snapshot_parser.add_argument(
+        "--full", action="store_true", help="Rewrite the snapshot from scratch"
+    )
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    stats_parser = subparsers.add_parser(
+        "rebuild-stats", help="Recompute the materialized car price statistics"
+    )
+    stats_parser.set_defaults(handler=rebuild_stats)
+
+    archive_parser = subparsers.add_parser(
+        "archive-stale", help="Move listings not seen by recent crawls to the archive"
+    )
+    archive_parser.add_argument("--days", type=int, default=STALE_LISTING_DAYS)
+    archive_parser.add_argument("--site", help="Only archive listings of this site")
+    archive_parser.set_defaults(handler=archive_stale)
+
+    clusters_parser = subparsers.add_parser(
+        "rebuild-clusters", help="Recompute cross-site duplicate clusters of all cars"
+    )
+    clusters_parser.set_defaults(handler=rebuild_clusters)
+
+    merge_parser = subparsers.add_parser(
+        "merge-listings",
+        help="Merge documents of the same listing, then create the indexes",
+    )
+    merge_parser.set_defaults(handler=merge_listings)
+
+    import_time_parser = subparsers.add_parser(
+        "import-time", help="Fail if modules take longer than the budget to import"
+    )
+    import_time_parser.add_argument(
+        "--module", action="append", help="Module to check, repeatable"
+    )
+    import_time_parser.add_argument(
+        "--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS
+    )
+    import_time_parser.add_argument("--runs", type=int, default=3)
+    import_time_parser.set_defaults(handler=import_time)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
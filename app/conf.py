@@ -1,10 +1,13 @@
 import os
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional
 
 from dotenv import load_dotenv
-from fake_useragent import UserAgent
-from motor.motor_asyncio import AsyncIOMotorClient
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+
+if TYPE_CHECKING:
+    from fake_useragent import UserAgent
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 # Load environment variables
 load_dotenv()
@@ -13,19 +16,103 @@ load_dotenv()
 MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 MONGODB_DB: str = os.getenv("MONGODB_DB", "car_listings")
 
-# Database client instance
-client = AsyncIOMotorClient(MONGODB_URL)
-database = client[MONGODB_DB]
+# Database client, created by get_database on first use
+mongo_client: Optional["AsyncIOMotorClient"] = None
+
+
+def get_database() -> "AsyncIOMotorDatabase":
+    """Return the application database, creating the Mongo client if needed."""
+    global mongo_client
+    if mongo_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        mongo_client = AsyncIOMotorClient(MONGODB_URL)
+    return mongo_client[MONGODB_DB]
+
 
 # Collections
 CAR_COLLECTION: str = "cars"
 USER_COLLECTION: str = "users"
+CAR_STATS_COLLECTION: str = "car_stats"
+CAR_PRICE_HISTORY_COLLECTION: str = "car_price_history"
+CAR_ARCHIVE_COLLECTION: str = "cars_archive"
+CRAWL_SCHEDULE_COLLECTION: str = "crawl_schedule"
+SCRAPE_JOB_COLLECTION: str = "scrape_jobs"
+
+# Maximum number of scrape jobs started through the API running at once
+SCRAPE_MAX_JOBS: int = int(os.getenv("SCRAPE_MAX_JOBS", "2"))
+# Scrape jobs report a heartbeat every SCRAPE_JOB_HEARTBEAT seconds, and
+# active jobs without one for SCRAPE_JOB_TIMEOUT seconds are marked failed
+SCRAPE_JOB_HEARTBEAT: int = int(os.getenv("SCRAPE_JOB_HEARTBEAT", "30"))
+SCRAPE_JOB_TIMEOUT: int = int(os.getenv("SCRAPE_JOB_TIMEOUT", "120"))
+
+# Listings not seen by a crawl for this many days are moved to the archive
+STALE_LISTING_DAYS: int = int(os.getenv("STALE_LISTING_DAYS", "14"))
+ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+# Archived listings are deleted after this many days, 0 keeps them forever
+ARCHIVE_TTL_DAYS: int = int(os.getenv("ARCHIVE_TTL_DAYS", "0"))
+
+# Export settings
+EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Maximum number of items in a bulk car request
+BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+# Snapshot settings
+SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_BATCH_SIZE: int = int(os.getenv("SNAPSHOT_BATCH_SIZE", "50000"))
+
+# Recrawl scheduler
+CRAWL_SITES: str = os.getenv("CRAWL_SITES", "autoria,autobazar")
+# Comma-separated makes to crawl, empty crawls every make the site offers
+CRAWL_MAKES: str = os.getenv("CRAWL_MAKES", "")
+CRAWL_REQUESTS_PER_HOUR: int = int(os.getenv("CRAWL_REQUESTS_PER_HOUR", "600"))
+CRAWL_CONCURRENCY: int = int(os.getenv("CRAWL_CONCURRENCY", "5"))
+CRAWL_MIN_INTERVAL: int = int(os.getenv("CRAWL_MIN_INTERVAL", "900"))
+CRAWL_MAX_INTERVAL: int = int(os.getenv("CRAWL_MAX_INTERVAL", "86400"))
+CRAWL_DEFAULT_INTERVAL: int = int(os.getenv("CRAWL_DEFAULT_INTERVAL", "3600"))
+# New or changed listings a crawl should find on average
+CRAWL_TARGET_CHANGES: float = float(os.getenv("CRAWL_TARGET_CHANGES", "5"))
+
+# Cold start budget checked by `python -m app.cli import-time`
+IMPORT_TIME_BUDGET_MS: int = int(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+IMPORT_TIME_MODULES: str = os.getenv(
+    "IMPORT_TIME_MODULES", "app.app,app.scraper.job,app.scraper.scheduler"
+)
 
 # PROXY SERVER
 PROXY: str | None = os.getenv("PROXY")
 
-# FAKE AGENT
-ua = UserAgent()
+# Scraped cars are written in batches of up to WRITER_BATCH_SIZE, at the
+# latest WRITER_FLUSH_INTERVAL_MS after the first car of a batch arrived
+WRITER_BATCH_SIZE: int = int(os.getenv("WRITER_BATCH_SIZE", "100"))
+WRITER_FLUSH_INTERVAL_MS: int = int(os.getenv("WRITER_FLUSH_INTERVAL_MS", "500"))
+WRITER_QUEUE_SIZE: int = int(os.getenv("WRITER_QUEUE_SIZE", "1000"))
+WRITER_MAX_RETRIES: int = int(os.getenv("WRITER_MAX_RETRIES", "5"))
+
+# Where scrape runs write cars: mongo, null or jsonl:<path>, comma-separated
+# to write to several at once (e.g. mongo,jsonl:data/cars.jsonl.gz)
+SCRAPER_SINK: str = os.getenv("SCRAPER_SINK", "mongo")
+JSONL_SINK_BUFFER_BYTES: int = int(os.getenv("JSONL_SINK_BUFFER_BYTES", "1048576"))
+
+# Scraper identities (user agent, cookie jar and connections) and the
+# requests per minute each may send, 0 for no limit
+SCRAPER_IDENTITIES: int = int(os.getenv("SCRAPER_IDENTITIES", "4"))
+IDENTITY_REQUESTS_PER_MINUTE: int = int(os.getenv("IDENTITY_REQUESTS_PER_MINUTE", "60"))
+
+# FAKE AGENT, created by get_user_agent on first use
+ua: Optional["UserAgent"] = None
+
+
+def get_user_agent() -> "UserAgent":
+    """Return the shared fake user agent generator, loading its data if needed."""
+    global ua
+    if ua is None:
+        from fake_useragent import UserAgent
+
+        ua = UserAgent()
+    return ua
+
 
 # JWT settings
 JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "secret")
@@ -36,21 +123,57 @@ JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
 HOST_REDIS: str = os.getenv("HOST_REDIS", "redis")
 PORT_REDIS: str = os.getenv("PORT_REDIS", "6379")
 DB_REDIS: str = os.getenv("DB_REDIS", "0")
+REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT: int = int(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+# Shared Redis client, created by init_redis
+redis_client: Optional[Redis] = None
+
+
+def init_redis() -> Redis:
+    """Create the shared Redis client and its connection pool."""
+    global redis_client
+    if redis_client is None:
+        pool = BlockingConnectionPool(
+            host=HOST_REDIS,
+            port=int(PORT_REDIS),
+            db=int(DB_REDIS),
+            decode_responses=True,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            timeout=REDIS_POOL_TIMEOUT,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        redis_client = Redis(connection_pool=pool)
+    return redis_client
+
+
+async def close_redis():
+    """Close the shared Redis client and disconnect its pool."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.connection_pool.aclose()
+        redis_client = None
 
 
 @asynccontextmanager
 async def get_redis():
-    redis_client = Redis(
-        host=HOST_REDIS,
-        port=int(PORT_REDIS),
-        db=DB_REDIS,
-        decode_responses=True,
-    )
-    try:
-        yield redis_client
-    finally:
-        await redis_client.aclose()
+    yield init_redis()
+
+
+# Live car events (Redis stream) and the /cars/stream endpoint
+CAR_EVENTS_STREAM: str = os.getenv("CAR_EVENTS_STREAM", "cars:events")
+CAR_EVENTS_MAXLEN: int = int(os.getenv("CAR_EVENTS_MAXLEN", "10000"))
+CAR_STREAM_QUEUE_SIZE: int = int(os.getenv("CAR_STREAM_QUEUE_SIZE", "100"))
+CAR_STREAM_HEARTBEAT: int = int(os.getenv("CAR_STREAM_HEARTBEAT", "15"))
+
+# In-process authentication cache
+AUTH_CACHE_TTL: int = int(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
 
+# Password hashing
+BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
 
 # Default user
 DEFAULT_USER_NAME: str = os.getenv("DEFAULT_USER_NAME", "admin")
@@ -1,63 +1,428 @@
+import logging
+import re
 from datetime import datetime
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, Iterable, List, Union, Optional, AsyncIterator, Tuple
+from urllib.parse import urlparse
 
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import (
+    BulkWriteError,
+    ConnectionFailure,
+    DuplicateKeyError,
+    OperationFailure,
+)
+from tenacity import (
+    AsyncRetrying,
+    after_log,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
-from app.conf import database, CAR_COLLECTION
+from app.conf import (
+    get_database,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_TTL_DAYS,
+    CAR_ARCHIVE_COLLECTION,
+    CAR_COLLECTION,
+)
+from app.db.car_dedupe import (
+    BLOCK_FIELDS,
+    CLUSTER_FIELDS,
+    DEDUPE_PROJECTION,
+    PRIMARY_QUERY,
+    assign_clusters,
+    block_key,
+    candidate_keys,
+    elect_primaries,
+)
+from app.db.car_stats_db import CarStatsCRUD, STATS_PROJECTION
+from app.db.price_history_db import PriceHistoryCRUD
 from app.db.utils import convert_object_id_to_str
 from app.exceptions.car_exceptions import (
     InvalidCarIDException,
     CarNotFoundException,
     CarAlreadyExistsException,
 )
-from app.schemas.cars import CarCreate, CarUpdate
+from app.schemas.cars import CAR_FIELDS, CarCreate, CarUpdate
+from app.utils.car_events import publish_car_events
+
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# A listing is identified by where it was scraped from, so price changes
+# update the existing document instead of creating a new one
+IDENTITY_FIELDS = ["source_site", "source_url"]
+# Fields whose change is recorded in the price history
+HISTORY_FIELDS = ["price", "mileage"]
+# Fields refreshed by every crawl that sees a listing, not changes to it
+SEEN_FIELDS = ["last_seen_at", "source_page"]
+
+
+def prepare_car(car_data: Union[CarCreate, Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a car document ready for insertion."""
+    if hasattr(car_data, "model_dump"):
+        car_data_dict = car_data.model_dump()
+    else:
+        car_data_dict = car_data
+
+    for key in ["image_url", "source_url"]:
+        if car_data_dict.get(key) is not None:
+            car_data_dict[key] = str(car_data_dict[key])
+
+    now = datetime.now()
+    car_data_dict["created_at"] = now
+    car_data_dict["updated_at"] = now
+    car_data_dict["last_seen_at"] = now
+    car_data_dict["block_key"] = block_key(car_data_dict)
+    return car_data_dict
+
+
+def has_listing_url(car: Dict[str, Any]) -> bool:
+    """Check that a car's source URL points to a listing, not a site root."""
+    source_url = car.get("source_url")
+    return bool(source_url) and urlparse(str(source_url)).path.strip("/") != ""
+
+
+def same_listing(before: Dict[str, Any], doc: Dict[str, Any]) -> bool:
+    """Check that a crawl found a stored listing without changes."""
+    return all(
+        before.get(key) == value for key, value in doc.items() if key not in SEEN_FIELDS
+    )
+
+
+def retrying(max_retries: int) -> AsyncRetrying:
+    """Retry transient connection errors up to ``max_retries`` attempts."""
+    return AsyncRetrying(
+        stop=stop_after_attempt(max(1, max_retries)),
+        wait=wait_exponential(multiplier=0.5, max=10),
+        retry=retry_if_exception_type(ConnectionFailure),
+        after=after_log(logger, log_level=logging.WARNING),
+        reraise=True,
+    )
+
+
+def car_projection(fields: Optional[List[str]] = None) -> Dict[str, int]:
+    """Build a Mongo projection for the requested response fields."""
+    projection = {field: 1 for field in fields or CAR_FIELDS if field != "id"}
+    return projection or {"_id": 1}
 
 
 class CarCRUD:
     def __init__(self):
-        self.collection = database[CAR_COLLECTION]
+        self.collection = get_database()[CAR_COLLECTION]
+        self.archive = get_database()[CAR_ARCHIVE_COLLECTION]
+        self.stats = CarStatsCRUD()
+        self.history = PriceHistoryCRUD()
 
     async def create_car(
         self, car_data: Union[CarCreate, Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Create a new car entry in the database."""
-        if hasattr(car_data, "model_dump"):
-            car_data_dict = car_data.model_dump()
-        else:
-            car_data_dict = car_data
+        car_data_dict = prepare_car(car_data)
+        car_data_dict["_id"] = ObjectId()
+        await self.link_duplicates([car_data_dict])
 
-        if await self.check_if_car_exists(car_data_dict):
+        try:
+            await self.collection.insert_one(car_data_dict)
+        except DuplicateKeyError:
             raise CarAlreadyExistsException()
 
-        for key in ["image_url", "source_url"]:
-            if key in car_data_dict and hasattr(car_data_dict[key], "__str__"):
-                car_data_dict[key] = str(car_data_dict[key])
+        await self.stats.record_added([car_data_dict])
+        await self.history.record([car_data_dict])
+        await publish_car_events("created", [car_data_dict])
+        return convert_object_id_to_str(car_data_dict)
+
+    async def upsert_listings(
+        self,
+        cars: List[Union[CarCreate, Dict[str, Any]]],
+        max_retries: int = 1,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Insert or refresh a batch of scraped listings with one bulk write.
+
+        Returns ``created``, ``updated`` or ``unchanged`` with the car of every
+        input. Only listings that actually changed get a new ``updated_at`` and,
+        when the price or mileage moved, a history point. When a batch repeats
+        a listing, only its last copy is written and the earlier ones are
+        ``unchanged``. Archived listings that are seen again are restored with
+        their ID, so their history continues.
+
+        Lookups and the bulk write are retried on connection errors, up to
+        ``max_retries`` attempts. Stats, history and events are recorded once,
+        after the write succeeded.
+        """
+        docs = [prepare_car(car) for car in cars]
+        if not docs:
+            return []
+        identities = [tuple(doc[field] for field in IDENTITY_FIELDS) for doc in docs]
+        last_index = {identity: index for index, identity in enumerate(identities)}
+
+        stored = await self._find_listings(self.collection, last_index, max_retries)
+        missing = [identity for identity in last_index if identity not in stored]
+        archived = await self._find_listings(self.archive, missing, max_retries)
+        for car in archived.values():
+            car.pop("archived_at", None)
 
-        now = datetime.now()
-        car_data_dict["created_at"] = now
-        car_data_dict["updated_at"] = now
+        results: List[Tuple[str, Dict[str, Any]]] = [("unchanged", doc) for doc in docs]
+        operations = []
+        created = []
+        updated = []
+        restored = []
+        for index, doc in enumerate(docs):
+            identity = identities[index]
+            if last_index[identity] != index:
+                continue
+            now = doc.pop("updated_at")
+            created_at = doc.pop("created_at")
+            before = stored.get(identity)
 
-        result = await self.collection.insert_one(car_data_dict)
-        created_car = await self.collection.find_one({"_id": result.inserted_id})
-        return convert_object_id_to_str(created_car)
+            if before is None and identity in archived:
+                before = archived[identity]
+                car = {**before, **doc}
+                if not same_listing(before, doc) or not before.get("updated_at"):
+                    car["updated_at"] = now
+                restored.append((index, before, car))
+                continue
 
-    async def get_car_by_id(self, car_id: str) -> Dict[str, Any]:
+            if before is None:
+                car = {"_id": ObjectId(), **doc, "created_at": created_at}
+                car["updated_at"] = now
+                created.append((index, doc, car))
+                continue
+
+            car = {**before, **doc}
+            results[index] = ("unchanged", car)
+            if same_listing(before, doc):
+                operations.append(
+                    UpdateOne(
+                        {"_id": before["_id"]},
+                        {"$set": {field: doc[field] for field in SEEN_FIELDS}},
+                    )
+                )
+                continue
+
+            car["updated_at"] = now
+            updated.append((index, before, car))
+
+        # New listings and listings moved to another block are (re)linked
+        moved = [
+            (before, car)
+            for _, before, car in updated + restored
+            if car["block_key"] != before.get("block_key")
+        ]
+        linked = [car for _, _, car in created] + [car for _, car in moved]
+        if linked:
+            await self.link_duplicates(linked)
+        moved_ids = {car["_id"] for _, car in moved}
+
+        for _, doc, car in created:
+            operations.append(
+                UpdateOne(
+                    {field: doc[field] for field in IDENTITY_FIELDS},
+                    {
+                        "$set": doc,
+                        "$setOnInsert": {
+                            key: car[key]
+                            for key in [
+                                "_id",
+                                "created_at",
+                                "updated_at",
+                                *CLUSTER_FIELDS,
+                            ]
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+        for index, before, car in updated:
+            changes = {**docs[index], "updated_at": car["updated_at"]}
+            if car["_id"] in moved_ids:
+                changes.update({field: car[field] for field in CLUSTER_FIELDS})
+            operations.append(UpdateOne({"_id": before["_id"]}, {"$set": changes}))
+        for index, before, car in restored:
+            changes = {**docs[index], "updated_at": car["updated_at"]}
+            if car["_id"] in moved_ids:
+                changes.update({field: car[field] for field in CLUSTER_FIELDS})
+            operations.append(
+                UpdateOne(
+                    {field: car[field] for field in IDENTITY_FIELDS},
+                    {
+                        "$set": changes,
+                        "$setOnInsert": {
+                            key: value
+                            for key, value in before.items()
+                            if key not in changes
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+
+        upserted = await self._write_listings(
+            operations,
+            [car["_id"] for _, _, car in created]
+            + [car["_id"] for _, _, car in restored],
+            max_retries,
+        )
+
+        new_cars = []
+        for index, _, car in created:
+            if car["_id"] in upserted:
+                new_cars.append(car)
+                results[index] = ("created", car)
+        for index, _, car in updated:
+            results[index] = ("updated", car)
+        # Restored listings count as changed: they are active again
+        restored = [item for item in restored if item[2]["_id"] in upserted]
+        for index, _, car in restored:
+            results[index] = ("updated", car)
+        if restored:
+            await self.archive.delete_many(
+                {"_id": {"$in": [car["_id"] for _, _, car in restored]}}
+            )
+        await self._elect_primaries(
+            [before.get("cluster_id") for before, _ in moved]
+            + [car["cluster_id"] for _, car in moved]
+            + [car.get("cluster_id") for _, _, car in restored]
+        )
+
+        await self.stats.record_changed(
+            [(before, car) for _, before, car in updated],
+            added=new_cars + [car for _, _, car in restored],
+        )
+        await self.history.record(
+            new_cars
+            + [
+                car
+                for _, before, car in updated + restored
+                if any(before.get(field) != car.get(field) for field in HISTORY_FIELDS)
+            ]
+        )
+        await publish_car_events("created", new_cars)
+        await publish_car_events("updated", [car for _, _, car in updated + restored])
+        return [
+            (listing_status, convert_object_id_to_str(car))
+            for listing_status, car in results
+        ]
+
+    async def _find_listings(
+        self, collection, identities: List[tuple], max_retries: int
+    ) -> Dict[tuple, Dict[str, Any]]:
+        """Find the stored listings of the given identities."""
+        if not identities:
+            return {}
+        query = {
+            "$or": [dict(zip(IDENTITY_FIELDS, identity)) for identity in identities]
+        }
+        async for attempt in retrying(max_retries):
+            with attempt:
+                return {
+                    tuple(car.get(field) for field in IDENTITY_FIELDS): car
+                    async for car in collection.find(query)
+                }
+
+    async def _write_listings(
+        self,
+        operations: List[UpdateOne],
+        inserted_ids: List[ObjectId],
+        max_retries: int,
+    ) -> set:
+        """Run the listing upserts and return the IDs this call inserted.
+
+        ``inserted_ids`` are the IDs the upserts insert with. A retried write
+        may find the inserts of a failed attempt already applied, so after a
+        retry the inserted listings are looked up instead.
+        """
+        async for attempt in retrying(max_retries):
+            with attempt:
+                try:
+                    result = await self.collection.bulk_write(operations, ordered=False)
+                    upserted = set(result.upserted_ids.values())
+                except BulkWriteError as e:
+                    errors = e.details.get("writeErrors", [])
+                    if any(
+                        error.get("code") != DUPLICATE_KEY_ERROR for error in errors
+                    ):
+                        raise
+                    # Listings inserted by a concurrent writer stay unchanged here
+                    upserted = {item["_id"] for item in e.details.get("upserted", [])}
+                if attempt.retry_state.attempt_number > 1 and inserted_ids:
+                    upserted = set(
+                        await self.collection.distinct(
+                            "_id", {"_id": {"$in": inserted_ids}}
+                        )
+                    )
+                return upserted
+
+    async def get_car_by_id(
+        self,
+        car_id: str,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+    ) -> Dict[str, Any]:
         """Get a car by its ID."""
         try:
-            car = await self.collection.find_one({"_id": ObjectId(car_id)})
+            query = {"_id": ObjectId(car_id)}
+            car = await self.collection.find_one(query, car_projection(fields))
+            if not car and include_archived:
+                car = await self.archive.find_one(query, car_projection(fields))
             if not car:
                 raise CarNotFoundException(f"Car with ID {car_id} not found")
             return convert_object_id_to_str(car)
         except InvalidId:
             raise InvalidCarIDException()
 
-    async def get_cars(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get all cars with pagination."""
-        cursor = self.collection.find().skip(skip).limit(limit)
+    async def find_cars(
+        self,
+        query: Dict[str, Any],
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        dedupe: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Find active cars, followed by archived ones if requested.
+
+        With ``dedupe`` only the primary listing of each duplicate cluster is
+        returned.
+        """
+        projection = car_projection(fields)
+        if dedupe:
+            query = {**query, **PRIMARY_QUERY}
+        if include_archived:
+            pipeline: List[Dict[str, Any]] = [
+                {"$match": query},
+                {
+                    "$unionWith": {
+                        "coll": CAR_ARCHIVE_COLLECTION,
+                        "pipeline": [{"$match": query}],
+                    }
+                },
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": projection},
+            ]
+            cursor = self.collection.aggregate(pipeline)
+        else:
+            cursor = self.collection.find(query, projection).skip(skip).limit(limit)
         cars = await cursor.to_list(length=limit)
         return [convert_object_id_to_str(car) for car in cars]
 
+    async def get_cars(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        dedupe: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get all cars with pagination."""
+        return await self.find_cars({}, skip, limit, fields, include_archived, dedupe)
+
     async def update_car(self, car_id: str, car_data: CarUpdate) -> Dict[str, Any]:
         """Update a car by its ID."""
         try:
@@ -71,66 +436,509 @@ class CarCRUD:
 
             update_data["updated_at"] = datetime.now()
 
-            result = await self.collection.update_one(
-                {"_id": ObjectId(car_id)}, {"$set": update_data}
-            )
-
-            if result.modified_count == 0:
-                car = await self.collection.find_one({"_id": ObjectId(car_id)})
-                if not car:
-                    raise CarNotFoundException(f"Car with ID {car_id} not found")
+            if any(field in update_data for field in BLOCK_FIELDS):
+                car, updated_car = await self._update_block(
+                    ObjectId(car_id), update_data
+                )
+            else:
+                car = await self._find_and_update(
+                    {"_id": ObjectId(car_id)}, update_data
+                )
+                if car:
+                    updated_car = {**car, **update_data}
+            if not car:
+                raise CarNotFoundException(f"Car with ID {car_id} not found")
 
-            updated_car = await self.collection.find_one({"_id": ObjectId(car_id)})
+            await self.stats.record_changed([(car, updated_car)])
+            if any(
+                car.get(field) != updated_car.get(field) for field in HISTORY_FIELDS
+            ):
+                await self.history.record([updated_car])
+            await publish_car_events("updated", [updated_car])
             return convert_object_id_to_str(updated_car)
         except InvalidId:
             raise InvalidCarIDException()
 
+    async def _find_and_update(
+        self, query: Dict[str, Any], changes: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Apply changes to the matching car and return it as it was."""
+        try:
+            return await self.collection.find_one_and_update(
+                query, {"$set": changes}, return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            raise CarAlreadyExistsException()
+
+    async def _update_block(
+        self, car_id: ObjectId, update_data: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Update fields that move a car to another block.
+
+        The new blocking key and cluster are written with the update. The
+        update only applies while the block fields are still the ones the
+        cluster was computed from, otherwise it is recomputed.
+        """
+        while True:
+            car = await self.collection.find_one({"_id": car_id})
+            if not car:
+                return None, {}
+            updated_car = {**car, **update_data}
+            changes = {**update_data, "block_key": block_key(updated_car)}
+            updated_car["block_key"] = changes["block_key"]
+            if changes["block_key"] != car.get("block_key"):
+                await self.link_duplicates([updated_car])
+                changes.update({field: updated_car[field] for field in CLUSTER_FIELDS})
+
+            query = {"_id": car_id, **{field: car.get(field) for field in BLOCK_FIELDS}}
+            if await self._find_and_update(query, changes):
+                break
+
+        if updated_car.get("cluster_id") != car.get("cluster_id"):
+            await self._elect_primaries(
+                [car.get("cluster_id"), updated_car["cluster_id"]]
+            )
+        return car, updated_car
+
+    async def _elect_primaries(self, cluster_ids: Iterable[Optional[str]]) -> None:
+        """Leave each of the clusters with exactly one active primary listing.
+
+        Archived copies of clusters that still have active listings stop
+        being primary, so archived listings do not reappear as duplicates.
+        """
+        cluster_ids = list({cluster_id for cluster_id in cluster_ids if cluster_id})
+        if not cluster_ids:
+            return
+        members = await self.collection.find(
+            {"cluster_id": {"$in": cluster_ids}}, CLUSTER_FIELDS
+        ).to_list(length=None)
+        primaries = elect_primaries(members)
+        operations = []
+        for member in members:
+            primary = member["_id"] == primaries[member["cluster_id"]]
+            if member.get("cluster_primary") != primary:
+                operations.append(
+                    UpdateOne(
+                        {"_id": member["_id"]}, {"$set": {"cluster_primary": primary}}
+                    )
+                )
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        if primaries:
+            await self.archive.update_many(
+                {"cluster_id": {"$in": list(primaries)}, **PRIMARY_QUERY},
+                {"$set": {"cluster_primary": False}},
+            )
+
     async def delete_car(self, car_id: str) -> bool:
         """Delete a car by its ID."""
         try:
-            result = await self.collection.delete_one({"_id": ObjectId(car_id)})
-            if result.deleted_count == 0:
+            car = await self.collection.find_one_and_delete({"_id": ObjectId(car_id)})
+            if not car:
                 raise CarNotFoundException(f"Car with ID {car_id} not found")
+            await self.stats.record_removed([car])
+            await self.history.delete([car["_id"]])
+            await self._elect_primaries([car.get("cluster_id")])
             return True
         except InvalidId:
             raise InvalidCarIDException()
 
-    async def check_if_car_exists(self, car_data: dict) -> bool:
-        """Check if a car with the given attributes already exists."""
-        query = {
-            "make": car_data.get("make"),
-            "model": car_data.get("model"),
-            "year": car_data.get("year"),
-            "price": car_data.get("price"),
-            "mileage": car_data.get("mileage"),
-            "engine_type": car_data.get("engine_type"),
-            "engine_capacity": car_data.get("engine_capacity"),
-            "transmission": car_data.get("transmission"),
-            "location": car_data.get("location"),
-            "source_site": car_data.get("source_site"),
-        }
-
-        query = {k: v for k, v in query.items() if v is not None}
+    async def get_price_history(
+        self, car_id: str, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the price history of a car by its ID."""
+        try:
+            object_id = ObjectId(car_id)
+        except InvalidId:
+            raise InvalidCarIDException()
 
-        count = await self.collection.count_documents(query)
-        return count > 0
+        exists = await self.collection.find_one({"_id": object_id}, {"_id": 1})
+        if not exists:
+            exists = await self.archive.find_one({"_id": object_id}, {"_id": 1})
+        if not exists:
+            raise CarNotFoundException(f"Car with ID {car_id} not found")
+        return await self.history.get_history(object_id, skip=skip, limit=limit)
 
     async def get_cars_by_make(
-        self, make: str, skip: int = 0, limit: int = 100
+        self,
+        make: str,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        dedupe: bool = False,
     ) -> List[Dict[str, Any]]:
         """Get cars filtered by make."""
-        cursor = (
-            self.collection.find({"make": {"$regex": f"^{make}$", "$options": "i"}})
-            .skip(skip)
-            .limit(limit)
+        query = self.build_filter(make=make)
+        return await self.find_cars(
+            query, skip, limit, fields, include_archived, dedupe
         )
-        cars = await cursor.to_list(length=limit)
-        return [convert_object_id_to_str(car) for car in cars]
 
     async def get_cars_by_year(
-        self, year: int, skip: int = 0, limit: int = 100
+        self,
+        year: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+        dedupe: bool = False,
     ) -> List[Dict[str, Any]]:
         """Get cars filtered by production year."""
-        cursor = self.collection.find({"year": year}).skip(skip).limit(limit)
-        cars = await cursor.to_list(length=limit)
+        query = {"year": year}
+        return await self.find_cars(
+            query, skip, limit, fields, include_archived, dedupe
+        )
+
+    async def create_indexes(self) -> None:
+        """Create indexes used by car queries and duplicate detection.
+
+        Fails if the cars collection still holds several documents of one
+        listing; ``python -m app.cli merge-listings`` merges them.
+        """
+        await self.collection.create_index([("updated_at", 1), ("_id", 1)])
+        try:
+            await self.collection.create_index(
+                [(field, 1) for field in IDENTITY_FIELDS],
+                unique=True,
+                name="listing_source",
+            )
+        except OperationFailure as e:
+            raise RuntimeError(
+                "Cannot create the unique listing index, run "
+                f"`python -m app.cli merge-listings` first: {e}"
+            ) from e
+        try:
+            # Replaced by listing_source, which ignores price and mileage
+            await self.collection.drop_index("listing_identity")
+        except OperationFailure:
+            pass
+        await self.collection.create_index([("source_site", 1), ("last_seen_at", 1)])
+        await self.collection.create_index("block_key")
+        await self.collection.create_index("cluster_id")
+
+        if ARCHIVE_TTL_DAYS > 0:
+            try:
+                await self.archive.create_index(
+                    "archived_at", expireAfterSeconds=ARCHIVE_TTL_DAYS * 86400
+                )
+            except OperationFailure as e:
+                logger.warning(f"Cannot create archive TTL index: {e}")
+
+    async def merge_duplicate_listings(self) -> Dict[str, int]:
+        """Merge the documents of each listing into one.
+
+        Before listings were identified by ``IDENTITY_FIELDS``, every price or
+        mileage change was stored as a new document. The newest document of a
+        listing is kept with the earliest ``created_at``, the prices of the
+        older ones become its history and they are removed. Documents whose
+        source URL is missing or a site root cannot be told apart and are
+        moved to the archive instead. Run before creating the unique index.
+        """
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {field: f"${field}" for field in IDENTITY_FIELDS},
+                    "ids": {"$push": "$_id"},
+                    "count": {"$sum": 1},
+                }
+            },
+            {"$match": {"count": {"$gt": 1}}},
+        ]
+        counts = {"merged": 0, "archived": 0}
+        groups = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(
+            length=None
+        )
+        for group in groups:
+            cars = await self.collection.find({"_id": {"$in": group["ids"]}}).to_list(
+                length=None
+            )
+            if not has_listing_url(group["_id"]):
+                now = datetime.now()
+                await self.archive.bulk_write(
+                    [
+                        ReplaceOne(
+                            {"_id": car["_id"]}, {**car, "archived_at": now}, True
+                        )
+                        for car in cars
+                    ],
+                    ordered=False,
+                )
+                await self.collection.delete_many({"_id": {"$in": group["ids"]}})
+                await self.stats.record_removed(cars)
+                await self._elect_primaries([car.get("cluster_id") for car in cars])
+                counts["archived"] += len(cars)
+                continue
+
+            cars.sort(
+                key=lambda car: (
+                    car.get("updated_at") or car.get("created_at") or datetime.min,
+                    car["_id"],
+                )
+            )
+            kept, older = cars[-1], cars[:-1]
+            older_ids = [car["_id"] for car in older]
+
+            # Points are only added for documents that have no history yet
+            with_history = set(
+                await self.history.collection.distinct(
+                    "car_id", {"car_id": {"$in": group["ids"]}}
+                )
+            )
+            await self.history.record(
+                [
+                    {**car, "_id": kept["_id"]}
+                    for car in cars
+                    if car["_id"] not in with_history
+                ]
+            )
+            await self.history.collection.update_many(
+                {"car_id": {"$in": older_ids}}, {"$set": {"car_id": kept["_id"]}}
+            )
+
+            created_at = min(
+                (car["created_at"] for car in cars if car.get("created_at")),
+                default=kept.get("created_at"),
+            )
+            await self.collection.update_one(
+                {"_id": kept["_id"]}, {"$set": {"created_at": created_at}}
+            )
+            await self.collection.delete_many({"_id": {"$in": older_ids}})
+            await self.stats.record_removed(older)
+            await self._elect_primaries([car.get("cluster_id") for car in older])
+            counts["merged"] += len(older)
+        return counts
+
+    async def link_duplicates(self, cars: List[Dict[str, Any]]) -> None:
+        """Set ``cluster_id`` on new cars, linking them to stored duplicates.
+
+        Candidates of the whole batch are fetched with one indexed query on
+        the blocking keys, so the work stays linear in the batch size.
+        """
+        keys = {key for car in cars for key in candidate_keys(car)}
+        candidates = await self.collection.find(
+            {
+                "block_key": {"$in": list(keys)},
+                "_id": {"$nin": [car["_id"] for car in cars]},
+            },
+            DEDUPE_PROJECTION,
+        ).to_list(length=None)
+        assign_clusters(cars, candidates)
+
+    async def rebuild_clusters(self, batch_size: int = 1000) -> int:
+        """Recompute blocking keys and duplicate clusters of all cars."""
+        projection = {**DEDUPE_PROJECTION, **{field: 1 for field in BLOCK_FIELDS}}
+        cars: List[Dict[str, Any]] = []
+        async for batch in self.iter_cars({}, batch_size, projection):
+            for car in batch:
+                car["block_key"] = block_key(car)
+            cars.extend(batch)
+
+        assign_clusters(cars, [])
+        for start in range(0, len(cars), batch_size):
+            await self.collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": car["_id"]},
+                        {
+                            "$set": {
+                                "block_key": car["block_key"],
+                                **{field: car[field] for field in CLUSTER_FIELDS},
+                            }
+                        },
+                    )
+                    for car in cars[start : start + batch_size]
+                ],
+                ordered=False,
+            )
+        return len({car["cluster_id"] for car in cars})
+
+    async def archive_stale(
+        self,
+        seen_before: datetime,
+        source_site: Optional[str] = None,
+        makes: Optional[List[str]] = None,
+        pages: Optional[List[int]] = None,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Move listings not seen since ``seen_before`` to the archive in batches.
+
+        Crawls pass the results ``pages`` they read, so listings last seen on
+        other pages, which the crawl could not have seen, stay active. Cars
+        are copied before they are deleted, so an interrupted run never loses
+        a listing. A car seen again while its batch is being archived stays
+        active and its archived copy is removed.
+        """
+        query: Dict[str, Any] = {
+            "$or": [
+                {"last_seen_at": {"$lt": seen_before}},
+                {"last_seen_at": None, "updated_at": {"$lt": seen_before}},
+            ]
+        }
+        if source_site:
+            query["source_site"] = source_site
+        if makes:
+            query["make"] = {
+                "$in": [re.compile(f"^{re.escape(make)}$", re.I) for make in makes]
+            }
+        if pages:
+            query["source_page"] = {"$in": pages}
+
+        archived = 0
+        async for cars in self.iter_cars(query, batch_size):
+            now = datetime.now()
+            car_ids = [car["_id"] for car in cars]
+            await self.archive.bulk_write(
+                [
+                    ReplaceOne({"_id": car["_id"]}, {**car, "archived_at": now}, True)
+                    for car in cars
+                ],
+                ordered=False,
+            )
+            result = await self.collection.delete_many(
+                {"_id": {"$in": car_ids}, **query}
+            )
+
+            removed = cars
+            if result.deleted_count < len(cars):
+                still_active = await self.collection.distinct(
+                    "_id", {"_id": {"$in": car_ids}}
+                )
+                await self.archive.delete_many({"_id": {"$in": still_active}})
+                removed = [car for car in cars if car["_id"] not in still_active]
+
+            await self.stats.record_removed(removed)
+            await self._elect_primaries([car.get("cluster_id") for car in removed])
+            archived += result.deleted_count
+        return archived
+
+    @staticmethod
+    def build_filter(
+        make: Optional[str] = None,
+        year: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Build a Mongo filter from the listing endpoint filters."""
+        query: Dict[str, Any] = {}
+        if make:
+            query["make"] = {"$regex": f"^{re.escape(make)}$", "$options": "i"}
+        if year is not None:
+            query["year"] = year
+        if since is not None:
+            query["updated_at"] = {"$gte": since}
+        return query
+
+    async def iter_cars(
+        self,
+        query: Dict[str, Any],
+        batch_size: int = 1000,
+        projection: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield raw car documents in batches ordered by update time."""
+        cursor = (
+            self.collection.find(query, projection)
+            .sort([("updated_at", 1), ("_id", 1)])
+            .batch_size(batch_size)
+        )
+        batch = []
+        async for car in cursor:
+            batch.append(car)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def create_cars(self, cars: List[CarCreate]) -> List[Dict[str, Any]]:
+        """Insert many cars at once and report the outcome of each one."""
+        docs = [prepare_car(car) for car in cars]
+        for doc in docs:
+            doc["_id"] = ObjectId()
+        await self.link_duplicates(docs)
+
+        failed: Dict[int, Dict[str, Any]] = {}
+        try:
+            await self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = error
+
+        results: List[Dict[str, Any]] = []
+        inserted = []
+        for index, doc in enumerate(docs):
+            error = failed.get(index)
+            if error is None:
+                results.append(
+                    {"index": index, "id": str(doc["_id"]), "status": "created"}
+                )
+                inserted.append(doc)
+            elif error.get("code") == DUPLICATE_KEY_ERROR:
+                results.append({"index": index, "id": None, "status": "duplicate"})
+            else:
+                results.append(
+                    {
+                        "index": index,
+                        "id": None,
+                        "status": "error",
+                        "detail": error.get("errmsg", "Write error"),
+                    }
+                )
+
+        await self.stats.record_added(inserted)
+        await self.history.record(inserted)
+        await publish_car_events("created", inserted)
+        return results
+
+    async def get_cars_by_ids(
+        self, car_ids: List[str], fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the cars with the given IDs, skipping invalid and unknown ones."""
+        object_ids = [
+            ObjectId(car_id) for car_id in car_ids if ObjectId.is_valid(car_id)
+        ]
+        cursor = self.collection.find(
+            {"_id": {"$in": object_ids}}, car_projection(fields)
+        )
+        cars = await cursor.to_list(length=len(object_ids))
         return [convert_object_id_to_str(car) for car in cars]
+
+    async def delete_cars_by_ids(self, car_ids: List[str]) -> List[Dict[str, Any]]:
+        """Delete the cars with the given IDs and report the outcome of each one."""
+        object_ids = [
+            ObjectId(car_id) for car_id in car_ids if ObjectId.is_valid(car_id)
+        ]
+        cars = await self.collection.find(
+            {"_id": {"$in": object_ids}}, {**STATS_PROJECTION, "cluster_id": 1}
+        ).to_list(length=len(object_ids))
+        if cars:
+            deleted_ids = [car["_id"] for car in cars]
+            await self.collection.delete_many({"_id": {"$in": deleted_ids}})
+            await self.stats.record_removed(cars)
+            await self.history.delete(deleted_ids)
+            await self._elect_primaries([car.get("cluster_id") for car in cars])
+
+        found = {str(car["_id"]) for car in cars}
+        results = []
+        for index, car_id in enumerate(car_ids):
+            if not ObjectId.is_valid(car_id):
+                car_status = "invalid_id"
+            elif car_id in found:
+                car_status = "deleted"
+            else:
+                car_status = "not_found"
+            results.append({"index": index, "id": car_id, "status": car_status})
+        return results
+
+    async def delete_cars_by_filter(
+        self, query: Dict[str, Any], batch_size: int = 1000
+    ) -> int:
+        """Delete all cars matching a filter in batches."""
+        deleted = 0
+        projection = {**STATS_PROJECTION, "cluster_id": 1}
+        async for cars in self.iter_cars(query, batch_size, projection):
+            deleted_ids = [car["_id"] for car in cars]
+            result = await self.collection.delete_many({"_id": {"$in": deleted_ids}})
+            await self.stats.record_removed(cars)
+            await self.history.delete(deleted_ids)
+            await self._elect_primaries([car.get("cluster_id") for car in cars])
+            deleted += result.deleted_count
+        return deleted
@@ -0,0 +1,143 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Listings are only compared within a block of the same normalized
+# make/model/year/location and mileage bucket (or a neighbouring bucket)
+BLOCK_FIELDS = ["make", "model", "year", "mileage", "location"]
+MILEAGE_BUCKET = 10000
+# Listings scoring at least this much are linked under one cluster ID
+MATCH_SCORE = 0.75
+# Fields linking a listing to its cluster
+CLUSTER_FIELDS = ["cluster_id", "cluster_primary"]
+# Listings returned by dedupe queries, one per cluster. Cars stored before
+# clusters had a primary listing count as primary until rebuild-clusters.
+PRIMARY_QUERY = {"cluster_primary": {"$ne": False}}
+# Car fields needed to score a candidate
+DEDUPE_PROJECTION = {
+    "source_site": 1,
+    "price": 1,
+    "mileage": 1,
+    "engine_type": 1,
+    "engine_capacity": 1,
+    "transmission": 1,
+    "block_key": 1,
+    "cluster_id": 1,
+}
+
+
+def normalize(value: Any) -> str:
+    """Lowercase a value and drop everything but letters and digits."""
+    return re.sub(r"[\W_]+", "", str(value or "").lower())
+
+
+def _block_key(car: Dict[str, Any], bucket: int) -> str:
+    return "|".join(
+        [
+            normalize(car.get("make")),
+            normalize(car.get("model")),
+            str(car.get("year") or ""),
+            str(bucket),
+            normalize(car.get("location")),
+        ]
+    )
+
+
+def mileage_bucket(mileage: Optional[int]) -> int:
+    return int(mileage or 0) // MILEAGE_BUCKET
+
+
+def block_key(car: Dict[str, Any]) -> str:
+    """Return the blocking key a car is stored under."""
+    return _block_key(car, mileage_bucket(car.get("mileage")))
+
+
+def candidate_keys(car: Dict[str, Any]) -> List[str]:
+    """Return the blocking keys to search for duplicates of a car."""
+    bucket = mileage_bucket(car.get("mileage"))
+    return [_block_key(car, bucket + offset) for offset in (-1, 0, 1)]
+
+
+def match_score(car: Dict[str, Any], other: Dict[str, Any]) -> float:
+    """Score how likely two listings from different sites are the same car."""
+    if car.get("source_site") == other.get("source_site"):
+        return 0.0
+
+    price, other_price = float(car.get("price") or 0), float(other.get("price") or 0)
+    price_diff = abs(price - other_price) / max(price, other_price, 1.0)
+    mileage_diff = abs(int(car.get("mileage") or 0) - int(other.get("mileage") or 0))
+
+    score = 0.4 * max(0.0, 1 - price_diff / 0.1)
+    score += 0.3 * max(0.0, 1 - mileage_diff / MILEAGE_BUCKET)
+    for field in ["engine_type", "engine_capacity", "transmission"]:
+        if normalize(car.get(field)) == normalize(other.get(field)):
+            score += 0.1
+    return score
+
+
+def find_cluster(
+    car: Dict[str, Any], candidates: Iterable[Dict[str, Any]]
+) -> Optional[str]:
+    """Return the cluster ID of the best matching candidate, if any.
+
+    Clusters that already hold a listing from the same site are skipped, so
+    one cluster never links two listings of a single site.
+    """
+    candidates = [
+        candidate
+        for candidate in candidates
+        if candidate is not car and candidate.get("cluster_id") is not None
+    ]
+    taken = {
+        candidate["cluster_id"]
+        for candidate in candidates
+        if candidate.get("source_site") == car.get("source_site")
+    }
+
+    best_score, best_cluster = MATCH_SCORE, None
+    for candidate in candidates:
+        if candidate["cluster_id"] in taken:
+            continue
+        score = match_score(car, candidate)
+        if score >= best_score:
+            best_score, best_cluster = score, candidate["cluster_id"]
+    return best_cluster
+
+
+def elect_primaries(members: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the ID of the primary listing of each cluster.
+
+    The listing that started a cluster stays its primary. Once it is gone,
+    the oldest remaining listing takes over.
+    """
+    primaries: Dict[str, Any] = {}
+    for member in sorted(members, key=lambda member: member["_id"]):
+        cluster_id = member["cluster_id"]
+        if str(member["_id"]) == cluster_id:
+            primaries[cluster_id] = member["_id"]
+        else:
+            primaries.setdefault(cluster_id, member["_id"])
+    return primaries
+
+
+def assign_clusters(
+    cars: List[Dict[str, Any]], candidates: Iterable[Dict[str, Any]]
+) -> None:
+    """Set ``cluster_id`` and ``cluster_primary`` on cars that have an ``_id``.
+
+    Cars are matched against the candidates and the cars before them, so
+    duplicates within one batch are linked too. Cars without a match start
+    their own cluster and are its primary listing.
+    """
+    blocks: Dict[str, List[Dict[str, Any]]] = {}
+    for candidate in candidates:
+        blocks.setdefault(candidate["block_key"], []).append(candidate)
+
+    for car in cars:
+        block = [
+            candidate
+            for key in candidate_keys(car)
+            for candidate in blocks.get(key, [])
+        ]
+        car["cluster_id"] = find_cluster(car, block) or str(car["_id"])
+        car["cluster_primary"] = car["cluster_id"] == str(car["_id"])
+        blocks.setdefault(car["block_key"], []).append(car)
@@ -0,0 +1,210 @@
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.conf import get_database, CAR_COLLECTION, CAR_STATS_COLLECTION
+
+# Prices are bucketed on a log scale, so percentiles are accurate to ~2.5%
+PRICE_BUCKET_BASE = math.log(1.05)
+PERCENTILES = {"p25": 0.25, "p50": 0.5, "p75": 0.75, "p90": 0.9}
+# Car fields needed to update stats
+STATS_PROJECTION = {"make": 1, "model": 1, "year": 1, "price": 1}
+
+
+def stats_key(car: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the make/model/year key of the stats entry for a car."""
+    return {
+        "make": str(car.get("make") or "Unknown").lower(),
+        "model": str(car.get("model") or "Unknown").lower(),
+        "year": car.get("year"),
+    }
+
+
+def price_bucket(price: float) -> int:
+    """Return the histogram bucket for a price."""
+    return int(math.log1p(max(price, 0.0)) / PRICE_BUCKET_BASE)
+
+
+def bucket_value(bucket: int) -> float:
+    """Return the representative price of a histogram bucket."""
+    return math.expm1((bucket + 0.5) * PRICE_BUCKET_BASE)
+
+
+def _stats_updates(changes: List[Tuple[Dict[str, Any], int]]) -> List[UpdateOne]:
+    """Sum the (car, +1/-1) changes into one update per stats entry."""
+    entries: Dict[tuple, Dict[str, Any]] = {}
+    for car, sign in changes:
+        key = stats_key(car)
+        price = float(car.get("price") or 0.0)
+        entry = entries.setdefault(
+            tuple(key.values()), {"key": key, "inc": {}, "min": None, "max": None}
+        )
+        inc = entry["inc"]
+        for field, value in [
+            ("count", sign),
+            ("price_sum", sign * price),
+            (f"histogram.{price_bucket(price)}", sign),
+        ]:
+            inc[field] = inc.get(field, 0) + value
+        if sign > 0:
+            entry["min"] = price if entry["min"] is None else min(entry["min"], price)
+            entry["max"] = price if entry["max"] is None else max(entry["max"], price)
+
+    now = datetime.now()
+    updates = []
+    for entry in entries.values():
+        update: Dict[str, Any] = {"$set": {"updated_at": now}}
+        inc = {field: value for field, value in entry["inc"].items() if value}
+        if inc:
+            update["$inc"] = inc
+        if entry["min"] is not None:
+            update["$min"] = {"price_min": entry["min"]}
+            update["$max"] = {"price_max": entry["max"]}
+        elif not inc:
+            # Changes that cancel out leave the entry as it is
+            continue
+        updates.append(UpdateOne(entry["key"], update, upsert=True))
+    return updates
+
+
+def _format_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    count = stats["count"]
+    price_min = stats.get("price_min", 0.0)
+    price_max = stats.get("price_max", 0.0)
+    buckets = sorted(
+        (int(bucket), bucket_count)
+        for bucket, bucket_count in stats.get("histogram", {}).items()
+        if bucket_count > 0
+    )
+
+    percentiles = {}
+    for name, quantile in PERCENTILES.items():
+        target = quantile * count
+        seen = 0
+        value = price_max
+        for bucket, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= target:
+                value = bucket_value(bucket)
+                break
+        percentiles[name] = round(min(max(value, price_min), price_max), 2)
+
+    return {
+        "make": stats["make"],
+        "model": stats["model"],
+        "year": stats["year"],
+        "count": count,
+        "min_price": price_min,
+        "max_price": price_max,
+        "mean_price": round(stats["price_sum"] / count, 2),
+        **percentiles,
+        "updated_at": stats["updated_at"],
+    }
+
+
+class CarStatsCRUD:
+    """Materialized price statistics per make/model/year.
+
+    Counts, sums and histograms are maintained incrementally. Minimum and
+    maximum prices only ever widen, so they can be stale after deletes until
+    the next rebuild.
+    """
+
+    def __init__(self):
+        self.collection = get_database()[CAR_STATS_COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """Create indexes used by stats lookups."""
+        await self.collection.create_index(
+            [("make", 1), ("model", 1), ("year", 1)], unique=True
+        )
+
+    async def _apply(self, changes: List[Tuple[Dict[str, Any], int]]) -> None:
+        updates = _stats_updates(changes)
+        if updates:
+            await self.collection.bulk_write(updates, ordered=False)
+
+    async def record_added(self, cars: List[Dict[str, Any]]) -> None:
+        """Add cars to their stats entries."""
+        await self._apply([(car, 1) for car in cars])
+
+    async def record_removed(self, cars: List[Dict[str, Any]]) -> None:
+        """Remove cars from their stats entries."""
+        await self._apply([(car, -1) for car in cars])
+
+    async def record_changed(
+        self,
+        changes: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        added: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """Apply (before, after) changes and added cars with one bulk write."""
+        deltas = [(car, 1) for car in added or []]
+        for before, after in changes:
+            same_key = stats_key(before) == stats_key(after)
+            if same_key and before.get("price") == after.get("price"):
+                continue
+            deltas += [(before, -1), (after, 1)]
+        await self._apply(deltas)
+
+    async def get_stats(
+        self,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+        year: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Get price statistics filtered by make, model and year."""
+        query: Dict[str, Any] = {"count": {"$gt": 0}}
+        if make:
+            query["make"] = make.lower()
+        if model:
+            query["model"] = model.lower()
+        if year is not None:
+            query["year"] = year
+
+        cursor = self.collection.find(query).skip(skip).limit(limit)
+        stats = await cursor.to_list(length=limit)
+        return [_format_stats(entry) for entry in stats]
+
+    async def rebuild(self) -> int:
+        """Recompute all stats from the cars collection and swap them in."""
+        entries: Dict[tuple, Dict[str, Any]] = {}
+        cursor = get_database()[CAR_COLLECTION].find({}, STATS_PROJECTION)
+        async for car in cursor:
+            key = stats_key(car)
+            price = float(car.get("price") or 0.0)
+            entry = entries.setdefault(
+                tuple(key.values()),
+                {
+                    **key,
+                    "count": 0,
+                    "price_sum": 0.0,
+                    "price_min": price,
+                    "price_max": price,
+                    "histogram": {},
+                },
+            )
+            entry["count"] += 1
+            entry["price_sum"] += price
+            entry["price_min"] = min(entry["price_min"], price)
+            entry["price_max"] = max(entry["price_max"], price)
+            bucket = str(price_bucket(price))
+            entry["histogram"][bucket] = entry["histogram"].get(bucket, 0) + 1
+
+        now = datetime.now()
+        rebuild_collection = get_database()[f"{CAR_STATS_COLLECTION}_rebuild"]
+        await rebuild_collection.drop()
+        await rebuild_collection.create_index(
+            [("make", 1), ("model", 1), ("year", 1)], unique=True
+        )
+        if entries:
+            await rebuild_collection.insert_many(
+                [{**entry, "updated_at": now} for entry in entries.values()]
+            )
+            await rebuild_collection.rename(CAR_STATS_COLLECTION, dropTarget=True)
+        else:
+            await self.collection.delete_many({})
+        return len(entries)
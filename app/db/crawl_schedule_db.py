@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pymongo import UpdateOne
+
+from app.conf import get_database, CRAWL_SCHEDULE_COLLECTION
+
+
+class CrawlScheduleCRUD:
+    """Persisted recrawl schedule, one entry per (site, make)."""
+
+    def __init__(self):
+        self.collection = get_database()[CRAWL_SCHEDULE_COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """Create indexes used by schedule lookups."""
+        await self.collection.create_index([("site", 1), ("make", 1)], unique=True)
+        await self.collection.create_index([("site", 1), ("next_run_at", 1)])
+
+    async def ensure_entries(
+        self, site: str, makes: List[str], interval: float, now: datetime
+    ) -> None:
+        """Add schedule entries for makes that have none, due immediately."""
+        if not makes:
+            return
+        await self.collection.bulk_write(
+            [
+                UpdateOne(
+                    {"site": site, "make": make},
+                    {
+                        "$setOnInsert": {
+                            "interval": interval,
+                            "churn_rate": 0.0,
+                            "next_run_at": now,
+                            "last_run_at": None,
+                            "runs": 0,
+                        }
+                    },
+                    upsert=True,
+                )
+                for make in makes
+            ],
+            ordered=False,
+        )
+
+    async def get_due(
+        self, site: str, makes: List[str], now: datetime
+    ) -> List[Dict[str, Any]]:
+        """Get the entries of a site that are due for a crawl."""
+        cursor = self.collection.find(
+            {"site": site, "make": {"$in": makes}, "next_run_at": {"$lte": now}}
+        )
+        return await cursor.to_list(length=None)
+
+    async def claim(self, entry: Dict[str, Any], lease_until: datetime) -> None:
+        """Push an entry's next run out while its crawl is in progress."""
+        await self.collection.update_one(
+            {"_id": entry["_id"]}, {"$set": {"next_run_at": lease_until}}
+        )
+
+    async def record_crawl(self, entry: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """Store the outcome of a crawl and the next run time."""
+        await self.collection.update_one(
+            {"_id": entry["_id"]}, {"$set": update, "$inc": {"runs": 1}}
+        )
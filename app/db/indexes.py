@@ -0,0 +1,16 @@
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from app.db.crawl_schedule_db import CrawlScheduleCRUD
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.db.price_history_db import PriceHistoryCRUD
+from app.db.users_db import UserCRUD
+
+
+async def create_indexes():
+    """Create indexes for all collections."""
+    await CarCRUD().create_indexes()
+    await CarStatsCRUD().create_indexes()
+    await PriceHistoryCRUD().create_indexes()
+    await UserCRUD().create_indexes()
+    await CrawlScheduleCRUD().create_indexes()
+    await ScrapeJobCRUD().create_indexes()
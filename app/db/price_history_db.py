@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pymongo.errors import CollectionInvalid
+
+from app.conf import get_database, CAR_PRICE_HISTORY_COLLECTION
+
+
+class PriceHistoryCRUD:
+    """Price and mileage points of every listing.
+
+    Points live in a time-series collection keyed by car ID, so the cars
+    collection keeps one document per listing with only the current price.
+    """
+
+    def __init__(self):
+        self.collection = get_database()[CAR_PRICE_HISTORY_COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """Create the time-series collection and its lookup index."""
+        try:
+            await get_database().create_collection(
+                CAR_PRICE_HISTORY_COLLECTION,
+                timeseries={
+                    "timeField": "recorded_at",
+                    "metaField": "car_id",
+                    "granularity": "hours",
+                },
+            )
+        except CollectionInvalid:
+            pass
+        await self.collection.create_index([("car_id", 1), ("recorded_at", 1)])
+
+    async def record(self, cars: List[Dict[str, Any]]) -> None:
+        """Append the current price and mileage of cars."""
+        if not cars:
+            return
+        now = datetime.now()
+        await self.collection.insert_many(
+            [
+                {
+                    "car_id": car["_id"],
+                    "recorded_at": car.get("updated_at") or now,
+                    "price": car.get("price"),
+                    "mileage": car.get("mileage"),
+                }
+                for car in cars
+            ],
+            ordered=False,
+        )
+
+    async def get_history(
+        self, car_id: ObjectId, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the oldest-first price history of a car."""
+        cursor = (
+            self.collection.find(
+                {"car_id": car_id},
+                {"_id": 0, "price": 1, "mileage": 1, "recorded_at": 1},
+            )
+            .sort("recorded_at", 1)
+            .skip(skip)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def delete(self, car_ids: List[ObjectId]) -> None:
+        """Delete the history of removed cars."""
+        if car_ids:
+            await self.collection.delete_many({"car_id": {"$in": car_ids}})
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.conf import (
+    get_database,
+    SCRAPE_JOB_COLLECTION,
+    SCRAPE_JOB_TIMEOUT,
+    SCRAPE_MAX_JOBS,
+)
+from app.db.utils import convert_object_id_to_str
+from app.exceptions.scrape_exceptions import (
+    ScrapeJobFinishedException,
+    ScrapeJobLimitException,
+    ScrapeJobNotFoundException,
+)
+from app.schemas.scrape import ScrapeJobCreate
+
+ACTIVE_STATUSES = ["queued", "running"]
+
+
+def _object_id(job_id: str) -> ObjectId:
+    try:
+        return ObjectId(job_id)
+    except InvalidId:
+        raise ScrapeJobNotFoundException()
+
+
+class ScrapeJobCRUD:
+    def __init__(self):
+        self.collection = get_database()[SCRAPE_JOB_COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """Create indexes used by job lookups."""
+        await self.collection.create_index([("status", 1), ("created_at", -1)])
+        # Active jobs hold one of the SCRAPE_MAX_JOBS slots
+        await self.collection.create_index(
+            "slot", unique=True, partialFilterExpression={"slot": {"$exists": True}}
+        )
+
+    async def create_job(
+        self, job: ScrapeJobCreate, max_jobs: int = SCRAPE_MAX_JOBS
+    ) -> Dict[str, Any]:
+        """Queue a job in a free slot, or fail when all slots are taken.
+
+        The unique slot index makes the limit hold for concurrent requests.
+        """
+        await self.fail_orphaned()
+        now = datetime.now()
+        for slot in range(max_jobs):
+            job_data = {
+                **job.model_dump(),
+                "status": "queued",
+                "slot": slot,
+                "progress": {"makes_done": 0, "processed": 0, "saved": 0, "errors": 0},
+                "cancel_requested": False,
+                "created_at": now,
+                "heartbeat_at": now,
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+            }
+            try:
+                await self.collection.insert_one(job_data)
+            except DuplicateKeyError:
+                continue
+            return convert_object_id_to_str(job_data)
+        raise ScrapeJobLimitException()
+
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        job = await self.collection.find_one({"_id": _object_id(job_id)})
+        if not job:
+            raise ScrapeJobNotFoundException()
+        return convert_object_id_to_str(job)
+
+    async def get_jobs(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        cursor = self.collection.find().sort("created_at", -1).skip(skip).limit(limit)
+        jobs = await cursor.to_list(length=limit)
+        return convert_object_id_to_str(jobs)
+
+    async def request_cancel(self, job_id: str) -> Dict[str, Any]:
+        """Flag an active job for cancellation."""
+        job = await self.collection.find_one_and_update(
+            {"_id": _object_id(job_id), "status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"cancel_requested": True}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if not job:
+            await self.get_job(job_id)
+            raise ScrapeJobFinishedException()
+        return convert_object_id_to_str(job)
+
+    async def mark_running(self, job_id: str) -> bool:
+        """Start a queued job, returning False if it is no longer queued."""
+        now = datetime.now()
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": "queued"},
+            {"$set": {"status": "running", "started_at": now, "heartbeat_at": now}},
+        )
+        return result.modified_count > 0
+
+    async def heartbeat(self, job_id: str) -> bool:
+        """Record that a job is alive, returning False if it is no longer active."""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": {"$in": ACTIVE_STATUSES}},
+            {"$set": {"heartbeat_at": datetime.now()}},
+        )
+        return result.matched_count > 0
+
+    async def fail_orphaned(self, timeout: int = SCRAPE_JOB_TIMEOUT) -> int:
+        """Mark active jobs without a recent heartbeat as failed.
+
+        Their worker crashed or was killed, e.g. with the API worker that
+        started it, so they would otherwise hold a slot forever.
+        """
+        result = await self.collection.update_many(
+            {
+                "status": {"$in": ACTIVE_STATUSES},
+                "heartbeat_at": {
+                    "$not": {"$gte": datetime.now() - timedelta(seconds=timeout)}
+                },
+            },
+            {
+                "$set": {
+                    "status": "failed",
+                    "finished_at": datetime.now(),
+                    "error": "Worker stopped without finishing the job",
+                },
+                "$unset": {"slot": ""},
+            },
+        )
+        return result.modified_count
+
+    async def add_progress(self, job_id: str, results: Dict[str, int]) -> bool:
+        """Add the results of a processed make, returning whether to cancel."""
+        job = await self.collection.find_one_and_update(
+            {"_id": ObjectId(job_id)},
+            {
+                "$inc": {
+                    "progress.makes_done": 1,
+                    **{f"progress.{key}": value for key, value in results.items()},
+                }
+            },
+            projection={"cancel_requested": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return bool(job and job.get("cancel_requested"))
+
+    async def finish(
+        self, job_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        """Set the final status of a job that is still active."""
+        await self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": {"$in": ACTIVE_STATUSES}},
+            {
+                "$set": {
+                    "status": status,
+                    "finished_at": datetime.now(),
+                    "error": error,
+                },
+                "$unset": {"slot": ""},
+            },
+        )
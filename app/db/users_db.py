@@ -2,36 +2,54 @@ from datetime import datetime
 from typing import Optional, Dict, Any, Union, List
 
 from bson import ObjectId
-from pydantic import EmailStr
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
 
-from app.conf import database, USER_COLLECTION
-from app.db.utils import convert_object_id_to_str, hash_password
+from app.conf import get_database, USER_COLLECTION
+from app.db.utils import convert_object_id_to_str
 from app.exceptions.user_exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
 )
 from app.models import User
 from app.schemas.users import UserCreate, UserUpdate
+from app.utils.auth_cache import invalidate_user
+from app.utils.passwords import hash_password
 
 
 class UserCRUD:
     def __init__(self):
-        self.collection = database[USER_COLLECTION]
+        self.collection = get_database()[USER_COLLECTION]
+
+    async def create_indexes(self) -> None:
+        """Create the unique indexes used for duplicate detection.
+
+        Writes rely on them to reject duplicate users, so start-up fails if
+        they cannot be built, e.g. while duplicate users are stored.
+        """
+        for field in ["email", "username"]:
+            try:
+                await self.collection.create_index(field, unique=True)
+            except OperationFailure as e:
+                raise RuntimeError(
+                    f"Cannot create the unique {field} index, remove duplicate "
+                    f"users first: {e}"
+                ) from e
 
     async def create_user(self, user: UserCreate):
-        if await self._check_if_user_exists(user.email, user.username):
-            raise UserAlreadyExistsException()
-
         new_user = User(
             username=user.username,
             email=user.email,
-            password_hash=hash_password(user.password),
+            password_hash=await hash_password(user.password),
             created_at=datetime.now(),
         )
 
-        result = await self.collection.insert_one(new_user.model_dump(by_alias=True))
-        created_user = await self.collection.find_one({"_id": result.inserted_id})
-        return convert_object_id_to_str(created_user)
+        user_data = new_user.model_dump(by_alias=True)
+        try:
+            await self.collection.insert_one(user_data)
+        except DuplicateKeyError:
+            raise UserAlreadyExistsException()
+        return convert_object_id_to_str(user_data)
 
     async def get_all_users(self):
         users = await self.collection.find().to_list(length=100)
@@ -44,38 +62,35 @@ class UserCRUD:
         return convert_object_id_to_str(user)
 
     async def update_user(self, user_id: str, user_update: UserUpdate):
-        user = await self.collection.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            raise UserNotFoundException()
-
         update_data = user_update.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["password_hash"] = hash_password(update_data.pop("password"))
-
-        if "username" in update_data and update_data["username"] != user["username"]:
-            existing = await self.get_user_by_username(update_data["username"])
-            if existing:
-                raise UserAlreadyExistsException()
+            update_data["password_hash"] = await hash_password(
+                update_data.pop("password")
+            )
 
-        if "email" in update_data and update_data["email"] != user["email"]:
-            existing = await self.get_user_by_email(update_data["email"])
-            if existing:
-                raise UserAlreadyExistsException()
+        if not update_data:
+            return await self.get_user_by_id(user_id)
 
-        if update_data:
-            await self.collection.update_one(
-                {"_id": ObjectId(user_id)}, {"$set": update_data}
+        try:
+            user = await self.collection.find_one_and_update(
+                {"_id": ObjectId(user_id)},
+                {"$set": update_data},
+                return_document=ReturnDocument.BEFORE,
             )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsException()
+        if not user:
+            raise UserNotFoundException()
 
-        updated_user = await self.collection.find_one({"_id": ObjectId(user_id)})
-        return convert_object_id_to_str(updated_user)
+        await invalidate_user(user["email"])
+        return convert_object_id_to_str({**user, **update_data})
 
     async def delete_user(self, user_id: str):
-        user = await self.collection.find_one({"_id": ObjectId(user_id)})
+        user = await self.collection.find_one_and_delete({"_id": ObjectId(user_id)})
         if not user:
             raise UserNotFoundException()
-        await self.collection.delete_one({"_id": ObjectId(user_id)})
+        await invalidate_user(user["email"])
 
     async def get_user_by_email(self, email: str) -> Optional[User]:
         return await self.collection.find_one({"email": email})
@@ -83,12 +98,13 @@ class UserCRUD:
     async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         return await self.collection.find_one({"username": username})
 
-    async def _check_if_user_exists(self, email: EmailStr, username: str) -> bool:
-        count = await self.collection.count_documents(
-            {"$or": [{"email": str(email)}, {"username": username}]}
+    async def update_user_last_login(
+        self, user: User, password_hash: Optional[str] = None
+    ):
+        update_data: Dict[str, Any] = {"last_login": datetime.now()}
+        if password_hash:
+            update_data["password_hash"] = password_hash
+        await self.collection.update_one(
+            {"_id": ObjectId(user["_id"])}, {"$set": update_data}
         )
-        return count > 0
-
-    async def update_user_last_login(self, user: User):
-        user["last_login"] = datetime.now()
-        await self.collection.update_one({"_id": ObjectId(user["_id"])}, {"$set": user})
+        await invalidate_user(user["email"])
@@ -1,7 +1,5 @@
 from typing import Union, Dict, Any, List
 
-from passlib.context import CryptContext
-
 
 def convert_object_id_to_str(obj_data: Union[Dict[str, Any], List[Dict[str, Any]]]):
     """Convert ObjectId to string in document(s) and rename _id to id"""
@@ -15,10 +13,3 @@ def convert_object_id_to_str(obj_data: Union[Dict[str, Any], List[Dict[str, Any]
         obj_data["id"] = str(obj_data["_id"])
         del obj_data["_id"]
     return obj_data
-
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional, Type
+
+from fastapi import APIRouter, BackgroundTasks, Query, Depends, status
+
+from app.conf import SNAPSHOT_DIR, STALE_LISTING_DAYS
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from app.exceptions.archive_exceptions import ArchiveInProgressException
+from app.exceptions.snapshot_exceptions import SnapshotInProgressException
+from app.exceptions.stats_exceptions import StatsRebuildInProgressException
+from app.schemas.users import UserResponse
+from app.utils.auth import get_current_user
+from app.utils.passwords import password_queue_depth
+
+router = APIRouter()
+
+snapshot_lock = asyncio.Lock()
+stats_rebuild_lock = asyncio.Lock()
+archive_lock = asyncio.Lock()
+
+
+# The endpoints acquire their lock before returning 202 and the background
+# task releases it, so a second request cannot start the same job meanwhile
+
+
+async def reserve(lock: asyncio.Lock, exception: Type[Exception]):
+    if lock.locked():
+        raise exception()
+    await lock.acquire()
+
+
+async def run_snapshot(incremental: bool):
+    try:
+        # Imported here so pyarrow is only loaded once a snapshot is written
+        from app.utils.snapshot import write_snapshot
+
+        await write_snapshot(SNAPSHOT_DIR, incremental=incremental)
+    finally:
+        snapshot_lock.release()
+
+
+async def run_stats_rebuild():
+    try:
+        await CarStatsCRUD().rebuild()
+    finally:
+        stats_rebuild_lock.release()
+
+
+async def run_archive(days: int, source_site: Optional[str]):
+    try:
+        seen_before = datetime.now() - timedelta(days=days)
+        await CarCRUD().archive_stale(seen_before, source_site=source_site)
+    finally:
+        archive_lock.release()
+
+
+@router.post("/snapshots", status_code=status.HTTP_202_ACCEPTED)
+async def create_snapshot(
+    background_tasks: BackgroundTasks,
+    incremental: bool = Query(
+        True, description="Only append cars changed since the last snapshot"
+    ),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Start a Parquet snapshot of the cars collection"""
+    await reserve(snapshot_lock, SnapshotInProgressException)
+
+    background_tasks.add_task(run_snapshot, incremental)
+    return {"detail": "Snapshot started"}
+
+
+@router.post("/stats/rebuild", status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_stats(
+    background_tasks: BackgroundTasks,
+    _: UserResponse = Depends(get_current_user),
+):
+    """Recompute the materialized car price statistics"""
+    await reserve(stats_rebuild_lock, StatsRebuildInProgressException)
+
+    background_tasks.add_task(run_stats_rebuild)
+    return {"detail": "Stats rebuild started"}
+
+
+@router.post("/listings/archive", status_code=status.HTTP_202_ACCEPTED)
+async def archive_stale_listings(
+    background_tasks: BackgroundTasks,
+    days: int = Query(
+        STALE_LISTING_DAYS, ge=1, description="Archive cars not seen for this many days"
+    ),
+    source_site: Optional[str] = Query(None, description="Only archive this site"),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Move listings that crawls no longer see to the archive"""
+    await reserve(archive_lock, ArchiveInProgressException)
+
+    background_tasks.add_task(run_archive, days, source_site)
+    return {"detail": "Archiving started"}
+
+
+@router.get("/metrics")
+async def get_metrics(_: UserResponse = Depends(get_current_user)):
+    """Get runtime metrics of this worker"""
+    return {"password_hash_queue_depth": password_queue_depth()}
@@ -19,10 +19,16 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 async def login(request: Login, response: Response):
     user = await get_user(request.email)
-    if not user or not verify_password(request.password, user["password_hash"]):
+    if not user:
         raise InvalidCredentialsException
 
-    await update_last_login(user)
+    valid, new_password_hash = await verify_password(
+        request.password, user["password_hash"]
+    )
+    if not valid:
+        raise InvalidCredentialsException
+
+    await update_last_login(user, new_password_hash)
 
     access_token = create_access_token(data={"sub": user["email"]})
     refresh_token = create_refresh_token(data={"sub": user["email"]})
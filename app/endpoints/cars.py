@@ -1,68 +1,277 @@
-from typing import List
+import re
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Query, Depends
+from fastapi import APIRouter, Body, status, Query, Depends, Header, Request
+from fastapi.responses import StreamingResponse
 
+from app.conf import BULK_MAX_ITEMS, EXPORT_BATCH_SIZE
 from app.db.car_db import CarCRUD
-from app.schemas.cars import CarCreate, CarResponse, CarUpdate
+from app.db.car_stats_db import CarStatsCRUD
+from app.exceptions.car_exceptions import (
+    InvalidCarFieldsException,
+    InvalidEventIDException,
+)
+from app.schemas.cars import (
+    CAR_FIELDS,
+    CarBulkDeleteRequest,
+    CarBulkResponse,
+    CarCreate,
+    CarIdsRequest,
+    CarPriceHistoryEntry,
+    CarResponse,
+    CarUpdate,
+    CarStatsResponse,
+)
 from app.schemas.users import UserResponse
 from app.utils.auth import get_current_user
+from app.utils.car_events import stream_car_events
+from app.utils.export import EXPORT_MEDIA_TYPES, stream_export
+from app.utils.responses import fast_response
 
 router = APIRouter()
 
+EVENT_ID_PATTERN = re.compile(r"^\d+-\d+$")
+
 
 async def get_car_crud() -> CarCRUD:
     """Dependency to get CarCRUD instance"""
     return CarCRUD()
 
 
+async def get_car_stats_crud() -> CarStatsCRUD:
+    """Dependency to get CarStatsCRUD instance"""
+    return CarStatsCRUD()
+
+
+async def get_car_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. make,model,price"
+    ),
+) -> Optional[List[str]]:
+    """Dependency to parse the requested car response fields"""
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in CAR_FIELDS]
+    if unknown:
+        raise InvalidCarFieldsException(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
 @router.get("/", response_model=List[CarResponse])
 async def get_cars(
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of cars to skip"),
     limit: int = Query(
         100, ge=1, le=100, description="Maximum number of cars to return"
     ),
+    fields: Optional[List[str]] = Depends(get_car_fields),
+    include_archived: bool = Query(False, description="Also return archived cars"),
+    dedupe: bool = Query(False, description="Return one listing per physical car"),
     car_crud: CarCRUD = Depends(get_car_crud),
     _: UserResponse = Depends(get_current_user),
 ):
-    cars = await car_crud.get_cars(skip=skip, limit=limit)
-    return cars
+    cars = await car_crud.get_cars(
+        skip=skip,
+        limit=limit,
+        fields=fields,
+        include_archived=include_archived,
+        dedupe=dedupe,
+    )
+    return fast_response(request, cars)
+
+
+@router.get("/export")
+async def export_cars(
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format"
+    ),
+    make: Optional[str] = Query(None, description="Filter by make"),
+    year: Optional[int] = Query(None, description="Filter by production year"),
+    since: Optional[datetime] = Query(
+        None, description="Only cars updated at or after this timestamp"
+    ),
+    car_crud: CarCRUD = Depends(get_car_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Stream cars as NDJSON or CSV, resumable by the last seen updated_at"""
+    query = car_crud.build_filter(make=make, year=year, since=since)
+    batches = car_crud.iter_cars(query, batch_size=EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        stream_export(batches, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="cars.{export_format}"'},
+    )
+
+
+@router.get("/stats", response_model=List[CarStatsResponse])
+async def get_car_stats(
+    make: Optional[str] = Query(None, description="Filter by make"),
+    model: Optional[str] = Query(None, description="Filter by model"),
+    year: Optional[int] = Query(None, description="Filter by production year"),
+    skip: int = Query(0, ge=0, description="Number of entries to skip"),
+    limit: int = Query(
+        100, ge=1, le=100, description="Maximum number of entries to return"
+    ),
+    stats_crud: CarStatsCRUD = Depends(get_car_stats_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Get price statistics per make/model/year"""
+    return await stats_crud.get_stats(
+        make=make, model=model, year=year, skip=skip, limit=limit
+    )
+
+
+@router.get("/stream")
+async def stream_cars(
+    make: Optional[str] = Query(None, description="Filter by make"),
+    year: Optional[int] = Query(None, description="Filter by production year"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Push created and updated cars as server-sent events"""
+    if last_event_id and not EVENT_ID_PATTERN.match(last_event_id):
+        raise InvalidEventIDException()
+
+    return StreamingResponse(
+        stream_car_events(
+            last_event_id,
+            make=make,
+            year=year,
+            min_price=min_price,
+            max_price=max_price,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/bulk", response_model=CarBulkResponse)
+async def create_cars_bulk(
+    cars: List[CarCreate] = Body(..., max_length=BULK_MAX_ITEMS),
+    car_crud: CarCRUD = Depends(get_car_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Create many cars at once, reporting duplicates per item"""
+    results = await car_crud.create_cars(cars) if cars else []
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"count": created, "results": results}
+
+
+@router.post("/bulk/get", response_model=List[CarResponse])
+async def get_cars_bulk(
+    request: Request,
+    body: CarIdsRequest,
+    fields: Optional[List[str]] = Depends(get_car_fields),
+    car_crud: CarCRUD = Depends(get_car_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Get the cars with the given IDs, skipping unknown ones"""
+    cars = await car_crud.get_cars_by_ids(body.ids, fields=fields)
+    return fast_response(request, cars)
+
+
+@router.post("/bulk/delete", response_model=CarBulkResponse)
+async def delete_cars_bulk(
+    body: CarBulkDeleteRequest,
+    car_crud: CarCRUD = Depends(get_car_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Delete cars by IDs (with per-item status) or by make/year filter"""
+    if body.ids:
+        results = await car_crud.delete_cars_by_ids(body.ids)
+        deleted = sum(1 for result in results if result["status"] == "deleted")
+        return {"count": deleted, "results": results}
+
+    query = car_crud.build_filter(make=body.make, year=body.year)
+    return {"count": await car_crud.delete_cars_by_filter(query)}
 
 
 @router.get("/{car_id}", response_model=CarResponse)
 async def get_car_by_id(
+    request: Request,
     car_id: str,
+    fields: Optional[List[str]] = Depends(get_car_fields),
+    include_archived: bool = Query(False, description="Also look up archived cars"),
     car_crud: CarCRUD = Depends(get_car_crud),
     _: UserResponse = Depends(get_current_user),
 ):
-    return await car_crud.get_car_by_id(car_id)
+    car = await car_crud.get_car_by_id(
+        car_id, fields=fields, include_archived=include_archived
+    )
+    return fast_response(request, car)
 
 
 @router.get("/make/{make}", response_model=List[CarResponse])
 async def get_cars_by_make(
+    request: Request,
     make: str,
     skip: int = Query(0, ge=0, description="Number of cars to skip"),
     limit: int = Query(
         100, ge=1, le=100, description="Maximum number of cars to return"
     ),
+    fields: Optional[List[str]] = Depends(get_car_fields),
+    include_archived: bool = Query(False, description="Also return archived cars"),
+    dedupe: bool = Query(False, description="Return one listing per physical car"),
     car_crud: CarCRUD = Depends(get_car_crud),
     _: UserResponse = Depends(get_current_user),
 ):
     """Get cars filtered by make (e.g., Toyota, BMW)"""
-    return await car_crud.get_cars_by_make(make, skip=skip, limit=limit)
+    cars = await car_crud.get_cars_by_make(
+        make,
+        skip=skip,
+        limit=limit,
+        fields=fields,
+        include_archived=include_archived,
+        dedupe=dedupe,
+    )
+    return fast_response(request, cars)
 
 
 @router.get("/year/{year}", response_model=List[CarResponse])
 async def get_cars_by_year(
+    request: Request,
     year: int,
     skip: int = Query(0, ge=0, description="Number of cars to skip"),
     limit: int = Query(
         100, ge=1, le=100, description="Maximum number of cars to return"
     ),
+    fields: Optional[List[str]] = Depends(get_car_fields),
+    include_archived: bool = Query(False, description="Also return archived cars"),
+    dedupe: bool = Query(False, description="Return one listing per physical car"),
     car_crud: CarCRUD = Depends(get_car_crud),
     _: UserResponse = Depends(get_current_user),
 ):
     """Get cars filtered by production year"""
-    return await car_crud.get_cars_by_year(year, skip=skip, limit=limit)
+    cars = await car_crud.get_cars_by_year(
+        year,
+        skip=skip,
+        limit=limit,
+        fields=fields,
+        include_archived=include_archived,
+        dedupe=dedupe,
+    )
+    return fast_response(request, cars)
+
+
+@router.get("/{car_id}/history", response_model=List[CarPriceHistoryEntry])
+async def get_car_price_history(
+    request: Request,
+    car_id: str,
+    skip: int = Query(0, ge=0, description="Number of entries to skip"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of entries to return"
+    ),
+    car_crud: CarCRUD = Depends(get_car_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Get the price and mileage history of a car, oldest first"""
+    history = await car_crud.get_price_history(car_id, skip=skip, limit=limit)
+    return fast_response(request, history)
 
 
 @router.post("/", response_model=CarResponse, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,65 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.schemas.scrape import ScrapeJobCreate, ScrapeJobResponse
+from app.schemas.users import UserResponse
+from app.utils.auth import get_current_user
+from app.utils.scrape_jobs import scrape_job_manager
+
+router = APIRouter()
+
+
+async def get_scrape_job_crud() -> ScrapeJobCRUD:
+    """Dependency to get ScrapeJobCRUD instance"""
+    return ScrapeJobCRUD()
+
+
+@router.post(
+    "/jobs", response_model=ScrapeJobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def create_scrape_job(
+    job: ScrapeJobCreate,
+    job_crud: ScrapeJobCRUD = Depends(get_scrape_job_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Start scraping a site in a worker subprocess"""
+    created_job = await job_crud.create_job(job)
+    await scrape_job_manager.start(created_job["id"])
+    return created_job
+
+
+@router.get("/jobs", response_model=List[ScrapeJobResponse])
+async def get_scrape_jobs(
+    skip: int = Query(0, ge=0, description="Number of jobs to skip"),
+    limit: int = Query(
+        100, ge=1, le=100, description="Maximum number of jobs to return"
+    ),
+    job_crud: ScrapeJobCRUD = Depends(get_scrape_job_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Get scrape jobs, newest first"""
+    return await job_crud.get_jobs(skip=skip, limit=limit)
+
+
+@router.get("/jobs/{job_id}", response_model=ScrapeJobResponse)
+async def get_scrape_job(
+    job_id: str,
+    job_crud: ScrapeJobCRUD = Depends(get_scrape_job_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Get the status and live progress counters of a scrape job"""
+    return await job_crud.get_job(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=ScrapeJobResponse)
+async def cancel_scrape_job(
+    job_id: str,
+    job_crud: ScrapeJobCRUD = Depends(get_scrape_job_crud),
+    _: UserResponse = Depends(get_current_user),
+):
+    """Cancel a queued or running scrape job"""
+    job = await job_crud.request_cancel(job_id)
+    scrape_job_manager.cancel(job_id)
+    return job
@@ -1,4 +1,5 @@
-from fastapi import HTTPException, status  # type: ignore
+from starlette import status
+from starlette.exceptions import HTTPException
 
 
 class InvalidCredentialsException(HTTPException):
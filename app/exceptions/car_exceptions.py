@@ -1,4 +1,4 @@
-from fastapi import HTTPException
+from starlette.exceptions import HTTPException
 
 
 class CarAPIException(HTTPException):
@@ -23,3 +23,13 @@ class CarAlreadyExistsException(CarAPIException):
 class InvalidCarIDException(CarAPIException):
     def __init__(self, detail=None):
         super().__init__(detail=detail or "Invalid car ID format", status_code=400)
+
+
+class InvalidCarFieldsException(CarAPIException):
+    def __init__(self, detail=None):
+        super().__init__(detail=detail or "Invalid fields requested", status_code=400)
+
+
+class InvalidEventIDException(CarAPIException):
+    def __init__(self, detail=None):
+        super().__init__(detail=detail or "Invalid Last-Event-ID", status_code=400)
@@ -0,0 +1,34 @@
+from starlette import status
+from starlette.exceptions import HTTPException
+
+
+class ScrapeJobNotFoundException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scrape job not found",
+        )
+
+
+class ScrapeJobLimitException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many scrape jobs are running",
+        )
+
+
+class ScrapeJobStartException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Scrape job worker could not be started",
+        )
+
+
+class ScrapeJobFinishedException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Scrape job has already finished",
+        )
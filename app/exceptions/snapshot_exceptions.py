@@ -0,0 +1,10 @@
+from starlette import status
+from starlette.exceptions import HTTPException
+
+
+class SnapshotInProgressException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A snapshot is already running",
+        )
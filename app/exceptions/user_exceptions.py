@@ -1,4 +1,5 @@
-from fastapi import HTTPException, status
+from starlette import status
+from starlette.exceptions import HTTPException
 
 
 class UserNotFoundException(HTTPException):
@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, model_validator, ConfigDict
 
+from app.conf import BULK_MAX_ITEMS
 from app.schemas.base import BaseDBModel
 
 
@@ -26,29 +27,6 @@ class CarBase(BaseModel):
     location: str = Field(..., min_length=1, max_length=100, description="Car location")
     image_url: Optional[HttpUrl] = Field(None, description="URL of the car image")
 
-    @model_validator(mode="after")
-    def validate_car_data(self):
-        """Validate car data and provide defaults for missing values"""
-        if not self.make:
-            self.make = "Unknown"
-        if not self.model:
-            self.model = "Unknown"
-        if not self.year or self.year < 1900 or self.year > 2030:
-            self.year = 2000
-        if self.price is None or self.price < 0:
-            self.price = 0.0
-        if self.mileage is None or self.mileage < 0:
-            self.mileage = 0
-        if not self.engine_type:
-            self.engine_type = "Unknown"
-        if not self.engine_capacity:
-            self.engine_capacity = "Unknown"
-        if not self.transmission:
-            self.transmission = "Unknown"
-        if not self.location:
-            self.location = "Unknown"
-        return self
-
 
 class CarCreate(CarBase):
     """Schema for creating a new car"""
@@ -57,13 +35,9 @@ class CarCreate(CarBase):
     source_site: str = Field(
         ..., min_length=1, max_length=100, description="Source site name"
     )
-
-    @model_validator(mode="after")
-    def validate_source_data(self):
-        """Validate source data"""
-        if not self.source_site:
-            self.source_site = "Unknown"
-        return self
+    source_page: Optional[int] = Field(
+        None, ge=1, description="Results page a crawl last saw the listing on"
+    )
 
 
 class CarUpdate(BaseModel):
@@ -97,6 +71,31 @@ class CarUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CarStatsResponse(BaseModel):
+    """Schema for materialized price statistics of a make/model/year"""
+
+    make: str = Field(..., description="Car make name (lowercase)")
+    model: str = Field(..., description="Car model name (lowercase)")
+    year: Optional[int] = Field(None, description="Year of manufacture")
+    count: int = Field(..., description="Number of listings")
+    min_price: float = Field(..., description="Minimum price")
+    max_price: float = Field(..., description="Maximum price")
+    mean_price: float = Field(..., description="Mean price")
+    p25: float = Field(..., description="Approximate 25th percentile price")
+    p50: float = Field(..., description="Approximate median price")
+    p75: float = Field(..., description="Approximate 75th percentile price")
+    p90: float = Field(..., description="Approximate 90th percentile price")
+    updated_at: datetime = Field(..., description="Last update timestamp")
+
+
+class CarPriceHistoryEntry(BaseModel):
+    """Schema for a price history point of a car"""
+
+    price: float = Field(..., description="Price in USD")
+    mileage: Optional[int] = Field(None, description="Mileage in kilometers")
+    recorded_at: datetime = Field(..., description="When the price was seen")
+
+
 class CarResponse(CarBase, BaseDBModel):
     """Schema for car stored in database"""
 
@@ -105,6 +104,15 @@ class CarResponse(CarBase, BaseDBModel):
         ..., min_length=1, max_length=100, description="Source site name"
     )
     updated_at: datetime = Field(..., description="Last update timestamp")
+    last_seen_at: Optional[datetime] = Field(
+        None, description="When a crawl last saw the listing"
+    )
+    archived_at: Optional[datetime] = Field(
+        None, description="When the listing was archived, if it is no longer active"
+    )
+    cluster_id: Optional[str] = Field(
+        None, description="Shared by listings of the same car on different sites"
+    )
     image_url: Optional[HttpUrl] = None
 
     model_config = ConfigDict(
@@ -126,6 +134,57 @@ class CarResponse(CarBase, BaseDBModel):
                 "source_site": "CarSales",
                 "created_at": "2023-05-26T10:00:00",
                 "updated_at": "2023-05-26T10:00:00",
+                "last_seen_at": "2023-05-27T10:00:00",
+                "archived_at": None,
+                "cluster_id": "507f1f77bcf86cd799439011",
             }
         },
     )
+
+
+class CarIdsRequest(BaseModel):
+    """Schema for a batch of car IDs"""
+
+    ids: List[str] = Field(
+        ..., min_length=1, max_length=BULK_MAX_ITEMS, description="Car IDs"
+    )
+
+
+class CarBulkDeleteRequest(BaseModel):
+    """Schema for deleting cars by IDs or by filter"""
+
+    ids: Optional[List[str]] = Field(
+        None, min_length=1, max_length=BULK_MAX_ITEMS, description="Car IDs"
+    )
+    make: Optional[str] = Field(None, description="Delete cars of this make")
+    year: Optional[int] = Field(None, description="Delete cars of this year")
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        """Require either IDs or a filter, but not both"""
+        has_filter = self.make is not None or self.year is not None
+        if bool(self.ids) == has_filter:
+            raise ValueError("Provide either ids or a make/year filter")
+        return self
+
+
+class CarBulkItemResult(BaseModel):
+    """Outcome of a single item of a bulk operation"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[str] = Field(None, description="Car ID")
+    status: str = Field(..., description="Outcome of the item")
+    detail: Optional[str] = Field(None, description="Error details")
+
+
+class CarBulkResponse(BaseModel):
+    """Schema for the result of a bulk operation"""
+
+    count: int = Field(..., description="Number of cars created or deleted")
+    results: List[CarBulkItemResult] = Field(
+        default_factory=list, description="Per-item outcome"
+    )
+
+
+# Fields a client can request through the ``fields`` query parameter
+CAR_FIELDS = list(CarResponse.model_fields)
@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.base import BaseDBModel
+
+
+class ScrapeJobCreate(BaseModel):
+    """Schema for starting a scrape job"""
+
+    site: Literal["autoria", "autobazar"] = Field(..., description="Site to scrape")
+    makes: List[str] = Field(
+        default_factory=list, description="Makes to scrape, empty for all makes"
+    )
+    threads: int = Field(5, ge=1, le=50, description="Makes processed concurrently")
+
+
+class ScrapeJobProgress(BaseModel):
+    """Live counters of a scrape job"""
+
+    makes_done: int = Field(0, description="Makes processed so far")
+    processed: int = Field(0, description="Listings parsed")
+    saved: int = Field(0, description="Listings created or updated")
+    errors: int = Field(0, description="Errors")
+
+
+class ScrapeJobResponse(ScrapeJobCreate, BaseDBModel):
+    """Schema for a scrape job"""
+
+    status: str = Field(
+        ..., description="queued, running, completed, failed or cancelled"
+    )
+    progress: ScrapeJobProgress = Field(default_factory=ScrapeJobProgress)
+    cancel_requested: bool = Field(False, description="Cancellation was requested")
+    started_at: Optional[datetime] = Field(None, description="Start timestamp")
+    finished_at: Optional[datetime] = Field(None, description="Finish timestamp")
+    error: Optional[str] = Field(None, description="Error of a failed job")
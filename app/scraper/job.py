@@ -0,0 +1,81 @@
+import asyncio
+import signal
+import sys
+
+from app.conf import init_redis, close_redis, SCRAPE_JOB_HEARTBEAT
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.scraper.scraper import run
+from app.scraper.utils.identity_pool import identity_pool
+from app.scraper.utils.logger import setup_logger
+
+logger = setup_logger("app.scraper.job")
+
+
+async def run_job(job_id: str) -> str:
+    """Run a queued scrape job, recording progress after every make.
+
+    The job stops on SIGTERM, when a cancellation is requested through the
+    API, which is checked whenever a make is done, or when it was marked
+    failed for missing heartbeats. Returns the final status.
+    """
+    jobs = ScrapeJobCRUD()
+    job = await jobs.get_job(job_id)
+    if job["cancel_requested"]:
+        await jobs.finish(job_id, "cancelled")
+        return "cancelled"
+
+    task = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+    async def on_make_done(results):
+        if await jobs.add_progress(job_id, results):
+            task.cancel()
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(SCRAPE_JOB_HEARTBEAT)
+            try:
+                if not await jobs.heartbeat(job_id):
+                    logger.warning(f"Scrape job {job_id} is no longer active")
+                    task.cancel()
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat of scrape job {job_id} failed: {e}")
+
+    if not await jobs.mark_running(job_id):
+        logger.error(f"Scrape job {job_id} is no longer queued")
+        return "failed"
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        await run(
+            site=job["site"],
+            threads=job["threads"],
+            makes=job["makes"],
+            on_make_done=on_make_done,
+        )
+    except asyncio.CancelledError:
+        logger.info(f"Scrape job {job_id} cancelled")
+        await jobs.finish(job_id, "cancelled")
+        return "cancelled"
+    except Exception as e:
+        logger.error(f"Scrape job {job_id} failed: {e}")
+        await jobs.finish(job_id, "failed", str(e))
+        return "failed"
+    finally:
+        heartbeat_task.cancel()
+    await jobs.finish(job_id, "completed")
+    return "completed"
+
+
+async def main(job_id: str) -> int:
+    """Run a job and return the exit code, non-zero if it failed."""
+    init_redis()
+    try:
+        return 1 if await run_job(job_id) == "failed" else 0
+    finally:
+        await identity_pool.aclose()
+        await close_redis()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1])))
@@ -1,6 +1,8 @@
 import asyncio
 
+from app.conf import init_redis, close_redis
 from app.scraper.scraper import run
+from app.scraper.utils.identity_pool import identity_pool
 
 
 async def main():
@@ -10,11 +12,16 @@ async def main():
     threads = 40
     site = "autobazar"  # or autoria
 
-    await run(
-        site=site,
-        threads=threads,
-        makes=makes,
-    )
+    init_redis()
+    try:
+        await run(
+            site=site,
+            threads=threads,
+            makes=makes,
+        )
+    finally:
+        await identity_pool.aclose()
+        await close_redis()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 from typing import Dict, List, Optional, Any
 
 from app.scraper.parsers.base import BaseParser, transform_make_for_source
-from app.scraper.utils.http_client import send_request, HEADERS
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.http_client import send_request
 from app.scraper.utils.logger import setup_logger
 from app.scraper.utils.site_helper.autobazar_site_helper import parse_announce
 
@@ -24,7 +25,6 @@ class AutoBazarParser(BaseParser):
             response = await send_request(
                 url=url,
                 method="GET",
-                headers=HEADERS,
                 params=params,
             )
 
@@ -42,17 +42,15 @@ class AutoBazarParser(BaseParser):
             logger.error(f"Error fetching data for make {make["title"]}: {e}")
             return None
 
-    def parse_data(self, content: Any, make: str = "") -> List[Dict]:
+    def parse_data(self, content: Any, make: str = "") -> List[Listing]:
         """Parse content from HTML response into car listings."""
         parsed_cars = []
         for ticket_item in content:
             try:
                 announce = parse_announce(ticket_item, self.site_name, self.base_url)
                 if announce:
-                    if not announce.get("make") and make:
-                        announce["make"] = make
-
-                    announce["site_name"] = self.site_name
+                    if not announce.make and make:
+                        announce.make = make
                     parsed_cars.append(announce)
 
             except Exception as e:
@@ -67,7 +65,6 @@ class AutoBazarParser(BaseParser):
         response = await send_request(
             url=url,
             method="GET",
-            headers=HEADERS,
         )
 
         makes = response.json()
@@ -1,10 +1,12 @@
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from app.scraper.parsers.base import BaseParser, transform_make_for_source
-from app.scraper.utils.http_client import send_request, HEADERS
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.http_client import send_request, stream_text
 from app.scraper.utils.logger import setup_logger
 from app.scraper.utils.site_helper.autoria_site_helper import (
     extract_ticket_items,
+    iter_ticket_items,
     parse_announce,
 )
 
@@ -23,7 +25,6 @@ class AutoRiaParser(BaseParser):
             response = await send_request(
                 url=url,
                 method="GET",
-                headers=HEADERS,
                 params={"page": page},
             )
 
@@ -41,27 +42,47 @@ class AutoRiaParser(BaseParser):
             logger.error(f"Error fetching data for make {make}: {e}")
             return None
 
-    def parse_data(self, content: Any, make: str = "") -> List[Dict]:
+    async def stream_cars(self, make: str) -> AsyncIterator[Listing]:
+        """Yield car listings while the Auto.ria pages are still downloading."""
+        source_make = transform_make_for_source(make=make)
+        for page in self.crawl_pages:
+            try:
+                chunks = stream_text(
+                    url=f"{self.base_url}/uk/car/{source_make}/",
+                    params={"page": page},
+                )
+                async for ticket_item in iter_ticket_items(chunks):
+                    announce = self._parse_ticket(ticket_item, make)
+                    if announce:
+                        announce.source_page = page
+                        yield announce
+            except Exception as e:
+                logger.error(f"Error streaming data for make {make}: {e}")
+
+    def parse_data(self, content: Any, make: str = "") -> List[Listing]:
         """Parse content from HTML response into car listings."""
         if not content or "results" not in content:
             return []
 
         parsed_cars = []
         for ticket_item in content.get("results", []):
-            try:
-                announce = parse_announce(ticket_item, self.site_name, self.base_url)
-                if announce:
-                    if not announce.get("make") and make:
-                        announce["make"] = make
+            announce = self._parse_ticket(ticket_item, make)
+            if announce:
+                parsed_cars.append(announce)
 
-                    announce["site_name"] = self.site_name
-                    parsed_cars.append(announce)
+        return parsed_cars
 
-            except Exception as e:
-                logger.error(f"Error parsing car announce: {e}")
-                continue
+    def _parse_ticket(self, ticket_item, make: str) -> Optional[Listing]:
+        try:
+            announce = parse_announce(ticket_item, self.site_name, self.base_url)
+            if announce:
+                if not announce.make and make:
+                    announce.make = make
+                return announce
 
-        return parsed_cars
+        except Exception as e:
+            logger.error(f"Error parsing car announce: {e}")
+        return None
 
     async def get_car_brands(self, preferred_makes: list) -> List[str]:
         """Get list of car brands from NHTSA API."""
@@ -73,7 +94,6 @@ class AutoRiaParser(BaseParser):
         response = await send_request(
             url=url,
             method="GET",
-            headers=HEADERS,
         )
 
         data = response.json()
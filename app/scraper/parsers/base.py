@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, List, Optional
+
+from app.scraper.utils.listing import Listing
 
 
 def transform_make_for_source(make: str) -> str:
@@ -10,6 +12,10 @@ def transform_make_for_source(make: str) -> str:
 class BaseParser(ABC):
     """Abstract base class for car site parsers."""
 
+    # Results pages read for every make. Crawls only archive listings that
+    # were last seen on one of them.
+    crawl_pages: List[int] = [1]
+
     def __init__(self, base_url: str, site_name: str):
         self.base_url = base_url
         self.site_name = site_name
@@ -20,10 +26,23 @@ class BaseParser(ABC):
         pass
 
     @abstractmethod
-    def parse_data(self, content: Any, make: str = "") -> List[Dict]:
+    def parse_data(self, content: Any, make: str = "") -> List[Listing]:
         """Parse content into car listings."""
         pass
 
+    async def stream_cars(self, make) -> AsyncIterator[Listing]:
+        """Yield the car listings of a make as they are parsed.
+
+        Parsers that can read their pages incrementally override this; by
+        default the page is fetched and parsed as a whole.
+        """
+        for page in self.crawl_pages:
+            content = await self.get_content(make, page)
+            if content:
+                for car in self.parse_data(content, make):
+                    car.source_page = page
+                    yield car
+
     @abstractmethod
     async def get_car_brands(self, preferred_makes: list) -> List[str]:
         """Get list of car brands supported by this parser."""
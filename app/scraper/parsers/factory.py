@@ -1,9 +1,38 @@
-from typing import Optional
+import importlib
+from typing import Dict, List, Optional
 
-from app.scraper.parsers.autobazar_parser import AutoBazarParser
-from app.scraper.parsers.autoria_parser import AutoRiaParser
 from app.scraper.parsers.base import BaseParser
 
+# Site type -> parser class path, base URL and site name. Parser modules are
+# only imported when their site is first requested.
+PARSER_REGISTRY: Dict[str, Dict[str, str]] = {
+    "autoria": {
+        "class": "app.scraper.parsers.autoria_parser:AutoRiaParser",
+        "base_url": "https://auto.ria.com",
+        "site_name": "AutoRia",
+    },
+    "autobazar": {
+        "class": "app.scraper.parsers.autobazar_parser:AutoBazarParser",
+        "base_url": "https://avtobazar.ua",
+        "site_name": "AutoBazar",
+    },
+}
+
+
+def available_sites() -> List[str]:
+    """Return the site types a parser is registered for."""
+    return list(PARSER_REGISTRY)
+
+
+def load_parser_class(site_type: str) -> Optional[type]:
+    """Import and return the parser class of a site type, or None if unknown."""
+    parser_config = PARSER_REGISTRY.get(site_type.lower())
+    if not parser_config:
+        return None
+
+    module_name, class_name = parser_config["class"].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
 
 def create_parser(site_type: str) -> Optional[BaseParser]:
     """Factory function to create appropriate parser for the given site type.
@@ -16,23 +45,11 @@ def create_parser(site_type: str) -> Optional[BaseParser]:
     Returns:
         An instance of the appropriate parser class, or None if site_type is unknown
     """
-    parser_configs = {
-        "autoria": {
-            "class": AutoRiaParser,
-            "base_url": "https://auto.ria.com",
-            "site_name": "AutoRia",
-        },
-        "autobazar": {
-            "class": AutoBazarParser,
-            "base_url": "https://avtobazar.ua",
-            "site_name": "AutoBazar",
-        },
-    }
-
-    parser_config = parser_configs.get(site_type.lower())
-    if not parser_config:
+    parser_class = load_parser_class(site_type)
+    if parser_class is None:
         return None
 
-    return parser_config["class"](
+    parser_config = PARSER_REGISTRY[site_type.lower()]
+    return parser_class(
         base_url=parser_config["base_url"], site_name=parser_config["site_name"]
     )
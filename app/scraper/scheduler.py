@@ -0,0 +1,230 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Set, Tuple
+
+from app.conf import (
+    init_redis,
+    close_redis,
+    CRAWL_CONCURRENCY,
+    CRAWL_DEFAULT_INTERVAL,
+    CRAWL_MAKES,
+    CRAWL_MAX_INTERVAL,
+    CRAWL_MIN_INTERVAL,
+    CRAWL_REQUESTS_PER_HOUR,
+    CRAWL_SITES,
+    CRAWL_TARGET_CHANGES,
+    STALE_LISTING_DAYS,
+)
+from app.db.car_db import CarCRUD
+from app.db.crawl_schedule_db import CrawlScheduleCRUD
+from app.db.indexes import create_indexes
+from app.scraper.parsers.factory import create_parser
+from app.scraper.scraper import process_make
+from app.scraper.utils.car_writer import CarWriter
+from app.scraper.utils.identity_pool import identity_pool
+from app.scraper.utils.logger import setup_logger
+
+logger = setup_logger("app.scraper.scheduler")
+
+# Weight of the latest crawl in the churn rate estimate
+CHURN_SMOOTHING = 0.5
+
+
+def make_name(make) -> str:
+    return make.get("title") if isinstance(make, dict) else make
+
+
+def next_interval(
+    entry: Dict[str, Any], processed: int, changed: int, now: datetime
+) -> Tuple[float, float]:
+    """Return the new churn rate (changes per hour) and recrawl interval.
+
+    The interval is chosen so that a crawl finds about CRAWL_TARGET_CHANGES
+    new or changed listings. Makes without changes back off exponentially.
+    """
+    last_run_at = entry.get("last_run_at")
+    if last_run_at:
+        elapsed = (now - last_run_at).total_seconds()
+    else:
+        elapsed = entry["interval"]
+    sample = changed / max(elapsed, CRAWL_MIN_INTERVAL) * 3600
+
+    if entry.get("runs"):
+        churn_rate = CHURN_SMOOTHING * sample
+        churn_rate += (1 - CHURN_SMOOTHING) * entry["churn_rate"]
+    else:
+        churn_rate = sample
+
+    if churn_rate > 0:
+        interval = CRAWL_TARGET_CHANGES / churn_rate * 3600
+    else:
+        interval = entry["interval"] * 2
+    if processed and changed >= processed:
+        # Everything on the page was new, so listings were probably missed
+        interval = min(interval, entry["interval"] / 2)
+    return churn_rate, min(max(interval, CRAWL_MIN_INTERVAL), CRAWL_MAX_INTERVAL)
+
+
+def priority(entry: Dict[str, Any], now: datetime) -> float:
+    """Return the expected number of changes since the last crawl."""
+    if entry.get("last_run_at") is None:
+        return float("inf")
+    hours = (now - entry["last_run_at"]).total_seconds() / 3600
+    return entry["churn_rate"] * hours
+
+
+class RequestBudget:
+    """Token bucket spreading a number of requests evenly over an hour."""
+
+    def __init__(self, requests_per_hour: int):
+        self.rate = requests_per_hour / 3600
+        self.capacity = max(1.0, requests_per_hour / 60)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def available(self) -> int:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self, count: int = 1):
+        self.tokens -= count
+
+
+class CrawlScheduler:
+    """Recrawls each (site, make) at a rate learned from its churn.
+
+    Due entries are started most-changes-expected first, within the hourly
+    request budget. The schedule is stored in Mongo, so it survives restarts.
+    """
+
+    def __init__(
+        self,
+        sites: List[str],
+        makes: List[str],
+        requests_per_hour: int = CRAWL_REQUESTS_PER_HOUR,
+        concurrency: int = CRAWL_CONCURRENCY,
+    ):
+        self.sites = sites
+        self.preferred_makes = makes
+        self.budget = RequestBudget(requests_per_hour)
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.schedule = CrawlScheduleCRUD()
+        self.parsers: Dict[str, Any] = {}
+        self.makes: Dict[str, Dict[str, Any]] = {}
+        self.running: Set[Tuple[str, str]] = set()
+        self.tasks: Set[asyncio.Task] = set()
+        self.writer = CarWriter()
+
+    async def setup(self):
+        """Load the makes of every site and add missing schedule entries."""
+        now = datetime.now()
+        for site in self.sites:
+            parser = create_parser(site)
+            if not parser:
+                logger.error(f"No parser implementation found for site type: {site}")
+                continue
+
+            self.budget.take()
+            makes = await parser.get_car_brands(self.preferred_makes)
+            self.parsers[parser.site_name] = parser
+            self.makes[parser.site_name] = {make_name(make): make for make in makes}
+            await self.schedule.ensure_entries(
+                parser.site_name,
+                list(self.makes[parser.site_name]),
+                CRAWL_DEFAULT_INTERVAL,
+                now,
+            )
+            logger.info(f"Scheduling {len(makes)} makes for {parser.site_name}")
+
+    async def crawl(self, site: str, entry: Dict[str, Any]):
+        make = self.makes[site][entry["make"]]
+        try:
+            results = await process_make(
+                self.parsers[site], make, self.semaphore, writer=self.writer
+            )
+            now = datetime.now()
+            churn_rate, interval = next_interval(
+                entry, results["processed"], results["saved"], now
+            )
+            await self.schedule.record_crawl(
+                entry,
+                {
+                    "churn_rate": churn_rate,
+                    "interval": interval,
+                    "last_run_at": now,
+                    "next_run_at": now + timedelta(seconds=interval),
+                    "last_processed": results["processed"],
+                    "last_changed": results["saved"],
+                    "last_errors": results["errors"],
+                },
+            )
+            logger.info(
+                f"Crawled {site} {entry['make']}: {results['saved']} changes, "
+                f"next in {interval / 60:.0f} min"
+            )
+
+            if results["processed"]:
+                await CarCRUD().archive_stale(
+                    now - timedelta(days=STALE_LISTING_DAYS),
+                    source_site=site,
+                    makes=[entry["make"]],
+                    pages=self.parsers[site].crawl_pages,
+                )
+        except Exception as e:
+            logger.error(f"Error crawling {site} {entry['make']}: {e}")
+        finally:
+            self.running.discard((site, entry["make"]))
+
+    async def run_once(self):
+        """Start the due crawls that fit in the budget and free slots."""
+        slots = min(self.budget.available(), self.concurrency - len(self.running))
+        if slots <= 0:
+            return
+
+        now = datetime.now()
+        due = []
+        for site, makes in self.makes.items():
+            entries = await self.schedule.get_due(site, list(makes), now)
+            due += [
+                (site, entry)
+                for entry in entries
+                if (site, entry["make"]) not in self.running
+            ]
+        due.sort(key=lambda item: (-priority(item[1], now), item[1]["next_run_at"]))
+
+        for site, entry in due[:slots]:
+            self.budget.take()
+            self.running.add((site, entry["make"]))
+            lease_until = now + timedelta(seconds=entry["interval"])
+            await self.schedule.claim(entry, lease_until)
+            task = asyncio.create_task(self.crawl(site, entry))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run(self, tick: float = 5.0):
+        await self.setup()
+        async with self.writer:
+            while True:
+                await self.run_once()
+                await asyncio.sleep(tick)
+
+
+async def main():
+    sites = [site.strip() for site in CRAWL_SITES.split(",") if site.strip()]
+    makes = [make.strip() for make in CRAWL_MAKES.split(",") if make.strip()]
+
+    init_redis()
+    try:
+        await create_indexes()
+        await CrawlScheduler(sites, makes).run()
+    finally:
+        await identity_pool.aclose()
+        await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
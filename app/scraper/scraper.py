@@ -1,62 +1,96 @@
 import asyncio
 import traceback
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, List, Optional
 
+from app.conf import SCRAPER_SINK
 from app.scraper.parsers.factory import create_parser
+from app.scraper.utils.car_writer import CarWriter
 from app.scraper.utils.logger import setup_logger
+from app.scraper.utils.sinks import create_sink
 from app.scraper.utils.utils import chunk_list, process_car_data
 
 logger = setup_logger("app.scraper")
 
+# Called with the results of every processed make
+MakeDoneCallback = Callable[[Dict[str, int]], Awaitable[None]]
 
-async def process_make(parser, make, semaphore: asyncio.Semaphore) -> Dict[str, int]:
-    """Process a single make with semaphore control."""
+
+async def process_make(
+    parser,
+    make,
+    semaphore: asyncio.Semaphore,
+    on_make_done: Optional[MakeDoneCallback] = None,
+    writer: Optional[CarWriter] = None,
+) -> Dict[str, int]:
+    """Process a single make with semaphore control.
+
+    Cars are written by ``writer``, or by a writer of this make if none is
+    given. The results count a car as saved once its batch is written.
+    """
+    if writer is None:
+        async with CarWriter() as writer:
+            results = await _process_make(parser, make, semaphore, writer)
+    else:
+        results = await _process_make(parser, make, semaphore, writer)
+    if on_make_done:
+        await on_make_done(results)
+    return results
+
+
+async def _process_make(
+    parser, make, semaphore: asyncio.Semaphore, writer: CarWriter
+) -> Dict[str, int]:
     results = {"processed": 0, "saved": 0, "errors": 0}
+    pending = []
 
     make_name = make.get("title") if isinstance(make, dict) else make
 
     async with semaphore:
         try:
             logger.info(f"Processing make: {make_name}")
-            content = await parser.get_content(make)
-
-            if not content:
-                logger.warning(f"No content found for make: {make_name}")
-                return results
-
-            cars = parser.parse_data(content, make)
-            results["processed"] = len(cars)
-
-            for car_data in cars:
+            async for car_data in parser.stream_cars(make):
+                results["processed"] += 1
                 try:
-                    saved = await process_car_data(car_data)
-                    if saved:
-                        results["saved"] += 1
+                    pending.append(await process_car_data(car_data, writer))
                 except Exception as e:
                     logger.error(f"Error processing car for make {make_name}: {e}")
                     results["errors"] += 1
-
-            logger.info(
-                f"Completed processing make {make_name}. Processed: {results['processed']}, "
-                f"Saved: {results['saved']}, Errors: {results['errors']}"
-            )
-            return results
-
         except Exception as e:
             logger.error(f"Error processing make {make_name}: {e}\n")
             results["errors"] += 1
-            return results
+
+    for outcome in await asyncio.gather(*pending, return_exceptions=True):
+        if isinstance(outcome, Exception) or outcome == "invalid":
+            results["errors"] += 1
+        elif outcome != "unchanged":
+            results["saved"] += 1
+
+    if not results["processed"]:
+        logger.warning(f"No content found for make: {make_name}")
+        return results
+
+    logger.info(
+        f"Completed processing make {make_name}. Processed: {results['processed']}, "
+        f"Saved: {results['saved']}, Errors: {results['errors']}"
+    )
+    return results
 
 
 async def process_makes_chunk(
-    parser, makes_chunk: List[str], semaphore: asyncio.Semaphore
+    parser,
+    makes_chunk: List[str],
+    semaphore: asyncio.Semaphore,
+    on_make_done: Optional[MakeDoneCallback] = None,
+    writer: Optional[CarWriter] = None,
 ) -> Dict[str, int]:
     """Process a chunk of makes."""
     tasks = []
     results = {"processed": 0, "saved": 0, "errors": 0}
 
     for make in makes_chunk:
-        task = asyncio.create_task(process_make(parser, make, semaphore))
+        task = asyncio.create_task(
+            process_make(parser, make, semaphore, on_make_done, writer)
+        )
         tasks.append(task)
 
     make_results = await asyncio.gather(*tasks)
@@ -70,7 +104,11 @@ async def process_makes_chunk(
 
 
 async def run_parser(
-    parser, threads: int = 5, makes: List[str] = None
+    parser,
+    threads: int = 5,
+    makes: List[str] = None,
+    on_make_done: Optional[MakeDoneCallback] = None,
+    writer: Optional[CarWriter] = None,
 ) -> Dict[str, int]:
     """Run a parser with specified number of threads."""
     try:
@@ -93,7 +131,9 @@ async def run_parser(
 
         tasks = []
         for chunk in make_chunks:
-            task = asyncio.create_task(process_makes_chunk(parser, chunk, semaphore))
+            task = asyncio.create_task(
+                process_makes_chunk(parser, chunk, semaphore, on_make_done, writer)
+            )
             tasks.append(task)
 
         chunk_results = await asyncio.gather(*tasks)
@@ -110,29 +150,49 @@ async def run_parser(
         return total_results
     except Exception as e:
         logger.error(f"Error running parser: {e}")
-        return {"processed": 0, "saved": 0, "errors": 1}
+        raise
 
 
 async def run(
     site: str,
     threads: int = 5,
     makes: List[str] = [],
+    on_make_done: Optional[MakeDoneCallback] = None,
+    sink: Optional[str] = None,
 ):
-    """Run the parser with the given parameters."""
+    """Run the parser with the given parameters.
+
+    ``sink`` selects where cars go, e.g. ``mongo`` or
+    ``jsonl:data/cars.jsonl.gz,null``; SCRAPER_SINK by default. Errors that
+    stop the run are logged and raised, so callers can report the failure.
+    """
     try:
         logger.info(f"Starting parser for site: {site}")
 
         parser = create_parser(site)
-        site_name = parser.site_name
         if not parser:
-            logger.error(f"No parser implementation found for site type: {site_name}")
-            return {"processed": 0, "saved": 0, "errors": 1}
-
-        makes = await parser.get_car_brands(makes)
+            raise ValueError(f"No parser implementation found for site type: {site}")
+        site_name = parser.site_name
 
-        results = await run_parser(parser, threads, makes)
-        logger.info(f"Parser for {site_name} completed with results: {results}")
+        car_sink = create_sink(sink or SCRAPER_SINK)
+        await car_sink.open()
+        try:
+            makes = await parser.get_car_brands(makes)
+
+            # One writer owns the writes of the whole run
+            async with CarWriter(car_sink) as writer:
+                results = await run_parser(parser, threads, makes, on_make_done, writer)
+            logger.info(f"Parser for {site_name} completed with results: {results}")
+
+            if results["processed"]:
+                make_names = [
+                    make.get("title") if isinstance(make, dict) else make
+                    for make in makes
+                ]
+                await car_sink.finish(site_name, make_names, parser.crawl_pages)
+        finally:
+            await car_sink.close()
         return results
     except Exception as e:
-        logger.error(f"Error running parser for {site_name}: {e}")
-        return {"processed": 0, "saved": 0, "errors": 1}
+        logger.error(f"Error running parser for {site}: {e}")
+        raise
@@ -0,0 +1,207 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from app.conf import WRITER_BATCH_SIZE, WRITER_FLUSH_INTERVAL_MS, WRITER_QUEUE_SIZE
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.logger import setup_logger
+from app.scraper.utils.sinks import CarSink, MongoSink
+from app.scraper.utils.validation import validate_cars
+
+logger = setup_logger("app.scraper.utils.car_writer")
+
+# Parsed listing and the future resolved with its upsert status
+PendingCar = Tuple[Listing, asyncio.Future]
+
+
+def _fail(batch: List[PendingCar], error: BaseException):
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+class CarWriter:
+    """Background task that owns the car writes of a scrape run.
+
+    Parsers put listings on a bounded queue, which is flushed to the sink
+    (Mongo by default) when ``batch_size`` listings are waiting or
+    ``flush_interval_ms`` passed since the first of them, so storage
+    throughput does not depend on how many pages are fetched at once. Every
+    batch is validated in one pass and invalid listings are logged with their
+    reasons instead of failing the batch. A batch that cannot be written fails
+    its futures; if the task itself stops, every queued future fails and
+    ``put`` raises. The sink is opened and closed by the caller.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[CarSink] = None,
+        batch_size: int = WRITER_BATCH_SIZE,
+        flush_interval_ms: int = WRITER_FLUSH_INTERVAL_MS,
+        queue_size: int = WRITER_QUEUE_SIZE,
+    ):
+        self.sink = sink or MongoSink()
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.error: Optional[BaseException] = None
+        self.batches = 0
+        self.written = 0
+        self.invalid = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    async def __aenter__(self) -> "CarWriter":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def put(self, car: Listing) -> asyncio.Future:
+        """Queue a listing, waiting while the queue is full.
+
+        Returns a future resolved with ``created``, ``updated`` or
+        ``unchanged`` once the car's batch is written, or ``invalid`` if the
+        listing failed validation. Raises if the writer task has stopped.
+        """
+        self._check_running()
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((car, future))
+        # The task may have stopped while this put waited for space
+        self._check_running(future)
+        return future
+
+    def _check_running(self, future: Optional[asyncio.Future] = None):
+        if self.error is None:
+            return
+        self._fail_queued(self.error)
+        if future is not None:
+            # Raised below instead, the caller never sees this future
+            future.exception()
+        raise RuntimeError("Car writer stopped") from self.error
+
+    def _fail_queued(self, error: BaseException):
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not None:
+                _fail([item], error)
+
+    async def close(self):
+        """Write the queued cars, stop the task and log the flush stats.
+
+        Raises the error that stopped the task, if any.
+        """
+        if self.task is None:
+            return
+        if not self.task.done():
+            await self.queue.put(None)
+        try:
+            await asyncio.shield(self.task)
+        finally:
+            self.task = None
+
+        if self.batches:
+            logger.info(
+                f"Car writer flushed {self.written} cars in {self.batches} batches "
+                f"({self.invalid} invalid), "
+                f"avg batch {self.written / self.batches:.1f}, "
+                f"avg flush {self.flush_seconds / self.batches * 1000:.0f} ms, "
+                f"max flush {self.max_flush_seconds * 1000:.0f} ms"
+            )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch: List[PendingCar] = []
+        closing = False
+        try:
+            while not closing:
+                item = await self.queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+                await self._safe_flush(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Write what was already taken off the queue and still queued
+            while not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            await self._safe_flush(batch)
+            raise
+        except Exception as e:
+            logger.error(f"Car writer stopped: {e}")
+            self.error = e
+            _fail(batch, e)
+            self._fail_queued(e)
+            raise
+
+    async def _safe_flush(self, batch: List[PendingCar]):
+        """Flush a batch, failing its futures instead of stopping the task."""
+        try:
+            await self._flush(batch)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} cars: {e}")
+            _fail(batch, e)
+
+    async def _flush(self, batch: List[PendingCar]):
+        if not batch:
+            return
+        started = time.perf_counter()
+        cars, reasons = validate_cars([car for car, _ in batch])
+        for index, car_reasons in reasons.items():
+            car, future = batch[index]
+            logger.warning(
+                f"Skipping invalid car {car.source_url}: " f"{'; '.join(car_reasons)}"
+            )
+            if not future.done():
+                future.set_result("invalid")
+        self.invalid += len(reasons)
+
+        batch = [item for item, car in zip(batch, cars) if car is not None]
+        cars = [car for car in cars if car is not None]
+        if not cars:
+            return
+        try:
+            results = await self.sink.write(cars)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} cars: {e}")
+            _fail(batch, e)
+            return
+
+        elapsed = time.perf_counter() - started
+        self.batches += 1
+        self.written += len(batch)
+        self.flush_seconds += elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        for (_, future), listing_status in zip(batch, results):
+            counts[listing_status] += 1
+            if not future.done():
+                future.set_result(listing_status)
+        logger.info(
+            f"Flushed {len(batch)} cars to {self.sink.name} ({counts['created']} created, "
+            f"{counts['updated']} updated, {len(reasons)} invalid) "
+            f"in {elapsed * 1000:.0f} ms"
+        )
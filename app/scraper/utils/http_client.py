@@ -1,37 +1,29 @@
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import httpx
 from tenacity import (
+    AsyncRetrying,
     after_log,
     retry,
     retry_if_exception_type,
-    retry_if_result,
     stop_after_attempt,
     wait_fixed,
 )
 
-from app.conf import ua, PROXY
+from app.scraper.utils.identity_pool import identity_pool
 from app.scraper.utils.logger import setup_logger
 
 logger = setup_logger("app.scraper.utils.http_client")
 
-HEADERS = {
-    "User-Agent": ua.random,
-}
+
+RETRY_EXCEPTIONS = (httpx.RequestError, httpx.TimeoutException, httpx.HTTPStatusError)
 
 
 @retry(
     stop=stop_after_attempt(20),
     wait=wait_fixed(2),
-    retry=(
-        retry_if_exception_type(
-            (httpx.RequestError, httpx.TimeoutException, httpx.HTTPStatusError)
-        )
-        | retry_if_result(
-            lambda result: result is not None and result.status_code == 502
-        )
-    ),
+    retry=retry_if_exception_type(RETRY_EXCEPTIONS),
     after=after_log(logger, log_level=logging.WARNING),
     reraise=True,
 )
@@ -45,23 +37,67 @@ async def send_request(
     cookies: Optional[dict] = None,
     timeout: int = 30,
 ) -> Optional[httpx.Response]:
-    """Send an HTTP request with retry logic."""
-    proxy = f"http://{PROXY}" if PROXY else None
+    """Send an HTTP request with retry logic.
+
+    Every attempt is sent by the next free identity of the identity pool, with
+    its user agent and cookies; ``headers`` and ``cookies`` are added to them
+    for this request only. Error statuses, 502 included, are retried.
+    """
+    if method.upper() not in ("GET", "POST"):
+        raise httpx.HTTPError(f"Unsupported HTTP method: {method}")
+
+    identity = await identity_pool.acquire()
+    request = identity.client.build_request(
+        method.upper(),
+        url,
+        params=params,
+        data=data if method.upper() == "POST" else None,
+        json=json if method.upper() == "POST" else None,
+        headers=headers,
+        cookies=cookies,
+        timeout=timeout,
+    )
+    response = await identity.client.send(request)
+    if response.status_code == 429:
+        identity.cool_down(response)
+    response.raise_for_status()
+    return response
 
-    if headers is None:
-        headers = HEADERS.copy()
 
-    async with httpx.AsyncClient(
-        proxy=proxy, timeout=timeout, cookies=cookies, follow_redirects=True
-    ) as client:
-        if method.upper() == "GET":
-            response = await client.get(url, params=params, headers=headers)
-        elif method.upper() == "POST":
-            response = await client.post(
-                url, params=params, data=data, json=json, headers=headers
+async def stream_text(
+    url: str,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    timeout: int = 30,
+    chunk_size: int = 16384,
+) -> AsyncIterator[str]:
+    """Send a GET request and yield the decoded body in chunks.
+
+    Connecting is retried like ``send_request``; once the body is being read
+    errors are raised, since chunks may already have been consumed.
+    """
+    response = None
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(20),
+        wait=wait_fixed(2),
+        retry=retry_if_exception_type(RETRY_EXCEPTIONS),
+        after=after_log(logger, log_level=logging.WARNING),
+        reraise=True,
+    ):
+        with attempt:
+            identity = await identity_pool.acquire()
+            request = identity.client.build_request(
+                "GET", url, params=params, headers=headers, timeout=timeout
             )
-        else:
-            raise httpx.HTTPError(f"Unsupported HTTP method: {method}")
-        response.raise_for_status()
-        return response
-    return None
+            response = await identity.client.send(request, stream=True)
+            if response.is_error:
+                await response.aclose()
+                if response.status_code == 429:
+                    identity.cool_down(response)
+                response.raise_for_status()
+
+    try:
+        async for chunk in response.aiter_text(chunk_size):
+            yield chunk
+    finally:
+        await response.aclose()
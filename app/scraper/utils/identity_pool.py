@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from app.conf import (
+    IDENTITY_REQUESTS_PER_MINUTE,
+    PROXY,
+    SCRAPER_IDENTITIES,
+    get_user_agent,
+)
+
+# Cool-down of an identity that got a 429 without a usable Retry-After header
+DEFAULT_COOL_DOWN = 60.0
+
+
+class ClientIdentity:
+    """One simulated visitor: a user agent, its cookie jar and its connections.
+
+    The httpx client keeps the cookies a site sets and reuses connections, so
+    consecutive requests of an identity look like one browsing session.
+    """
+
+    def __init__(self, user_agent: str, requests_per_minute: int):
+        self.user_agent = user_agent
+        self.interval = 60 / requests_per_minute if requests_per_minute else 0.0
+        self.next_request_at = 0.0
+        self.requests = 0
+        proxy = f"http://{PROXY}" if PROXY else None
+        self.client = httpx.AsyncClient(
+            proxy=proxy,
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+        )
+
+    def reserve(self, now: float) -> float:
+        """Book the next request slot and return the seconds to wait for it."""
+        start = max(now, self.next_request_at)
+        self.next_request_at = start + self.interval
+        self.requests += 1
+        return start - now
+
+    def cool_down(self, response: httpx.Response):
+        """Hold back an identity the site has started to throttle."""
+        retry_after = response.headers.get("Retry-After", "")
+        delay = float(retry_after) if retry_after.isdigit() else DEFAULT_COOL_DOWN
+        self.next_request_at = max(self.next_request_at, time.monotonic() + delay)
+
+
+class IdentityPool:
+    """Spreads requests over several identities, each within its own rate.
+
+    Every request goes to the identity whose next slot is the earliest, so the
+    per-identity limits add up to the total throughput of the pool.
+    """
+
+    def __init__(
+        self,
+        size: int = SCRAPER_IDENTITIES,
+        requests_per_minute: int = IDENTITY_REQUESTS_PER_MINUTE,
+    ):
+        self.size = max(1, size)
+        self.requests_per_minute = requests_per_minute
+        self._identities: List[ClientIdentity] = []
+
+    @property
+    def identities(self) -> List[ClientIdentity]:
+        # Created on first use, inside the event loop the clients will run in
+        if not self._identities:
+            self._identities = [
+                ClientIdentity(user_agent, self.requests_per_minute)
+                for user_agent in self._user_agents()
+            ]
+        return self._identities
+
+    def _user_agents(self) -> List[str]:
+        # Distinct user agents where the data set has enough of them
+        user_agents = get_user_agent()
+        picked: List[str] = []
+        for _ in range(self.size * 10):
+            user_agent = user_agents.random
+            if user_agent not in picked:
+                picked.append(user_agent)
+            if len(picked) == self.size:
+                return picked
+        return [picked[i % len(picked)] for i in range(self.size)]
+
+    async def acquire(self) -> ClientIdentity:
+        """Return the identity to send the next request with, once it may."""
+        identity = min(
+            self.identities, key=lambda item: (item.next_request_at, item.requests)
+        )
+        delay = identity.reserve(time.monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return identity
+
+    async def aclose(self):
+        """Close the connections of all identities and forget their cookies."""
+        identities, self._identities = self._identities, []
+        for identity in identities:
+            await identity.client.aclose()
+
+
+identity_pool = IdentityPool()
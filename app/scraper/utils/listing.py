@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class Listing:
+    """A parsed car listing on its way from a site helper to the car writer.
+
+    Slotted, so the many listings queued during a crawl cost a fraction of the
+    equivalent dicts. It is validated into ``CarCreate`` by the writer, and
+    only becomes a dict when the sink stores it.
+    """
+
+    make: str
+    model: str
+    year: int
+    price: float
+    mileage: int
+    engine_type: str
+    engine_capacity: str
+    transmission: str
+    location: str
+    source_url: str
+    source_site: str
+    image_url: Optional[str] = None
+    source_page: int = 1
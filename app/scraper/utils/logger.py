@@ -66,7 +66,8 @@ def setup_logger(
     if logger.handlers:
         logger.handlers.clear()
 
-    file_handler = logging.FileHandler(log_file_path)
+    # The file is only opened once the first record is written
+    file_handler = logging.FileHandler(log_file_path, delay=True)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
 
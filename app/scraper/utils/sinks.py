@@ -0,0 +1,177 @@
+import asyncio
+import gzip
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, List, Optional
+
+import orjson
+
+from app.conf import JSONL_SINK_BUFFER_BYTES, STALE_LISTING_DAYS, WRITER_MAX_RETRIES
+from app.db.car_db import CarCRUD
+from app.db.indexes import create_indexes
+from app.schemas.cars import CarCreate
+from app.scraper.utils.logger import setup_logger
+
+logger = setup_logger("app.scraper.utils.sinks")
+
+
+class CarSink(ABC):
+    """Destination of the cars a scrape run produces.
+
+    ``write`` returns the status of every car: ``created``, ``updated`` or
+    ``unchanged``, which the run counts as saved or not.
+    """
+
+    name = "sink"
+
+    async def open(self) -> None:
+        """Prepare the sink before the first write."""
+
+    @abstractmethod
+    async def write(self, cars: List[CarCreate]) -> List[str]:
+        """Store a batch of cars."""
+
+    async def finish(self, site_name: str, makes: List[str], pages: List[int]) -> None:
+        """Called after a run that read the given results pages of the makes."""
+
+    async def close(self) -> None:
+        """Flush and release the sink."""
+
+
+class MongoSink(CarSink):
+    """Upserts cars into the cars collection, retrying transient errors."""
+
+    name = "mongo"
+
+    def __init__(self, max_retries: int = WRITER_MAX_RETRIES):
+        self.cars = CarCRUD()
+        self.max_retries = max(1, max_retries)
+
+    async def open(self) -> None:
+        await create_indexes()
+
+    async def write(self, cars: List[CarCreate]) -> List[str]:
+        results = await self.cars.upsert_listings(cars, self.max_retries)
+        return [listing_status for listing_status, _ in results]
+
+    async def finish(self, site_name: str, makes: List[str], pages: List[int]) -> None:
+        """Archive listings of the crawled makes and pages not seen lately."""
+        archived = await self.cars.archive_stale(
+            datetime.now() - timedelta(days=STALE_LISTING_DAYS),
+            source_site=site_name,
+            makes=makes,
+            pages=pages,
+        )
+        logger.info(f"Archived {archived} stale {site_name} listings")
+
+
+class JsonlSink(CarSink):
+    """Appends cars as JSON lines to a file, gzip-compressed for ``.gz`` paths.
+
+    Lines are buffered in memory and written by a worker thread once
+    ``buffer_bytes`` is reached, so the event loop never blocks on the disk.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str, buffer_bytes: int = JSONL_SINK_BUFFER_BYTES):
+        self.path = Path(path)
+        self.buffer_bytes = buffer_bytes
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.file: Optional[IO[bytes]] = None
+
+    async def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix == ".gz":
+            self.file = gzip.open(self.path, "ab")
+        else:
+            self.file = open(self.path, "ab")
+
+    async def write(self, cars: List[CarCreate]) -> List[str]:
+        if self.file is None:
+            await self.open()
+        scraped_at = datetime.now().isoformat()
+        for car in cars:
+            line = orjson.dumps(
+                {**car.model_dump(mode="json"), "scraped_at": scraped_at},
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            self.buffer.append(line)
+            self.buffered += len(line)
+        if self.buffered >= self.buffer_bytes:
+            await self._flush()
+        return ["created"] * len(cars)
+
+    async def _flush(self):
+        data, self.buffer, self.buffered = b"".join(self.buffer), [], 0
+        if data:
+            await asyncio.to_thread(self.file.write, data)
+
+    async def close(self) -> None:
+        if self.file is None:
+            return
+        await self._flush()
+        await asyncio.to_thread(self.file.close)
+        self.file = None
+
+
+class NullSink(CarSink):
+    """Discards cars, to measure fetch and parse throughput alone."""
+
+    name = "null"
+
+    async def write(self, cars: List[CarCreate]) -> List[str]:
+        return ["unchanged"] * len(cars)
+
+
+class FanOutSink(CarSink):
+    """Writes every batch to several sinks at once.
+
+    The statuses of the first sink are returned.
+    """
+
+    name = "fanout"
+
+    def __init__(self, sinks: List[CarSink]):
+        self.sinks = sinks
+
+    async def open(self) -> None:
+        await asyncio.gather(*(sink.open() for sink in self.sinks))
+
+    async def write(self, cars: List[CarCreate]) -> List[str]:
+        results = await asyncio.gather(*(sink.write(cars) for sink in self.sinks))
+        return results[0]
+
+    async def finish(self, site_name: str, makes: List[str], pages: List[int]) -> None:
+        for sink in self.sinks:
+            await sink.finish(site_name, makes, pages)
+
+    async def close(self) -> None:
+        for sink in self.sinks:
+            await sink.close()
+
+
+def create_sink(spec: str) -> CarSink:
+    """Build a sink from a comma-separated spec.
+
+    ``mongo``, ``null`` and ``jsonl:<path>`` are supported, e.g.
+    ``mongo,jsonl:data/cars.jsonl.gz``. Several entries fan out.
+    """
+    sinks: List[CarSink] = []
+    for entry in spec.split(","):
+        kind, _, argument = entry.strip().partition(":")
+        kind = kind.lower()
+        if kind == "mongo":
+            sinks.append(MongoSink())
+        elif kind == "null":
+            sinks.append(NullSink())
+        elif kind == "jsonl" and argument:
+            sinks.append(JsonlSink(argument))
+        elif kind:
+            raise ValueError(f"Unknown sink: {entry.strip()}")
+
+    if not sinks:
+        raise ValueError("No sink configured")
+    return sinks[0] if len(sinks) == 1 else FanOutSink(sinks)
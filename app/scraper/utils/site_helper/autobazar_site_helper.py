@@ -1,12 +1,15 @@
+from typing import Optional
+
+from app.scraper.utils.listing import Listing
 from app.scraper.utils.logger import setup_logger
 
 logger = setup_logger("app.scraper.utils.site_helper.autobazar_site_helper")
 
 
-def parse_announce(ticket_item, site_name=None, source_url=None) -> dict:
+def parse_announce(ticket_item, site_name=None, source_url=None) -> Optional[Listing]:
     if ticket_item is None:
         logger.error("Received None ticket_item")
-        return {}
+        return None
 
     try:
         make = None
@@ -83,35 +86,37 @@ def parse_announce(ticket_item, site_name=None, source_url=None) -> dict:
             if engine.get("title"):
                 engine_type = engine.get("title")
 
-        base_url = source_url or "https://auto.site.ua"
         permalink = ticket_item.get("permalink")
-        full_source_url = f"{base_url}{permalink}" if permalink else base_url
+        if not permalink:
+            # The URL identifies the listing, so there is nothing to store
+            logger.warning("Skipping announcement without a permalink")
+            return None
+        base_url = source_url or "https://auto.site.ua"
+        full_source_url = f"{base_url}{permalink}"
 
-        car_data = {
-            "make": make or "Unknown",
-            "model": model or "Unknown",
-            "year": (
+        return Listing(
+            make=make or "Unknown",
+            model=model or "Unknown",
+            year=(
                 int(year)
                 if year
                 and isinstance(year, (int, str))
                 and (isinstance(year, int) or str(year).isdigit())
                 else 2000
             ),
-            "price": float(price_uah) if price_uah is not None else 0.0,
-            "mileage": int(mileage) if mileage is not None else 0,
-            "engine_type": engine_type,
-            "engine_capacity": engine_capacity,
-            "transmission": transmission,
-            "location": location,
-            "image_url": image_url or full_source_url,
-            "source_url": full_source_url,
-            "source_site": site_name or "AutoBazar",
-        }
-
-        return car_data
+            price=float(price_uah) if price_uah is not None else 0.0,
+            mileage=int(mileage) if mileage is not None else 0,
+            engine_type=engine_type,
+            engine_capacity=engine_capacity,
+            transmission=transmission,
+            location=location,
+            image_url=image_url or full_source_url,
+            source_url=full_source_url,
+            source_site=site_name or "AutoBazar",
+        )
     except Exception as e:
         import traceback
 
         logger.error(f"Error parsing car announcement: {e}")
         logger.error(traceback.format_exc())
-        return {}
+        return None
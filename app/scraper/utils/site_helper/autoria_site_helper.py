@@ -1,7 +1,9 @@
 import re
+from typing import AsyncIterable, AsyncIterator, List, Optional
 
 import bs4
 
+from app.scraper.utils.listing import Listing
 from app.scraper.utils.logger import setup_logger
 
 logger = setup_logger("app.scraper.utils.site_helper.autoria_site_helper")
@@ -16,10 +18,200 @@ def extract_ticket_items(
     return ticket_items
 
 
-def parse_announce(ticket_item, site_name, source_url) -> dict:
+# Opening tag whose class list has the ticket-item token, like bs4's class_
+TICKET_START = re.compile(
+    r"<section\b[^>]*\sclass=([\"'])(?:[^\"']*\s)?ticket-item(?:\s[^\"']*)?\1"
+)
+SECTION_TAG = re.compile(r"<section\b|</section\s*>")
+
+
+class TicketItemStream:
+    """Incrementally extract ticket-item sections from HTML chunks.
+
+    Only the text after the last complete ticket is buffered, and every
+    ticket is parsed on its own, so the full page and its soup are never held
+    in memory.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.start = -1
+        self.position = 0
+        self.depth = 0
+
+    def feed(self, chunk: str) -> List[bs4.Tag]:
+        self.buffer += chunk
+        tickets = []
+        while True:
+            if self.start < 0:
+                match = TICKET_START.search(self.buffer)
+                if not match:
+                    # Keep a possibly incomplete tag for the next chunk
+                    tail = self.buffer.rfind("<")
+                    self.buffer = self.buffer[tail:] if tail >= 0 else ""
+                    return tickets
+                self.buffer = self.buffer[match.start() :]
+                self.start, self.position, self.depth = 0, 0, 0
+
+            for tag in SECTION_TAG.finditer(self.buffer, self.position):
+                self.depth += -1 if tag.group().startswith("</") else 1
+                self.position = tag.end()
+                if self.depth == 0:
+                    break
+            else:
+                # Rescan a possibly incomplete tag with the next chunk
+                self.position = max(self.position, len(self.buffer) - 16)
+                return tickets
+
+            ticket_html = self.buffer[: self.position]
+            self.buffer = self.buffer[self.position :]
+            self.start = -1
+            soup = bs4.BeautifulSoup(ticket_html, "html.parser")
+            tickets.append(soup.find("section"))
+
+
+async def iter_ticket_items(chunks: AsyncIterable[str]) -> AsyncIterator[bs4.Tag]:
+    """Yield ticket-item sections as soon as each one is complete."""
+    stream = TicketItemStream()
+    async for chunk in chunks:
+        for ticket_item in stream.feed(chunk):
+            yield ticket_item
+
+
+MILEAGE_NUMBER = re.compile(r"(\d+)")
+NO_MILEAGE = "без пробігу"
+# Class strings compared as a whole, like a multi-word bs4 ``class_`` filter
+CHARACTERISTICS_CLASS = "unstyle characteristic"
+MILEAGE_CLASS = "item-char js-race"
+LOCATION_CLASS = "item-char view-location js-location"
+
+
+def _inside(tag: bs4.Tag, ancestor: bs4.Tag) -> bool:
+    parent = tag.parent
+    while parent is not None:
+        if parent is ancestor:
+            return True
+        parent = parent.parent
+    return False
+
+
+class TicketPlan:
+    """Elements of one ticket needed by ``parse_announce``, found in one walk.
+
+    Each element is the first match in document order within its scope, the
+    same one the equivalent ``find`` call would return.
+    """
+
+    __slots__ = (
+        "data_div",
+        "price_div",
+        "price_span",
+        "photo_div",
+        "img",
+        "characteristics",
+        "mileage_li",
+        "location_li",
+        "location_icon",
+        "engine_lis",
+        "fuel_lis",
+        "transmission_icons",
+    )
+
+    def __init__(self, ticket_item: bs4.Tag):
+        self.data_div = self.price_div = self.price_span = None
+        self.photo_div = self.img = None
+        self.characteristics = self.mileage_li = None
+        self.location_li = self.location_icon = None
+        self.engine_lis: List[bs4.Tag] = []
+        # ids of engine lis holding a fuel icon, and each one's first
+        # transmission icon
+        self.fuel_lis = set()
+        self.transmission_icons = {}
+
+        for node in ticket_item.descendants:
+            if isinstance(node, bs4.Tag):
+                visit = VISITORS.get(node.name)
+                if visit:
+                    visit(self, node)
+
+    def visit_div(self, tag: bs4.Tag):
+        if self.data_div is None and "data-advertisement-data" in tag.attrs:
+            self.data_div = tag
+        classes = tag.get("class") or ()
+        if self.price_div is None and "price-ticket" in classes:
+            self.price_div = tag
+        if self.photo_div is None and "ticket-photo" in classes:
+            self.photo_div = tag
+
+    def visit_span(self, tag: bs4.Tag):
+        if (
+            self.price_span is None
+            and self.price_div is not None
+            and tag.get("data-currency") == "UAH"
+            and _inside(tag, self.price_div)
+        ):
+            self.price_span = tag
+
+    def visit_img(self, tag: bs4.Tag):
+        if self.img is None and self.photo_div is not None:
+            if _inside(tag, self.photo_div):
+                self.img = tag
+
+    def visit_ul(self, tag: bs4.Tag):
+        if self.characteristics is None:
+            if " ".join(tag.get("class") or ()) == CHARACTERISTICS_CLASS:
+                self.characteristics = tag
+
+    def visit_li(self, tag: bs4.Tag):
+        if self.characteristics is None:
+            return
+        classes = tag.get("class") or ()
+        if "item-char" not in classes or not _inside(tag, self.characteristics):
+            return
+        self.engine_lis.append(tag)
+        class_string = " ".join(classes)
+        if self.mileage_li is None and class_string == MILEAGE_CLASS:
+            self.mileage_li = tag
+        if self.location_li is None and class_string == LOCATION_CLASS:
+            self.location_li = tag
+
+    def visit_i(self, tag: bs4.Tag):
+        if not self.engine_lis:
+            return
+        classes = tag.get("class") or ()
+        if "icon-location" in classes and self.location_icon is None:
+            if self.location_li is not None and _inside(tag, self.location_li):
+                self.location_icon = tag
+        fuel = "icon-fuel" in classes
+        transmission = "icon-transmission" in classes
+        if not (fuel or transmission):
+            return
+        # An icon counts for every engine li around it, as li.find() would
+        parent = tag.parent
+        while parent is not None and parent is not self.characteristics:
+            if parent.name == "li" and "item-char" in (parent.get("class") or ()):
+                if fuel:
+                    self.fuel_lis.add(id(parent))
+                if transmission:
+                    self.transmission_icons.setdefault(id(parent), tag)
+            parent = parent.parent
+
+
+VISITORS = {
+    "div": TicketPlan.visit_div,
+    "span": TicketPlan.visit_span,
+    "img": TicketPlan.visit_img,
+    "ul": TicketPlan.visit_ul,
+    "li": TicketPlan.visit_li,
+    "i": TicketPlan.visit_i,
+}
+
+
+def parse_announce(ticket_item, site_name, source_url) -> Optional[Listing]:
     """Parse a car announcement from HTML ticket item."""
     try:
-        data_div = ticket_item.find("div", attrs={"data-advertisement-data": True})
+        plan = TicketPlan(ticket_item)
+        data_div = plan.data_div
 
         make = data_div.get("data-mark-name") if data_div else None
         model = data_div.get("data-model-name") if data_div else None
@@ -32,14 +224,15 @@ def parse_announce(ticket_item, site_name, source_url) -> dict:
         )
         if full_source_url and not full_source_url.startswith(("http://", "https://")):
             full_source_url = f"https://auto.ria.com{link_to_view}"
+        if not full_source_url:
+            # The URL identifies the listing, so there is nothing to store
+            logger.warning("Skipping ticket without a listing link")
+            return None
 
-        price_div = ticket_item.find("div", class_="price-ticket")
         price_uah = None
-        if price_div:
-            price_span = price_div.find("span", attrs={"data-currency": "UAH"})
-            if price_span:
-                price_text = price_span.text.strip().replace(" ", "")
-                price_uah = float(price_text) if price_text.isdigit() else None
+        if plan.price_span:
+            price_text = plan.price_span.text.strip().replace(" ", "")
+            price_uah = float(price_text) if price_text.isdigit() else None
 
         mileage = 0
         location = "Unknown"
@@ -47,64 +240,52 @@ def parse_announce(ticket_item, site_name, source_url) -> dict:
         engine_capacity = "Unknown"
         transmission = "Unknown"
 
-        characteristics = ticket_item.find("ul", class_="unstyle characteristic")
-        if characteristics:
-            mileage_li = characteristics.find("li", class_="item-char js-race")
-            if mileage_li and "без пробігу" not in mileage_li.text:
-                mileage_text = re.search(r"(\d+)", mileage_li.text)
+        if plan.characteristics:
+            mileage_li = plan.mileage_li
+            if mileage_li and NO_MILEAGE not in mileage_li.text:
+                mileage_text = MILEAGE_NUMBER.search(mileage_li.text)
                 if mileage_text:
                     mileage = int(mileage_text.group(1).replace(" ", ""))
 
-            location_li = characteristics.find(
-                "li", class_="item-char view-location js-location"
-            )
-            if location_li:
-                icon = location_li.find("i", class_="icon-location")
-                if icon and icon.next_sibling:
-                    location = icon.next_sibling.strip()
-                    # Ensure we don't include the span text
-                    if "(" in location:
-                        location = location.split("(")[0].strip()
-
-            engine_li = characteristics.find_all("li", class_="item-char")
-            for li in engine_li:
-                if li.find("i", class_="icon-fuel"):
+            icon = plan.location_icon
+            if icon and icon.next_sibling:
+                location = icon.next_sibling.strip()
+                # Ensure we don't include the span text
+                if "(" in location:
+                    location = location.split("(")[0].strip()
+
+            for li in plan.engine_lis:
+                if id(li) in plan.fuel_lis:
                     engine_info = li.text.strip().split(",")
                     if len(engine_info) > 0:
                         engine_type = engine_info[0].strip() or engine_type
                     if len(engine_info) > 1:
                         engine_capacity = engine_info[1].strip() or engine_capacity
 
-                if li.find("i", class_="icon-transmission"):
-                    icon = li.find("i", class_="icon-transmission")
-                    if icon and icon.next_sibling:
-                        transmission = icon.next_sibling.strip() or transmission
+                icon = plan.transmission_icons.get(id(li))
+                if icon and icon.next_sibling:
+                    transmission = icon.next_sibling.strip() or transmission
 
         image_url = None
-        photo_div = ticket_item.find("div", class_="ticket-photo")
-        if photo_div:
-            img_tag = photo_div.find("img")
-            if img_tag:
-                image_url = img_tag.get("src")
-                if image_url and not image_url.startswith(("http://", "https://")):
-                    image_url = f"https:{image_url}"
-
-        car_data = {
-            "make": make or "Unknown",
-            "model": model or "Unknown",
-            "year": int(year) if year and year.isdigit() else 2000,
-            "price": price_uah or 0.0,
-            "mileage": mileage,
-            "engine_type": engine_type,
-            "engine_capacity": engine_capacity,
-            "transmission": transmission,
-            "location": location,
-            "image_url": image_url,
-            "source_url": full_source_url or "https://auto.ria.com",
-            "source_site": site_name or "Auto.ria",
-        }
-
-        return car_data
+        if plan.img:
+            image_url = plan.img.get("src")
+            if image_url and not image_url.startswith(("http://", "https://")):
+                image_url = f"https:{image_url}"
+
+        return Listing(
+            make=make or "Unknown",
+            model=model or "Unknown",
+            year=int(year) if year and year.isdigit() else 2000,
+            price=price_uah or 0.0,
+            mileage=mileage,
+            engine_type=engine_type,
+            engine_capacity=engine_capacity,
+            transmission=transmission,
+            location=location,
+            image_url=image_url,
+            source_url=full_source_url,
+            source_site=site_name or "Auto.ria",
+        )
     except Exception as e:
         logger.error(f"Error parsing car announcement: {e}")
-        return {}
+        return None
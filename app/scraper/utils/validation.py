@@ -0,0 +1,37 @@
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.cars import CarCreate
+from app.scraper.utils.listing import Listing
+
+# Validates a whole batch of listings in one call into pydantic-core
+CAR_LIST_ADAPTER = TypeAdapter(List[CarCreate])
+
+
+def validate_cars(
+    listings: List[Listing],
+) -> Tuple[List[Optional[CarCreate]], Dict[int, List[str]]]:
+    """Validate a batch of listings at once.
+
+    Returns the cars in listing order, with None for invalid listings, and
+    the reasons each invalid listing was rejected, by index.
+    """
+    try:
+        return CAR_LIST_ADAPTER.validate_python(listings, from_attributes=True), {}
+    except ValidationError:
+        pass
+
+    # Validate the batch row by row once, keeping the cars that pass
+    cars: List[Optional[CarCreate]] = [None] * len(listings)
+    reasons: Dict[int, List[str]] = {}
+    for index, listing in enumerate(listings):
+        try:
+            cars[index] = CarCreate.model_validate(listing, from_attributes=True)
+        except ValidationError as e:
+            reasons[index] = [
+                f"{'.'.join(str(part) for part in error['loc']) or 'listing'}: "
+                f"{error['msg']}"
+                for error in e.errors(include_url=False, include_input=False)
+            ]
+    return cars, reasons
@@ -1,11 +1,10 @@
 from datetime import datetime, timezone
-from typing import Any, Coroutine
+from typing import Any, Coroutine, Optional
 
 from fastapi import Depends
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from jose import JWTError
-from passlib.context import CryptContext
 
 from app.db.users_db import UserCRUD
 from app.exceptions.token_exceptions import (
@@ -14,21 +13,18 @@ from app.exceptions.token_exceptions import (
 )
 from app.exceptions.user_exceptions import UserNotFoundException
 from app.models import User
+from app.utils.auth_cache import (
+    cache_token,
+    cache_user,
+    get_cached_token,
+    get_cached_user,
+)
+from app.utils.passwords import verify_password
 from app.utils.token import get_payload, blacklist_token, is_token_blacklisted
 
 ACCESS_TOKEN_TYPE = "access"  # nosec
 REFRESH_TOKEN_TYPE = "refresh"  # nosec
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
 
 async def logout_user(
     token_str: str,
@@ -46,7 +42,9 @@ async def logout_user(
 
         await get_user(email)
         success = await blacklist_token(
-            token.credentials, datetime.fromtimestamp(exp, tz=timezone.utc)
+            token.credentials,
+            datetime.fromtimestamp(exp, tz=timezone.utc),
+            payload.get("jti"),
         )
 
         if success:
@@ -69,9 +67,12 @@ async def get_current_user(
     except JWTError:
         raise InvalidTokenException()
 
-    user = await get_user(email)
+    user = get_cached_user(email)
     if user is None:
-        raise UserNotFoundException()
+        user = await get_user(email)
+        if user is None:
+            raise UserNotFoundException()
+        cache_user(email, user)
 
     return user
 
@@ -97,15 +98,21 @@ async def verify_refresh_token(
 
 
 async def check_token_credential(token: HTTPAuthorizationCredentials):
-    if await is_token_blacklisted(token.credentials):
-        raise TokenBlacklistedException()
+    cached = get_cached_token(token.credentials)
+    if cached is None:
+        payload = get_payload(token)
+        email: str = payload.get("sub")
+        token_type: str = payload.get("token_type")
 
-    payload = get_payload(token)
-    email: str = payload.get("sub")
-    token_type: str = payload.get("token_type")
+        if email is None:
+            raise InvalidTokenException()
 
-    if email is None:
-        raise InvalidTokenException()
+        cached = (email, token_type, payload.get("jti"))
+        cache_token(token.credentials, *cached, payload.get("exp"))
+
+    email, token_type, jti = cached
+    if await is_token_blacklisted(token.credentials, jti):
+        raise TokenBlacklistedException()
 
     return email, token_type
 
@@ -118,5 +125,5 @@ async def get_user(email: str) -> User:
     raise UserNotFoundException()
 
 
-async def update_last_login(user: User):
-    await UserCRUD().update_user_last_login(user)
+async def update_last_login(user: User, password_hash: Optional[str] = None):
+    await UserCRUD().update_user_last_login(user, password_hash)
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.conf import AUTH_CACHE_SIZE, AUTH_CACHE_TTL, get_redis
+from app.utils.revocation import revocation_filter
+
+logger = logging.getLogger(__name__)
+
+AUTH_CACHE_CHANNEL = "auth:invalidate"
+
+# token hash -> (email, token_type, jti, exp)
+token_cache: TTLCache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+# email -> user document
+user_cache: TTLCache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+def token_key(token: str) -> str:
+    """Return the cache key of a raw JWT."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_token(token: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """Return cached (email, token_type, jti) of a token that has not expired."""
+    cached = token_cache.get(token_key(token))
+    if cached is None:
+        return None
+
+    email, token_type, jti, exp = cached
+    if exp is not None and exp <= time.time():
+        token_cache.pop(token_key(token), None)
+        return None
+    return email, token_type, jti
+
+
+def cache_token(
+    token: str,
+    email: str,
+    token_type: str,
+    jti: Optional[str],
+    exp: Optional[float],
+):
+    token_cache[token_key(token)] = (email, token_type, jti, exp)
+
+
+def get_cached_user(email: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of the cached user document."""
+    user = user_cache.get(email)
+    return dict(user) if user is not None else None
+
+
+def cache_user(email: str, user: Dict[str, Any]):
+    user_cache[email] = dict(user)
+
+
+def invalidate_local(kind: str, key: str, exp: Optional[float] = None):
+    """Apply a user invalidation or token revocation to this worker."""
+    if kind == "user":
+        user_cache.pop(key, None)
+    elif kind == "revoke":
+        revocation_filter.add(key, exp)
+
+
+async def publish_invalidation(kind: str, key: str, exp: Optional[float] = None):
+    """Apply a user invalidation or token revocation to every worker."""
+    invalidate_local(kind, key, exp)
+    async with get_redis() as redis:
+        await redis.publish(
+            AUTH_CACHE_CHANNEL, json.dumps({"type": kind, "key": key, "exp": exp})
+        )
+
+
+async def invalidate_user(email: str):
+    await publish_invalidation("user", email)
+
+
+def clear_auth_cache():
+    token_cache.clear()
+    user_cache.clear()
+
+
+async def listen_for_invalidations(retry_delay: float = 1.0):
+    """Apply invalidations published by other workers until cancelled.
+
+    The caches are cleared and the revocation filter is reseeded from Redis
+    whenever the subscription is (re)established, since messages published
+    while disconnected are lost.
+    """
+    while True:
+        try:
+            async with get_redis() as redis:
+                pubsub = redis.pubsub()
+                try:
+                    await pubsub.subscribe(AUTH_CACHE_CHANNEL)
+                    clear_auth_cache()
+                    await revocation_filter.seed(redis)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        data = json.loads(message["data"])
+                        invalidate_local(data["type"], data["key"], data.get("exp"))
+                finally:
+                    revocation_filter.synced = False
+                    await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation listener failed: {e}")
+            revocation_filter.synced = False
+            clear_auth_cache()
+            await asyncio.sleep(retry_delay)
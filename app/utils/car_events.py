@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from app.conf import (
+    CAR_EVENTS_MAXLEN,
+    CAR_EVENTS_STREAM,
+    CAR_STREAM_HEARTBEAT,
+    CAR_STREAM_QUEUE_SIZE,
+    get_redis,
+)
+from app.db.utils import convert_object_id_to_str
+
+logger = logging.getLogger(__name__)
+
+# (stream entry id, event type, car, encoded car)
+CarEvent = Tuple[str, str, Dict[str, Any], str]
+
+
+def event_id_key(event_id: str) -> Tuple[int, int]:
+    """Return a sortable key of a Redis stream entry ID."""
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+async def publish_car_events(event: str, cars: List[Dict[str, Any]]) -> None:
+    """Append created or updated cars to the car event stream.
+
+    Failures are only logged, so a Redis outage never fails a car write.
+    """
+    if not cars:
+        return
+    try:
+        async with get_redis() as redis:
+            async with redis.pipeline(transaction=False) as pipe:
+                for car in cars:
+                    data = orjson.dumps(convert_object_id_to_str(dict(car)))
+                    pipe.xadd(
+                        CAR_EVENTS_STREAM,
+                        {"event": event, "car": data},
+                        maxlen=CAR_EVENTS_MAXLEN,
+                        approximate=True,
+                    )
+                await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to publish car events: {e}")
+
+
+def _parse_entry(event_id: str, fields: Dict[str, str]) -> CarEvent:
+    return event_id, fields["event"], orjson.loads(fields["car"]), fields["car"]
+
+
+async def read_car_events(after_id: str, count: int = 500) -> AsyncIterator[CarEvent]:
+    """Yield the events still kept in the stream after the given entry ID."""
+    async with get_redis() as redis:
+        while True:
+            entries = await redis.xrange(
+                CAR_EVENTS_STREAM, min=f"({after_id}", max="+", count=count
+            )
+            for event_id, fields in entries:
+                yield _parse_entry(event_id, fields)
+            if len(entries) < count:
+                return
+            after_id = entries[-1][0]
+
+
+class CarEventSubscriber:
+    """Bounded queue of live events for one client.
+
+    A client that falls behind by more than the queue size is dropped rather
+    than buffering without limit; it can reconnect with its last event ID.
+    """
+
+    def __init__(self, maxsize: int = CAR_STREAM_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, event: CarEvent):
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+
+
+class CarEventBroadcaster:
+    """Reads the car event stream once per worker and fans it out to clients."""
+
+    def __init__(self):
+        self._subscribers: Set[CarEventSubscriber] = set()
+
+    def subscribe(self) -> CarEventSubscriber:
+        subscriber = CarEventSubscriber()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: CarEventSubscriber):
+        self._subscribers.discard(subscriber)
+
+    def dispatch(self, event: CarEvent):
+        for subscriber in list(self._subscribers):
+            subscriber.offer(event)
+
+    async def run(self, block_ms: int = 5000, retry_delay: float = 1.0):
+        """Dispatch new stream entries to subscribers until cancelled."""
+        last_id: Optional[str] = None
+        while True:
+            try:
+                async with get_redis() as redis:
+                    if last_id is None:
+                        latest = await redis.xrevrange(CAR_EVENTS_STREAM, count=1)
+                        last_id = latest[0][0] if latest else "0-0"
+                    while True:
+                        response = await redis.xread(
+                            {CAR_EVENTS_STREAM: last_id}, count=100, block=block_ms
+                        )
+                        for _, entries in response or []:
+                            for event_id, fields in entries:
+                                last_id = event_id
+                                self.dispatch(_parse_entry(event_id, fields))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Car event reader failed: {e}")
+                await asyncio.sleep(retry_delay)
+
+
+car_event_broadcaster = CarEventBroadcaster()
+
+
+def car_matches(
+    car: Dict[str, Any],
+    make: Optional[str] = None,
+    year: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+) -> bool:
+    """Check a car against the stream filters."""
+    if make and str(car.get("make") or "").lower() != make.lower():
+        return False
+    if year is not None and car.get("year") != year:
+        return False
+    price = car.get("price")
+    if min_price is not None and (price is None or price < min_price):
+        return False
+    if max_price is not None and (price is None or price > max_price):
+        return False
+    return True
+
+
+def format_sse(event: CarEvent) -> str:
+    event_id, event_type, _, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+async def stream_car_events(
+    last_event_id: Optional[str] = None,
+    heartbeat: float = CAR_STREAM_HEARTBEAT,
+    **filters: Any,
+) -> AsyncIterator[str]:
+    """Yield missed events after ``last_event_id``, then live events, as SSE.
+
+    The client is subscribed when the response body is first iterated and
+    before the replay starts, so live events that were already replayed are
+    skipped by comparing entry IDs. A client that disconnects before then is
+    never subscribed.
+    """
+    subscriber = car_event_broadcaster.subscribe()
+    try:
+        replayed_key: Optional[Tuple[int, int]] = None
+        if last_event_id:
+            async for event in read_car_events(last_event_id):
+                replayed_key = event_id_key(event[0])
+                if car_matches(event[2], **filters):
+                    yield format_sse(event)
+
+        while not (subscriber.dropped and subscriber.queue.empty()):
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if replayed_key and event_id_key(event[0]) <= replayed_key:
+                continue
+            if car_matches(event[2], **filters):
+                yield format_sse(event)
+    finally:
+        car_event_broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+
+EXPORT_FIELDS = [
+    "id",
+    "make",
+    "model",
+    "year",
+    "price",
+    "mileage",
+    "engine_type",
+    "engine_capacity",
+    "transmission",
+    "location",
+    "image_url",
+    "source_url",
+    "source_site",
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a Mongo value to a plain export value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _export_row(car: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an export row from a raw car document."""
+    row = {"id": str(car["_id"])}
+    for field in EXPORT_FIELDS[1:]:
+        row[field] = _export_value(car.get(field))
+    return row
+
+
+def encode_ndjson(batch: List[Dict[str, Any]]) -> str:
+    """Encode a batch of raw car documents as NDJSON lines."""
+    return "".join(
+        json.dumps(_export_row(car), ensure_ascii=False) + "\n" for car in batch
+    )
+
+
+def encode_csv(batch: List[Dict[str, Any]], header: bool = False) -> str:
+    """Encode a batch of raw car documents as CSV rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(_export_row(car) for car in batch)
+    return buffer.getvalue()
+
+
+async def stream_export(
+    batches: AsyncIterator[List[Dict[str, Any]]], export_format: str
+) -> AsyncIterator[str]:
+    """Encode batches of raw car documents into export chunks."""
+    if export_format == "csv":
+        yield encode_csv([], header=True)
+        async for batch in batches:
+            yield encode_csv(batch)
+    else:
+        async for batch in batches:
+            yield encode_ndjson(batch)
@@ -0,0 +1,55 @@
+import asyncio
+import re
+import sys
+from typing import List, Tuple
+
+# "import time: <self us> | <cumulative us> | <indented module name>"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_import_time(
+    output: str, module: str
+) -> Tuple[float, List[Tuple[str, float]]]:
+    """Return the import time of a module and of its direct imports, in ms."""
+    total = 0.0
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        if depth == 0 and match.group(4) == module:
+            total = cumulative_ms
+        elif depth == 1:
+            imports.append((match.group(4), cumulative_ms))
+    imports.sort(key=lambda item: item[1], reverse=True)
+    return total, imports
+
+
+async def measure_import_time(
+    module: str, runs: int = 3
+) -> Tuple[float, List[Tuple[str, float]]]:
+    """Import a module in fresh interpreters and return its fastest run.
+
+    Each run uses ``python -X importtime``, so bytecode caches are warm after
+    the first one and the result reflects a worker's cold start.
+    """
+    best: Tuple[float, List[Tuple[str, float]]] = (float("inf"), [])
+    for _ in range(runs):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {module}",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{stderr.decode()}")
+        result = parse_import_time(stderr.decode(), module)
+        if result[0] < best[0]:
+            best = result
+    return best
@@ -0,0 +1,50 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.conf import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+
+# Hashes with a different cost factor are flagged for rehashing on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+_queue_depth = 0
+
+
+def password_queue_depth() -> int:
+    """Number of hashing jobs waiting for or running on the worker pool."""
+    return _queue_depth
+
+
+async def _run_in_pool(func: Callable[..., Any], *args: Any) -> Any:
+    global _queue_depth
+    _queue_depth += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+    finally:
+        _queue_depth -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_pool(pwd_context.hash, password)
+
+
+async def verify_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a new hash if the stored one is outdated."""
+    return await _run_in_pool(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
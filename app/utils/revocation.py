@@ -0,0 +1,55 @@
+import time
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+
+BLACKLIST_PREFIX = "blacklist:"
+
+
+class RevocationFilter:
+    """Local copy of the revoked token keys stored in Redis.
+
+    Entries carry the token expiry and drop out on their own once it passes.
+    The filter is only trusted while ``synced`` is set, i.e. after it has been
+    seeded from Redis and while the invalidation listener is subscribed.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self.synced = False
+
+    def add(self, key: str, exp: Optional[float]):
+        self.purge()
+        self._revoked[key] = exp if exp is not None else float("inf")
+
+    def contains(self, key: str) -> bool:
+        exp = self._revoked.get(key)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            self._revoked.pop(key, None)
+            return False
+        return True
+
+    def purge(self):
+        now = time.time()
+        self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+
+    async def seed(self, redis: Redis):
+        """Load all revoked keys and their expiry from Redis."""
+        keys = [key async for key in redis.scan_iter(match=f"{BLACKLIST_PREFIX}*")]
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pttl(key)
+            ttls = await pipe.execute()
+
+        now = time.time()
+        self._revoked = {
+            key[len(BLACKLIST_PREFIX) :]: now + ttl / 1000
+            for key, ttl in zip(keys, ttls)
+            if ttl > 0
+        }
+        self.synced = True
+
+
+revocation_filter = RevocationFilter()
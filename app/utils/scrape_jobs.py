@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import sys
+from typing import Dict, Set
+
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.exceptions.scrape_exceptions import ScrapeJobStartException
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeJobManager:
+    """Runs scrape jobs in worker subprocesses of this API worker.
+
+    Parsing is CPU bound, so jobs never share the API's event loop. Progress
+    and status are kept in Mongo by the subprocess itself.
+    """
+
+    def __init__(self):
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._watchers: Set[asyncio.Task] = set()
+
+    async def start(self, job_id: str):
+        """Start the subprocess of a queued job, failing the job if it cannot."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "app.scraper.job", job_id
+            )
+        except Exception as e:
+            logger.error(f"Cannot start scrape job {job_id}: {e}")
+            await ScrapeJobCRUD().finish(
+                job_id, "failed", f"Worker could not be started: {e}"
+            )
+            raise ScrapeJobStartException() from e
+        self.processes[job_id] = process
+        watcher = asyncio.create_task(self._watch(job_id, process))
+        self._watchers.add(watcher)
+        watcher.add_done_callback(self._watchers.discard)
+
+    async def _watch(self, job_id: str, process: asyncio.subprocess.Process):
+        return_code = await process.wait()
+        self.processes.pop(job_id, None)
+        if return_code == 0:
+            return
+
+        jobs = ScrapeJobCRUD()
+        job = await jobs.get_job(job_id)
+        if job["cancel_requested"]:
+            await jobs.finish(job_id, "cancelled")
+        else:
+            logger.warning(f"Scrape job {job_id} exited with code {return_code}")
+            await jobs.finish(job_id, "failed", f"Worker exited with {return_code}")
+
+    def cancel(self, job_id: str):
+        """Stop the subprocess of a job started by this worker, if any."""
+        process = self.processes.get(job_id)
+        if process and process.returncode is None:
+            process.terminate()
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Cancel all running jobs and wait for their subprocesses."""
+        for job_id in list(self.processes):
+            self.cancel(job_id)
+        if self._watchers:
+            await asyncio.wait(self._watchers, timeout=timeout)
+
+
+scrape_job_manager = ScrapeJobManager()
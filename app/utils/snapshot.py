@@ -0,0 +1,141 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.conf import SNAPSHOT_BATCH_SIZE
+from app.db.car_db import CarCRUD
+
+STATE_FILE = "_snapshot_state.json"
+
+_category = pa.dictionary(pa.int32(), pa.string())
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("make", _category),
+        ("model", _category),
+        ("price", pa.float64()),
+        ("mileage", pa.int64()),
+        ("engine_type", _category),
+        ("engine_capacity", _category),
+        ("transmission", _category),
+        ("location", _category),
+        ("image_url", pa.string()),
+        ("source_url", pa.string()),
+        ("created_at", pa.timestamp("ms")),
+        ("updated_at", pa.timestamp("ms")),
+    ]
+)
+
+PartitionKey = Tuple[str, Any]
+
+
+def _read_state(output_dir: Path) -> Dict[str, Any]:
+    state_path = output_dir / STATE_FILE
+    if not state_path.exists():
+        return {}
+    return json.loads(state_path.read_text())
+
+
+def _write_state(output_dir: Path, state: Dict[str, Any]) -> None:
+    (output_dir / STATE_FILE).write_text(json.dumps(state, indent=2))
+
+
+def _clear_snapshot(output_dir: Path) -> None:
+    """Remove the files of a previous snapshot, leaving anything else alone."""
+    for part in output_dir.glob("source_site=*/year=*/part-*.parquet"):
+        part.unlink()
+    for partition_dir in output_dir.glob("source_site=*/year=*"):
+        if partition_dir.is_dir() and not any(partition_dir.iterdir()):
+            partition_dir.rmdir()
+    for site_dir in output_dir.glob("source_site=*"):
+        if site_dir.is_dir() and not any(site_dir.iterdir()):
+            site_dir.rmdir()
+    (output_dir / STATE_FILE).unlink(missing_ok=True)
+
+
+def _group_batch(batch: List[Dict[str, Any]]) -> Dict[PartitionKey, pa.Table]:
+    """Split a batch of raw car documents into one table per partition."""
+    groups: Dict[PartitionKey, Dict[str, list]] = defaultdict(
+        lambda: {name: [] for name in SNAPSHOT_SCHEMA.names}
+    )
+    for car in batch:
+        columns = groups[(car.get("source_site") or "Unknown", car.get("year"))]
+        columns["id"].append(str(car["_id"]))
+        for name in SNAPSHOT_SCHEMA.names[1:]:
+            columns[name].append(car.get(name))
+
+    return {
+        key: pa.Table.from_pydict(columns, schema=SNAPSHOT_SCHEMA)
+        for key, columns in groups.items()
+    }
+
+
+def _partition_path(output_dir: Path, key: PartitionKey, run_id: str) -> Path:
+    source_site, year = key
+    partition_dir = (
+        output_dir / f"source_site={quote(str(source_site), safe='')}" / f"year={year}"
+    )
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    return partition_dir / f"part-{run_id}.parquet"
+
+
+async def write_snapshot(
+    output_dir: str, incremental: bool = True, batch_size: int = SNAPSHOT_BATCH_SIZE
+) -> Dict[str, Any]:
+    """Write the cars collection to Parquet files partitioned by site and year.
+
+    Every batch read from the cursor becomes one row group in each partition it
+    touches. Incremental runs only append cars updated after the previous run.
+    """
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    if not incremental:
+        _clear_snapshot(root)
+
+    state = _read_state(root) if incremental else {}
+    last_updated_at: Optional[datetime] = None
+    if state.get("last_updated_at"):
+        last_updated_at = datetime.fromisoformat(state["last_updated_at"])
+
+    car_crud = CarCRUD()
+    query: Dict[str, Any] = {}
+    if last_updated_at is not None:
+        query["updated_at"] = {"$gt": last_updated_at}
+
+    run_id = uuid4().hex
+    writers: Dict[PartitionKey, pq.ParquetWriter] = {}
+    rows = 0
+    try:
+        async for batch in car_crud.iter_cars(query, batch_size=batch_size):
+            for key, table in _group_batch(batch).items():
+                writer = writers.get(key)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        _partition_path(root, key, run_id), SNAPSHOT_SCHEMA
+                    )
+                    writers[key] = writer
+                await asyncio.to_thread(writer.write_table, table)
+
+            rows += len(batch)
+            last_updated_at = batch[-1].get("updated_at") or last_updated_at
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    summary = {
+        "run_id": run_id,
+        "rows": rows,
+        "files": len(writers),
+        "last_updated_at": last_updated_at.isoformat() if last_updated_at else None,
+    }
+    _write_state(root, {**state, **summary})
+    return summary
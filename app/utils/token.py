@@ -1,10 +1,14 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import uuid4
 
 from fastapi.security import HTTPAuthorizationCredentials
 from jose import jwt
 
 from app.conf import JWT_SECRET_KEY, JWT_ALGORITHM, get_redis
+from app.utils.auth_cache import publish_invalidation
+from app.utils.revocation import BLACKLIST_PREFIX, revocation_filter
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
@@ -14,7 +18,7 @@ def create_token(
     data: dict, token_type: str, expires_delta: Optional[timedelta]
 ) -> str:
     to_encode = data.copy()
-    to_encode.update({"token_type": token_type})
+    to_encode.update({"token_type": token_type, "jti": uuid4().hex})
     expire = datetime.now(timezone.utc) + expires_delta  # type: ignore
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -28,19 +32,30 @@ def create_refresh_token(data: dict):
     return create_token(data, "refresh", timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
 
 
-async def blacklist_token(token: str, expire_time: datetime):
+def revocation_key(token: str, jti: Optional[str] = None) -> str:
+    """Key a token by its jti, or by its hash for tokens issued without one."""
+    return jti or hashlib.sha256(token.encode()).hexdigest()
+
+
+async def blacklist_token(token: str, expire_time: datetime, jti: Optional[str] = None):
+    key = revocation_key(token, jti)
     async with get_redis() as redis:
         ttl = int((expire_time - datetime.now(timezone.utc)).total_seconds())
         if ttl > 0:
-            await redis.setex(f"blacklist:{token}", ttl, "blacklisted")
+            await redis.setex(f"{BLACKLIST_PREFIX}{key}", ttl, "blacklisted")
+            await publish_invalidation("revoke", key, expire_time.timestamp())
             return True
 
         return False
 
 
-async def is_token_blacklisted(token: str):
+async def is_token_blacklisted(token: str, jti: Optional[str] = None) -> bool:
+    key = revocation_key(token, jti)
+    if revocation_filter.synced:
+        return revocation_filter.contains(key)
+
     async with get_redis() as redis:
-        return await redis.exists(f"blacklist:{token}")
+        return bool(await redis.exists(f"{BLACKLIST_PREFIX}{key}"))
 
 
 def get_payload(token: HTTPAuthorizationCredentials):
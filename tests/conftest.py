@@ -0,0 +1,150 @@
+import os
+
+# Cheap password hashes keep logins fast; set before app.conf is imported
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+from typing import Any, Dict  # noqa: E402
+
+import fakeredis  # noqa: E402
+import mongomock.aggregate  # noqa: E402
+import mongomock.collection  # noqa: E402
+import mongomock.database  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+import app.conf as conf  # noqa: E402
+from app.utils import auth_cache, passwords  # noqa: E402
+from app.utils.revocation import revocation_filter  # noqa: E402
+
+
+# mongomock lacks a few things pymongo 4 sends or the app relies on: the
+# ``sort`` argument of bulk updates, time-series collections and $unionWith
+def _ignore_sort(method):
+    def wrapper(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+mongomock.collection.BulkOperationBuilder.add_update = _ignore_sort(
+    mongomock.collection.BulkOperationBuilder.add_update
+)
+mongomock.collection.BulkOperationBuilder.add_replace = _ignore_sort(
+    mongomock.collection.BulkOperationBuilder.add_replace
+)
+
+_create_collection = mongomock.database.Database.create_collection
+
+
+def _create_plain_collection(self, name, **kwargs):
+    kwargs.pop("timeseries", None)
+    return _create_collection(self, name, **kwargs)
+
+
+def _union_with(in_collection, database, options):
+    other = database[options["coll"]].aggregate(options.get("pipeline", []))
+    return list(in_collection) + list(other)
+
+
+mongomock.database.Database.create_collection = _create_plain_collection
+mongomock.aggregate._PIPELINE_HANDLERS["$unionWith"] = _union_with
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database(monkeypatch):
+    """Give every test an empty in-memory Mongo and Redis, and empty caches."""
+    monkeypatch.setattr(conf, "mongo_client", AsyncMongoMockClient())
+    monkeypatch.setattr(
+        conf,
+        "redis_client",
+        fakeredis.aioredis.FakeRedis(
+            server=fakeredis.FakeServer(), decode_responses=True
+        ),
+    )
+    # The app shuts the hashing pool down when its lifespan ends
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(passwords, "password_executor", executor)
+    auth_cache.token_cache.clear()
+    auth_cache.user_cache.clear()
+    monkeypatch.setattr(revocation_filter, "_revoked", {})
+    monkeypatch.setattr(revocation_filter, "synced", False)
+    yield conf.get_database()
+    executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def client():
+    from app.app import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client) -> Dict[str, str]:
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": conf.DEFAULT_USER_EMAIL,
+            "password": conf.DEFAULT_USER_PASSWORD,
+        },
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def make_car(index: int = 1, **fields: Any) -> Dict[str, Any]:
+    """Build a valid car payload, unique per index."""
+    car = {
+        "make": "Audi",
+        "model": "A4",
+        "year": 2015,
+        "price": 10000.0,
+        "mileage": 95000,
+        "engine_type": "Petrol",
+        "engine_capacity": "2.0",
+        "transmission": "Auto",
+        "location": "Kyiv",
+        "image_url": None,
+        "source_url": f"https://auto.example.com/cars/{index}",
+        "source_site": "AutoRia",
+        "source_page": 1,
+    }
+    car.update(fields)
+    return car
+
+
+def days_ago(days: float) -> datetime:
+    return datetime.now() - timedelta(days=days)
+
+
+def autoria_ticket(index: int = 1, nested: bool = False) -> str:
+    """Build the markup of an AutoRia search result ticket."""
+    inner = '<section class="inner">promo</section>' if nested else ""
+    return f"""<section class="ticket-item " data-advertisement-id="{index}">
+  <div class="hide" data-advertisement-data="true" data-mark-name="Audi"
+       data-model-name="A{index}" data-year="{2000 + index}"
+       data-link-to-view="/uk/auto_audi_a4_{index}.html"></div>
+  <div class="ticket-photo"><a><picture>
+    <img src="//cdn.riastatic.com/photo/audi_{index}.jpg" alt="Audi">
+  </picture></a></div>
+  {inner}
+  <div class="price-ticket" data-main-currency="USD">
+    <span data-currency="USD">12 500</span>
+    <span data-currency="UAH">{500000 + index}</span>
+  </div>
+  <ul class="unstyle characteristic">
+    <li class="item-char js-race"><i class="icon-mileage"></i> {100 + index} тис. км</li>
+    <li class="item-char view-location js-location"><i class="icon-location"></i>Київ <span>(від)</span></li>
+    <li class="item-char"><i class="icon-fuel"></i>Бензин, 2 л.</li>
+    <li class="item-char"><i class="icon-transmission"></i>Автомат</li>
+  </ul>
+</section>"""
@@ -0,0 +1,120 @@
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from tests.conftest import days_ago, make_car
+
+
+async def _create_stale(car_crud, index, days=30, **fields):
+    [(_, car)] = await car_crud.upsert_listings([make_car(index, **fields)])
+    await car_crud.collection.update_one(
+        {"source_url": car["source_url"]}, {"$set": {"last_seen_at": days_ago(days)}}
+    )
+    return car
+
+
+async def _active_urls(car_crud):
+    return sorted(
+        car["source_url"] for car in await car_crud.collection.find().to_list(None)
+    )
+
+
+@pytest.mark.anyio
+async def test_archive_moves_unseen_listings():
+    car_crud = CarCRUD()
+    stale = await _create_stale(car_crud, 1)
+    await _create_stale(car_crud, 2, days=1)
+
+    assert await car_crud.archive_stale(days_ago(7)) == 1
+
+    assert await _active_urls(car_crud) == [make_car(2)["source_url"]]
+    [archived] = await car_crud.archive.find().to_list(None)
+    assert str(archived["_id"]) == stale["id"]
+    assert archived["archived_at"] is not None
+    [stats] = await CarStatsCRUD().get_stats()
+    assert stats["count"] == 1
+    # History of archived cars stays available
+    assert len(await car_crud.get_price_history(stale["id"])) == 1
+
+
+@pytest.mark.anyio
+async def test_archive_is_scoped_to_site_makes_and_pages():
+    car_crud = CarCRUD()
+    await _create_stale(car_crud, 1, source_page=1)
+    await _create_stale(car_crud, 2, source_page=3)
+    await _create_stale(car_crud, 3, make="BMW")
+    await _create_stale(car_crud, 4, source_site="AutoBazar")
+
+    archived = await car_crud.archive_stale(
+        days_ago(7), source_site="AutoRia", makes=["audi"], pages=[1, 2]
+    )
+
+    assert archived == 1
+    assert await car_crud.archive.count_documents({}) == 1
+    assert make_car(1)["source_url"] not in await _active_urls(car_crud)
+
+
+@pytest.mark.anyio
+async def test_archive_rerun_after_an_interrupted_batch():
+    car_crud = CarCRUD()
+    await _create_stale(car_crud, 1)
+    # A crash after the copy left the car in both collections
+    car = await car_crud.collection.find_one({})
+    await car_crud.archive.insert_one(car)
+
+    assert await car_crud.archive_stale(days_ago(7)) == 1
+
+    assert await car_crud.collection.count_documents({}) == 0
+    assert await car_crud.archive.count_documents({}) == 1
+
+
+@pytest.mark.anyio
+async def test_seen_again_listing_is_restored_with_its_id():
+    car_crud = CarCRUD()
+    stale = await _create_stale(car_crud, 1)
+    await car_crud.archive_stale(days_ago(7))
+
+    [(listing_status, car)] = await car_crud.upsert_listings([make_car(1, price=1.0)])
+
+    assert listing_status == "updated"
+    assert car["id"] == stale["id"]
+    assert await car_crud.archive.count_documents({}) == 0
+    assert [p["price"] for p in await car_crud.get_price_history(car["id"])] == [
+        10000.0,
+        1.0,
+    ]
+    [stats] = await CarStatsCRUD().get_stats()
+    assert (stats["count"], stats["mean_price"]) == (1, 1.0)
+
+
+def test_reads_include_archived_cars_on_request(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+    client.post("/cars/", json=make_car(2), headers=auth_headers)
+    client.portal.call(
+        CarCRUD().collection.update_one,
+        {"source_url": car["source_url"]},
+        {"$set": {"last_seen_at": days_ago(30)}},
+    )
+
+    archive = client.post("/admin/listings/archive?days=7", headers=auth_headers)
+
+    assert archive.status_code == 202
+    assert len(client.get("/cars/", headers=auth_headers).json()) == 1
+    every = client.get("/cars/?include_archived=true", headers=auth_headers).json()
+    assert len(every) == 2
+    assert client.get(f"/cars/{car['id']}", headers=auth_headers).status_code == 404
+    by_id = client.get(
+        f"/cars/{car['id']}?include_archived=true", headers=auth_headers
+    ).json()
+    assert by_id["archived_at"] is not None
+
+
+@pytest.mark.anyio
+async def test_make_lookup_matches_the_make_literally():
+    car_crud = CarCRUD()
+    await car_crud.create_car(make_car(1, make="Mercedes-Benz (W)"))
+    await car_crud.create_car(make_car(2))
+
+    assert len(await car_crud.get_cars_by_make("mercedes-benz (w)")) == 1
+    assert await car_crud.get_cars_by_make(".*") == []
+    assert len(await car_crud.get_cars_by_make("AUDI")) == 1
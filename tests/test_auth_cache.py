@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+import app.conf as conf
+from app.db.users_db import UserCRUD
+from app.utils import auth_cache
+from app.utils.revocation import revocation_filter
+
+
+def _login(client, email, password):
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_cached_token_never_outlives_its_exp():
+    auth_cache.cache_token("live", "a@a.com", "access", "1", time.time() + 60)
+    auth_cache.cache_token("expired", "a@a.com", "access", "2", time.time() - 1)
+
+    assert auth_cache.get_cached_token("live") == ("a@a.com", "access", "1")
+    assert auth_cache.get_cached_token("expired") is None
+    assert auth_cache.token_key("expired") not in auth_cache.token_cache
+
+
+def test_cached_user_is_a_copy():
+    auth_cache.cache_user("a@a.com", {"email": "a@a.com"})
+
+    auth_cache.get_cached_user("a@a.com")["email"] = "changed"
+
+    assert auth_cache.get_cached_user("a@a.com") == {"email": "a@a.com"}
+
+
+def test_repeat_requests_skip_the_user_lookup(client, auth_headers, monkeypatch):
+    assert client.get("/users/", headers=auth_headers).status_code == 200
+
+    async def fail(self, email):
+        raise AssertionError("user looked up again")
+
+    monkeypatch.setattr(UserCRUD, "get_user_by_email", fail)
+
+    assert client.get("/users/", headers=auth_headers).status_code == 200
+
+
+def test_login_drops_the_cached_user(client, auth_headers):
+    client.get("/users/", headers=auth_headers)
+    assert auth_cache.get_cached_user(conf.DEFAULT_USER_EMAIL) is not None
+
+    _login(client, conf.DEFAULT_USER_EMAIL, conf.DEFAULT_USER_PASSWORD)
+
+    assert auth_cache.get_cached_user(conf.DEFAULT_USER_EMAIL) is None
+
+
+def test_deleted_user_is_not_served_from_cache(client, auth_headers):
+    user = client.post(
+        "/users/",
+        json={"username": "bob", "email": "bob@example.com", "password": "password1"},
+        headers=auth_headers,
+    ).json()
+    bob_headers = _login(client, "bob@example.com", "password1")
+    assert client.get("/users/", headers=bob_headers).status_code == 200
+
+    client.delete(f"/users/{user['id']}", headers=auth_headers)
+
+    assert client.get("/users/", headers=bob_headers).status_code == 404
+
+
+@pytest.mark.anyio
+async def test_listener_applies_invalidations_from_other_workers():
+    listener = asyncio.create_task(auth_cache.listen_for_invalidations())
+    try:
+        while not revocation_filter.synced:
+            await asyncio.sleep(0.01)
+        auth_cache.cache_user("a@a.com", {"email": "a@a.com"})
+
+        await conf.redis_client.publish(
+            auth_cache.AUTH_CACHE_CHANNEL,
+            '{"type": "user", "key": "a@a.com", "exp": null}',
+        )
+        for _ in range(100):
+            if auth_cache.get_cached_user("a@a.com") is None:
+                break
+            await asyncio.sleep(0.01)
+
+        assert auth_cache.get_cached_user("a@a.com") is None
+    finally:
+        listener.cancel()
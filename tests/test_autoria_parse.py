@@ -0,0 +1,89 @@
+import bs4
+
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.site_helper.autoria_site_helper import parse_announce
+from tests.conftest import autoria_ticket
+
+BASE_URL = "https://auto.ria.com"
+
+
+def _parse(html):
+    ticket = bs4.BeautifulSoup(html, "html.parser").find("section")
+    return parse_announce(ticket, "AutoRia", BASE_URL)
+
+
+def _ticket(body, link="/uk/auto_bmw_x5_1.html"):
+    return (
+        '<section class="ticket-item">'
+        '<div data-advertisement-data="true" data-mark-name="BMW" data-model-name="X5"'
+        f' data-year="2018" data-link-to-view="{link}"></div>{body}</section>'
+    )
+
+
+def test_ticket_fields_are_parsed():
+    assert _parse(autoria_ticket(3)) == Listing(
+        make="Audi",
+        model="A3",
+        year=2003,
+        price=500003.0,
+        mileage=103,
+        engine_type="Бензин",
+        engine_capacity="2 л.",
+        transmission="Автомат",
+        location="Київ",
+        image_url="https://cdn.riastatic.com/photo/audi_3.jpg",
+        source_url=f"{BASE_URL}/uk/auto_audi_a4_3.html",
+        source_site="AutoRia",
+    )
+
+
+def test_missing_blocks_fall_back_to_defaults():
+    car = _parse(_ticket('<ul class="unstyle characteristic"></ul>'))
+
+    assert (car.make, car.model, car.year) == ("BMW", "X5", 2018)
+    assert (car.price, car.mileage, car.image_url) == (0.0, 0, None)
+    assert {car.engine_type, car.transmission, car.location} == {"Unknown"}
+
+
+def test_ticket_without_a_listing_link_is_skipped():
+    assert _parse(_ticket("", link="")) is None
+
+
+def test_characteristics_match_whole_class_strings():
+    items = (
+        '<li class="item-char js-race">без пробігу</li>'
+        '<li class="item-char"><i class="icon-fuel"></i>Дизель, 3 л.</li>'
+    )
+    exact = _parse(_ticket(f'<ul class="unstyle characteristic">{items}</ul>'))
+    extra = _parse(_ticket(f'<ul class="unstyle characteristic wide">{items}</ul>'))
+
+    assert (exact.mileage, exact.engine_type, exact.engine_capacity) == (
+        0,
+        "Дизель",
+        "3 л.",
+    )
+    assert extra.engine_type == "Unknown"
+
+
+def test_first_match_in_its_scope_wins():
+    body = (
+        '<span data-currency="UAH">1</span>'
+        '<div class="price-ticket"><span data-currency="UAH">250 000</span>'
+        '<span data-currency="UAH">999</span></div>'
+        '<img src="https://elsewhere/1.jpg">'
+        '<div class="ticket-photo"><img src="https://cdn/2.jpg"></div>'
+        '<ul class="unstyle characteristic">'
+        '<li class="item-char view-location js-location">'
+        '<i class="icon-location"></i>Львів <span>(обл.)</span></li>'
+        '<li class="item-char"><ul><li class="item-char">'
+        '<i class="icon-transmission"></i>Механіка</li></ul></li>'
+        "</ul>"
+    )
+
+    car = _parse(_ticket(body))
+
+    assert car.price == 250000.0
+    assert car.image_url == "https://cdn/2.jpg"
+    assert car.location == "Львів"
+    # The nested icon counts for both lis around it
+    assert car.transmission == "Механіка"
@@ -0,0 +1,103 @@
+import pytest
+
+from app.scraper.parsers import autoria_parser
+from app.scraper.parsers.autoria_parser import AutoRiaParser
+from app.scraper.parsers.base import BaseParser
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.site_helper.autoria_site_helper import (
+    extract_ticket_items,
+    iter_ticket_items,
+)
+from tests.conftest import autoria_ticket, make_car
+
+BASE_URL = "https://auto.ria.com"
+
+
+def _page(tickets):
+    return (
+        "<html><head><script>var tag = '<section>';</script></head><body>"
+        + '<div id="searchResults">'
+        + "".join(tickets)
+        + '<section class="ticket-items-summary">no ticket</section>'
+        + "</div><footer><section>links</section></footer></body></html>"
+    )
+
+
+async def _chunks(text, size):
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+async def _streamed(parser, html, size):
+    return [
+        parser._parse_ticket(ticket, "audi")
+        async for ticket in iter_ticket_items(_chunks(html, size))
+    ]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size", [1, 7, 100, 16384])
+async def test_streamed_tickets_match_the_full_page_parse(size):
+    parser = AutoRiaParser(BASE_URL, "AutoRia")
+    html = _page(autoria_ticket(index, nested=index == 2) for index in range(1, 5))
+    buffered = parser.parse_data({"results": extract_ticket_items(html)}, "audi")
+
+    streamed = await _streamed(parser, html, size)
+
+    assert len(buffered) == 4
+    assert streamed == buffered
+
+
+@pytest.mark.anyio
+async def test_nested_sections_stay_inside_their_ticket():
+    html = _page([autoria_ticket(1, nested=True), autoria_ticket(2)])
+
+    tickets = [ticket async for ticket in iter_ticket_items(_chunks(html, 5))]
+
+    assert [ticket["data-advertisement-id"] for ticket in tickets] == ["1", "2"]
+    assert tickets[0].find("section", class_="inner") is not None
+
+
+@pytest.mark.anyio
+async def test_stream_cars_reads_every_crawl_page(monkeypatch):
+    requested = []
+
+    async def stream_text(url, params=None):
+        requested.append((url, params["page"]))
+        html = _page([autoria_ticket(params["page"])])
+        async for chunk in _chunks(html, 64):
+            yield chunk
+
+    monkeypatch.setattr(autoria_parser, "stream_text", stream_text)
+    parser = AutoRiaParser(BASE_URL, "AutoRia")
+    parser.crawl_pages = [1, 2]
+
+    cars = [car async for car in parser.stream_cars("Land Rover")]
+
+    assert requested == [
+        (f"{BASE_URL}/uk/car/land-rover/", 1),
+        (f"{BASE_URL}/uk/car/land-rover/", 2),
+    ]
+    assert [(car.model, car.source_page) for car in cars] == [("A1", 1), ("A2", 2)]
+
+
+class PagedParser(BaseParser):
+    crawl_pages = [1, 2]
+
+    async def get_content(self, make, page=1):
+        return None if page == 2 else [make_car(page, make=make)]
+
+    def parse_data(self, content, make=""):
+        return [Listing(**car) for car in content]
+
+    async def get_car_brands(self, preferred_makes):
+        return preferred_makes
+
+
+@pytest.mark.anyio
+async def test_other_parsers_stream_their_parsed_pages():
+    parser = PagedParser("https://auto.example.com", "Example")
+
+    cars = [car async for car in parser.stream_cars("BMW")]
+
+    assert [(car.make, car.source_page) for car in cars] == [("BMW", 1)]
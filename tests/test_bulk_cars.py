@@ -0,0 +1,95 @@
+from app.conf import BULK_MAX_ITEMS
+from tests.conftest import make_car
+
+
+def test_bulk_create_reports_duplicates_per_item(client, auth_headers):
+    client.post("/cars/", json=make_car(1), headers=auth_headers)
+
+    response = client.post(
+        "/cars/bulk", json=[make_car(1), make_car(2), make_car(3)], headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert [r["status"] for r in body["results"]] == ["duplicate", "created", "created"]
+    [stats] = client.get("/cars/stats", headers=auth_headers).json()
+    assert stats["count"] == 3
+
+
+def test_bulk_get_skips_invalid_and_unknown_ids(client, auth_headers):
+    results = client.post(
+        "/cars/bulk", json=[make_car(1), make_car(2)], headers=auth_headers
+    ).json()["results"]
+    ids = [result["id"] for result in results]
+
+    response = client.post(
+        "/cars/bulk/get?fields=make",
+        json={"ids": ids + ["not-an-id", "0" * 24]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert sorted(response.json(), key=lambda car: car["id"]) == sorted(
+        [{"id": car_id, "make": "Audi"} for car_id in ids], key=lambda car: car["id"]
+    )
+
+
+def test_bulk_delete_by_ids(client, auth_headers):
+    [result] = client.post(
+        "/cars/bulk", json=[make_car(1)], headers=auth_headers
+    ).json()["results"]
+
+    response = client.post(
+        "/cars/bulk/delete",
+        json={"ids": [result["id"], "0" * 24, "bad"]},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert [r["status"] for r in body["results"]] == [
+        "deleted",
+        "not_found",
+        "invalid_id",
+    ]
+    assert client.get("/cars/stats", headers=auth_headers).json() == []
+
+
+def test_bulk_delete_by_filter(client, auth_headers):
+    client.post(
+        "/cars/bulk",
+        json=[make_car(1), make_car(2, year=2020), make_car(3, make="BMW")],
+        headers=auth_headers,
+    )
+
+    response = client.post(
+        "/cars/bulk/delete", json={"make": "audi"}, headers=auth_headers
+    )
+
+    assert response.json() == {"count": 2, "results": []}
+    assert [
+        car["make"] for car in client.get("/cars/", headers=auth_headers).json()
+    ] == ["BMW"]
+
+
+def test_bulk_delete_needs_ids_or_a_filter(client, auth_headers):
+    for body in [{}, {"ids": ["0" * 24], "make": "Audi"}]:
+        response = client.post("/cars/bulk/delete", json=body, headers=auth_headers)
+
+        assert response.status_code == 422
+
+
+def test_bulk_requests_are_capped(client, auth_headers):
+    too_many = BULK_MAX_ITEMS + 1
+
+    create = client.post(
+        "/cars/bulk", json=[make_car(i) for i in range(too_many)], headers=auth_headers
+    )
+    get = client.post(
+        "/cars/bulk/get", json={"ids": ["0" * 24] * too_many}, headers=auth_headers
+    )
+
+    assert create.status_code == get.status_code == 422
+    assert client.get("/cars/", headers=auth_headers).json() == []
@@ -0,0 +1,112 @@
+import pytest
+from bson import ObjectId
+
+from app.db.car_db import CarCRUD
+from app.db.car_dedupe import (
+    MATCH_SCORE,
+    assign_clusters,
+    block_key,
+    candidate_keys,
+    elect_primaries,
+    match_score,
+)
+from app.schemas.cars import CarUpdate
+from tests.conftest import make_car
+
+
+def _car(index, **fields):
+    car = {"_id": ObjectId(), **make_car(index), **fields}
+    car["block_key"] = block_key(car)
+    return car
+
+
+def test_block_key_normalizes_and_neighbours_cover_mileage_buckets():
+    car = make_car(1, make="Mercedes-Benz", model="E 220", mileage=95000)
+    same = make_car(2, make="mercedes benz", model="e220", mileage=99999)
+    further = make_car(3, make="Mercedes-Benz", model="E 220", mileage=105000)
+
+    assert block_key(car) == block_key(same)
+    assert block_key(further) != block_key(car)
+    assert block_key(further) in candidate_keys(car)
+
+
+def test_match_score_only_links_other_sites():
+    car = make_car(1)
+    other_site = make_car(2, source_site="AutoBazar", price=10200.0, mileage=96000)
+
+    assert match_score(car, other_site) >= MATCH_SCORE
+    assert match_score(car, make_car(3)) == 0.0
+    assert match_score(car, {**other_site, "price": 20000.0}) < MATCH_SCORE
+
+
+def test_assign_clusters_links_a_batch_once_per_site():
+    autoria = _car(1)
+    bazar = _car(2, source_site="AutoBazar")
+    bazar_again = _car(3, source_site="AutoBazar")
+
+    assign_clusters([autoria, bazar, bazar_again], [])
+
+    assert bazar["cluster_id"] == autoria["cluster_id"] == str(autoria["_id"])
+    assert (autoria["cluster_primary"], bazar["cluster_primary"]) == (True, False)
+    # The cluster already holds a listing of that site
+    assert bazar_again["cluster_id"] == str(bazar_again["_id"])
+
+
+def test_elect_primaries_keeps_the_founder_then_the_oldest():
+    oldest, older, founder = sorted(ObjectId() for _ in range(3))
+    cluster_id = str(founder)
+    members = [
+        {"_id": older, "cluster_id": cluster_id},
+        {"_id": founder, "cluster_id": cluster_id},
+        {"_id": oldest, "cluster_id": cluster_id},
+    ]
+
+    assert elect_primaries(members) == {cluster_id: founder}
+    assert elect_primaries(members[::2]) == {cluster_id: oldest}
+
+
+def test_dedupe_returns_one_listing_per_cluster(client, auth_headers):
+    first = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+    duplicate = make_car(2, source_site="AutoBazar", price=10100.0)
+    second = client.post("/cars/", json=duplicate, headers=auth_headers).json()
+
+    every = client.get("/cars/", headers=auth_headers).json()
+    deduped = client.get("/cars/?dedupe=true", headers=auth_headers).json()
+    client.delete(f"/cars/{first['id']}", headers=auth_headers)
+    after_delete = client.get("/cars/?dedupe=true", headers=auth_headers).json()
+
+    assert second["cluster_id"] == first["id"]
+    assert len(every) == 2
+    assert [car["id"] for car in deduped] == [first["id"]]
+    # The remaining listing takes over as primary
+    assert [car["id"] for car in after_delete] == [second["id"]]
+
+
+@pytest.mark.anyio
+async def test_update_moving_blocks_relinks_the_car():
+    car_crud = CarCRUD()
+    kyiv = await car_crud.create_car(make_car(1))
+    lviv = await car_crud.create_car(
+        make_car(2, source_site="AutoBazar", location="Lviv")
+    )
+
+    moved = await car_crud.update_car(lviv["id"], CarUpdate(location="Kyiv"))
+
+    stored = await car_crud.collection.find_one({"_id": ObjectId(lviv["id"])})
+    assert moved["cluster_id"] == stored["cluster_id"] == kyiv["id"]
+    assert stored["block_key"] == block_key(stored)
+    assert stored["cluster_primary"] is False
+
+
+@pytest.mark.anyio
+async def test_rebuild_clusters_backfills_existing_cars():
+    car_crud = CarCRUD()
+    await car_crud.collection.insert_many(
+        [make_car(1), make_car(2, source_site="AutoBazar"), make_car(3, make="BMW")]
+    )
+
+    assert await car_crud.rebuild_clusters() == 2
+
+    cars = await car_crud.collection.find().to_list(None)
+    assert all(car["block_key"] == block_key(car) for car in cars)
+    assert sum(car["cluster_primary"] for car in cars) == 2
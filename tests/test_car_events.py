@@ -0,0 +1,136 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+import app.conf as conf
+from app.db.car_db import CarCRUD
+from app.schemas.cars import CarUpdate
+from app.utils import car_events
+from app.utils.car_events import (
+    CarEventSubscriber,
+    car_event_broadcaster,
+    car_matches,
+    publish_car_events,
+    stream_car_events,
+)
+from tests.conftest import make_car
+
+
+async def _stream_ids():
+    entries = await conf.redis_client.xrange(conf.CAR_EVENTS_STREAM)
+    return [event_id for event_id, _ in entries]
+
+
+def _event_ids(chunk):
+    return [line[4:] for line in chunk.splitlines() if line.startswith("id: ")]
+
+
+@pytest.mark.anyio
+async def test_publish_appends_cars_to_the_stream():
+    await publish_car_events("created", [{"_id": "1", "make": "Audi"}])
+    await publish_car_events("updated", [])
+
+    [(_, fields)] = await conf.redis_client.xrange(conf.CAR_EVENTS_STREAM)
+
+    assert fields["event"] == "created"
+    assert '"make":"Audi"' in fields["car"]
+
+
+@pytest.mark.anyio
+async def test_car_writes_publish_events():
+    car_crud = CarCRUD()
+    car = await car_crud.create_car(make_car(1))
+    await car_crud.update_car(car["id"], CarUpdate(price=1.0))
+
+    entries = await conf.redis_client.xrange(conf.CAR_EVENTS_STREAM)
+
+    assert [fields["event"] for _, fields in entries] == ["created", "updated"]
+
+
+@pytest.mark.anyio
+async def test_publish_failures_do_not_fail_writes(monkeypatch):
+    @asynccontextmanager
+    async def broken_redis():
+        raise ConnectionError("redis down")
+        yield
+
+    monkeypatch.setattr(car_events, "get_redis", broken_redis)
+
+    await publish_car_events("created", [{"_id": "1"}])
+
+
+def test_car_matches_filters():
+    car = {"make": "Audi", "year": 2015, "price": 10000}
+
+    assert car_matches(car, make="audi", year=2015, min_price=5000, max_price=10000)
+    assert not car_matches(car, make="BMW")
+    assert not car_matches(car, year=2016)
+    assert not car_matches(car, min_price=10001)
+    assert not car_matches({"make": "Audi"}, max_price=1)
+
+
+@pytest.mark.anyio
+async def test_stream_replays_missed_events_then_goes_live():
+    await publish_car_events("created", [{"_id": "1", "make": "Audi"}])
+    await publish_car_events("created", [{"_id": "2", "make": "BMW"}])
+    await publish_car_events("created", [{"_id": "3", "make": "Audi"}])
+    first, _, third = await _stream_ids()
+
+    stream = stream_car_events(first, heartbeat=0.05, make="Audi")
+    replayed = await anext(stream)
+    # A live copy of an already replayed entry is skipped
+    for event_id, car in [
+        (third, {"make": "Audi"}),
+        ("9999999999999-0", {"make": "Audi"}),
+    ]:
+        car_event_broadcaster.dispatch((event_id, "updated", car, "{}"))
+    live = await anext(stream)
+    keep_alive = await anext(stream)
+    await stream.aclose()
+
+    assert _event_ids(replayed) == [third]
+    assert _event_ids(live) == ["9999999999999-0"]
+    assert "event: updated" in live
+    assert keep_alive == ": keep-alive\n\n"
+    assert not car_event_broadcaster._subscribers
+
+
+@pytest.mark.anyio
+async def test_slow_subscribers_are_dropped():
+    subscriber = CarEventSubscriber(maxsize=1)
+
+    subscriber.offer(("1-0", "created", {}, "{}"))
+    subscriber.offer(("2-0", "created", {}, "{}"))
+
+    assert subscriber.dropped
+    assert subscriber.queue.qsize() == 1
+
+
+@pytest.mark.anyio
+async def test_broadcaster_fans_out_new_stream_entries():
+    subscribers = [car_event_broadcaster.subscribe() for _ in range(2)]
+    reader = asyncio.create_task(car_event_broadcaster.run(block_ms=10))
+    try:
+        # Give the reader time to find the current end of the stream
+        await asyncio.sleep(0.05)
+        await publish_car_events("created", [{"_id": "1", "make": "Audi"}])
+
+        events = [
+            await asyncio.wait_for(subscriber.queue.get(), 1)
+            for subscriber in subscribers
+        ]
+    finally:
+        reader.cancel()
+        for subscriber in subscribers:
+            car_event_broadcaster.unsubscribe(subscriber)
+
+    assert [event[2]["make"] for event in events] == ["Audi", "Audi"]
+
+
+def test_stream_rejects_malformed_last_event_id(client, auth_headers):
+    response = client.get(
+        "/cars/stream", headers={**auth_headers, "Last-Event-ID": "abc"}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,32 @@
+from app.schemas.cars import CAR_FIELDS
+from tests.conftest import make_car
+
+
+def test_fields_limit_the_returned_keys(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+
+    for path in ["/cars/", f"/cars/{car['id']}", "/cars/make/Audi", "/cars/year/2015"]:
+        response = client.get(
+            path, params={"fields": "make, price"}, headers=auth_headers
+        )
+
+        assert response.status_code == 200, path
+        body = response.json()
+        row = body[0] if isinstance(body, list) else body
+        assert row == {"id": car["id"], "make": "Audi", "price": 10000.0}
+
+
+def test_unknown_fields_are_rejected(client, auth_headers):
+    response = client.get("/cars/?fields=make,block_key", headers=auth_headers)
+
+    assert response.status_code == 400
+    assert "block_key" in response.json()["detail"]
+
+
+def test_internal_fields_are_not_returned_by_default(client, auth_headers):
+    client.post("/cars/", json=make_car(1), headers=auth_headers)
+
+    [row] = client.get("/cars/", headers=auth_headers).json()
+
+    assert set(row) <= set(CAR_FIELDS)
+    assert "block_key" not in row
@@ -0,0 +1,101 @@
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from app.schemas.cars import CarUpdate
+from tests.conftest import make_car
+
+
+def _without_timestamps(stats):
+    return [{k: v for k, v in entry.items() if k != "updated_at"} for entry in stats]
+
+
+@pytest.mark.anyio
+async def test_stats_follow_created_cars():
+    car_crud = CarCRUD()
+    for i, price in enumerate(range(1000, 11000, 1000)):
+        await car_crud.create_car(make_car(i, price=float(price)))
+
+    [stats] = await CarStatsCRUD().get_stats(make="AUDI")
+
+    assert (stats["make"], stats["model"], stats["year"]) == ("audi", "a4", 2015)
+    assert stats["count"] == 10
+    assert stats["mean_price"] == 5500
+    assert (stats["min_price"], stats["max_price"]) == (1000, 10000)
+    # Percentiles come from a log-scale histogram with ~5% wide buckets
+    assert stats["p50"] == pytest.approx(5000, rel=0.05)
+    assert stats["p90"] == pytest.approx(9000, rel=0.05)
+
+
+@pytest.mark.anyio
+async def test_updates_and_deletes_move_stats_deltas():
+    car_crud = CarCRUD()
+    first = await car_crud.create_car(make_car(1, price=1000.0))
+    second = await car_crud.create_car(make_car(2, price=3000.0))
+
+    await car_crud.update_car(first["id"], CarUpdate(price=2000.0))
+    await car_crud.update_car(second["id"], CarUpdate(year=2020))
+    a4_2015 = await CarStatsCRUD().get_stats(year=2015)
+    await car_crud.delete_car(second["id"])
+    a4_2020 = await CarStatsCRUD().get_stats(year=2020)
+
+    assert [(s["count"], s["mean_price"]) for s in a4_2015] == [(1, 2000)]
+    # Entries whose cars are all gone are not served
+    assert a4_2020 == []
+
+
+@pytest.mark.anyio
+async def test_rebuild_matches_incremental_stats():
+    car_crud = CarCRUD()
+    for i in range(5):
+        await car_crud.create_car(
+            make_car(i, price=1000.0 * (i + 1), year=2010 + i % 2)
+        )
+    await car_crud.create_car(make_car(9, make="BMW", price=7000.0))
+    stats = CarStatsCRUD()
+    incremental = await stats.get_stats()
+
+    assert await stats.rebuild() == 3
+    rebuilt = await stats.get_stats()
+
+    key = lambda entry: (entry["make"], entry["year"])  # noqa: E731
+    assert _without_timestamps(sorted(rebuilt, key=key)) == _without_timestamps(
+        sorted(incremental, key=key)
+    )
+
+
+@pytest.mark.anyio
+async def test_rebuild_narrows_widened_min_max():
+    car_crud = CarCRUD()
+    created = await car_crud.create_car(make_car(1, price=7000.0))
+    await car_crud.update_car(created["id"], CarUpdate(price=8000.0))
+    stats = CarStatsCRUD()
+    [widened] = await stats.get_stats()
+
+    await stats.rebuild()
+    [rebuilt] = await stats.get_stats()
+
+    assert (widened["min_price"], widened["max_price"]) == (7000, 8000)
+    assert (rebuilt["min_price"], rebuilt["max_price"]) == (8000, 8000)
+    assert widened["mean_price"] == rebuilt["mean_price"] == 8000
+
+
+def test_stats_endpoint(client, auth_headers):
+    client.post("/cars/", json=make_car(1, price=1500.0), headers=auth_headers)
+
+    response = client.get("/cars/stats?make=audi&year=2015", headers=auth_headers)
+
+    assert response.status_code == 200
+    [stats] = response.json()
+    assert stats["count"] == 1
+    assert stats["min_price"] == stats["max_price"] == 1500.0
+
+
+def test_admin_stats_rebuild(client, auth_headers):
+    client.post("/cars/", json=make_car(1), headers=auth_headers)
+
+    response = client.post("/admin/stats/rebuild", headers=auth_headers)
+
+    assert response.status_code == 202
+    [stats] = client.get("/cars/stats", headers=auth_headers).json()
+    assert stats["count"] == 1
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from app.scraper.scraper import process_make
+from app.scraper.utils.car_writer import CarWriter
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.sinks import CarSink
+from tests.conftest import make_car
+
+
+def _listing(index, **fields):
+    return Listing(**make_car(index, **fields))
+
+
+class RecordingSink(CarSink):
+    name = "recording"
+
+    def __init__(self, statuses=None):
+        self.batches = []
+        self.statuses = list(statuses or [])
+
+    async def write(self, cars):
+        self.batches.append([car.source_url for car in cars])
+        listing_status = self.statuses.pop(0) if self.statuses else "created"
+        return [listing_status] * len(cars)
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_full_batches_and_the_rest_on_close():
+    sink = RecordingSink()
+    writer = CarWriter(sink, batch_size=3, flush_interval_ms=60000)
+
+    futures = [await writer.put(_listing(index)) for index in range(7)]
+    await writer.close()
+
+    assert [len(batch) for batch in sink.batches] == [3, 3, 1]
+    assert [future.result() for future in futures] == ["created"] * 7
+    assert (writer.batches, writer.written) == (3, 7)
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_a_partial_batch_after_the_interval():
+    sink = RecordingSink()
+
+    async with CarWriter(sink, batch_size=100, flush_interval_ms=10) as writer:
+        future = await writer.put(_listing(1))
+        assert await asyncio.wait_for(future, 1) == "created"
+
+
+@pytest.mark.anyio
+async def test_failed_batch_fails_its_cars_and_the_writer_goes_on():
+    sink = RecordingSink(statuses=["bogus", "created"])
+    writer = CarWriter(sink, batch_size=2, flush_interval_ms=10)
+
+    failed = [await writer.put(_listing(index)) for index in range(2)]
+    await asyncio.wait(failed)
+    written = [await writer.put(_listing(index)) for index in range(2, 4)]
+    await writer.close()
+
+    assert all(isinstance(future.exception(), KeyError) for future in failed)
+    assert [future.result() for future in written] == ["created", "created"]
+
+
+@pytest.mark.anyio
+async def test_stopped_writer_fails_queued_cars_instead_of_hanging():
+    writer = CarWriter(RecordingSink(), batch_size=1, queue_size=2)
+
+    async def broken_flush(batch):
+        await asyncio.sleep(0.01)
+        raise ValueError("writer bug")
+
+    writer._safe_flush = broken_flush
+
+    async def produce(index):
+        try:
+            return await writer.put(_listing(index))
+        except RuntimeError:
+            return "put raised"
+
+    outcomes = await asyncio.wait_for(
+        asyncio.gather(*(produce(index) for index in range(6))), 1
+    )
+
+    assert "put raised" in outcomes
+    futures = [outcome for outcome in outcomes if outcome != "put raised"]
+    assert all(isinstance(future.exception(), ValueError) for future in futures)
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(writer.close(), 1)
+
+
+@pytest.mark.anyio
+async def test_process_make_counts_saved_cars_once_written():
+    class Parser:
+        async def stream_cars(self, make):
+            for index in range(3):
+                yield _listing(index, make=make)
+
+    sink = RecordingSink(statuses=["created", "unchanged"])
+    async with CarWriter(sink, batch_size=2, flush_interval_ms=10) as writer:
+        results = await process_make(
+            Parser(), "Audi", asyncio.Semaphore(1), writer=writer
+        )
+
+    assert results == {"processed": 3, "saved": 2, "errors": 0}
+
+
+@pytest.mark.anyio
+async def test_retried_write_records_side_effects_once(monkeypatch):
+    car_crud = CarCRUD()
+    bulk_write = car_crud.collection.bulk_write
+    attempts = []
+
+    async def lost_reply(operations, **kwargs):
+        # The first attempt is applied, but its reply never arrives
+        result = await bulk_write(operations, **kwargs)
+        attempts.append(len(operations))
+        if len(attempts) == 1:
+            raise AutoReconnect("connection reset")
+        return result
+
+    monkeypatch.setattr(car_crud.collection, "bulk_write", lost_reply)
+
+    results = await car_crud.upsert_listings([make_car(1), make_car(2)], 3)
+
+    assert len(attempts) == 2
+    assert [listing_status for listing_status, _ in results] == ["created"] * 2
+    [stats] = await CarStatsCRUD().get_stats()
+    assert stats["count"] == 2
+    assert await car_crud.history.collection.count_documents({}) == 2
+
+
+@pytest.mark.anyio
+async def test_batch_stats_are_applied_in_one_bulk_write(monkeypatch):
+    stats = CarStatsCRUD()
+    bulk_write = stats.collection.bulk_write
+    calls = []
+
+    async def counting(operations, **kwargs):
+        calls.append(len(operations))
+        return await bulk_write(operations, **kwargs)
+
+    monkeypatch.setattr(stats.collection, "bulk_write", counting)
+    before = make_car(1)
+
+    await stats.record_changed(
+        [(before, {**before, "price": 12000.0}), (make_car(2), make_car(2))],
+        added=[make_car(3, model="A6"), make_car(4, model="A6")],
+    )
+
+    assert calls == [2]
+    counts = {entry["model"]: entry["count"] for entry in await stats.get_stats()}
+    assert counts == {"a6": 2}
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+
+import pytest
+from bson import ObjectId
+
+from app.db.car_db import CarCRUD
+from app.utils.export import EXPORT_FIELDS, stream_export
+from tests.conftest import days_ago, make_car
+
+
+async def _collect(chunks):
+    return "".join([chunk async for chunk in chunks])
+
+
+async def _years(car_crud, query):
+    return [car["year"] async for batch in car_crud.iter_cars(query) for car in batch]
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.anyio
+async def test_iter_cars_batches_in_update_order():
+    car_crud = CarCRUD()
+    ids = [(await car_crud.create_car(make_car(i)))["id"] for i in range(3)]
+    # Reverse the insertion order through updated_at
+    for age, car_id in enumerate(ids):
+        await car_crud.collection.update_one(
+            {"_id": ObjectId(car_id)}, {"$set": {"updated_at": days_ago(age + 1)}}
+        )
+
+    batches = [batch async for batch in car_crud.iter_cars({}, batch_size=2)]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    exported = [str(car["_id"]) for batch in batches for car in batch]
+    assert exported == list(reversed(ids))
+
+
+@pytest.mark.anyio
+async def test_build_filter_since_and_year():
+    car_crud = CarCRUD()
+    await car_crud.create_car(make_car(1, year=2010))
+    await car_crud.create_car(make_car(2, year=2020))
+    old = await car_crud.collection.find_one({"year": 2010})
+    await car_crud.collection.update_one(
+        {"_id": old["_id"]}, {"$set": {"updated_at": days_ago(10)}}
+    )
+
+    recent = car_crud.build_filter(since=days_ago(1))
+    by_year = car_crud.build_filter(year=2010)
+
+    assert await _years(car_crud, recent) == [2020]
+    assert await _years(car_crud, by_year) == [2010]
+
+
+@pytest.mark.anyio
+async def test_stream_export_csv_writes_header_once():
+    car = {"_id": "abc", "make": "Audi", "updated_at": days_ago(0)}
+
+    body = await _collect(stream_export(_batches([car], [car]), "csv"))
+
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0] == EXPORT_FIELDS
+    assert len(rows) == 3
+    assert rows[1][0] == "abc"
+
+
+def test_export_ndjson_filters_by_make(client, auth_headers):
+    client.post("/cars/", json=make_car(1), headers=auth_headers)
+    client.post("/cars/", json=make_car(2, make="BMW"), headers=auth_headers)
+
+    response = client.get("/cars/export?make=bmw", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["make"] for row in rows] == ["BMW"]
+    assert set(rows[0]) == set(EXPORT_FIELDS)
+
+
+def test_export_csv_since(client, auth_headers):
+    for i in range(3):
+        client.post("/cars/", json=make_car(i), headers=auth_headers)
+
+    response = client.get(
+        "/cars/export",
+        params={"format": "csv", "since": days_ago(1).isoformat()},
+        headers=auth_headers,
+    )
+    later = client.get(
+        "/cars/export",
+        params={"format": "csv", "since": days_ago(-1).isoformat()},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert 'filename="cars.csv"' in response.headers["content-disposition"]
+    assert len(list(csv.reader(io.StringIO(response.text)))) == 4
+    assert list(csv.reader(io.StringIO(later.text))) == [EXPORT_FIELDS]
+
+
+def test_export_rejects_unknown_format(client, auth_headers):
+    response = client.get("/cars/export?format=xml", headers=auth_headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,128 @@
+import itertools
+
+import httpx
+import pytest
+from tenacity import stop_after_attempt, wait_none
+
+from app.scraper.utils import http_client, identity_pool
+from app.scraper.utils.identity_pool import (
+    DEFAULT_COOL_DOWN,
+    ClientIdentity,
+    IdentityPool,
+)
+
+
+class FakeUserAgent:
+    def __init__(self, *user_agents):
+        self._user_agents = itertools.cycle(user_agents)
+
+    @property
+    def random(self):
+        return next(self._user_agents)
+
+
+@pytest.fixture
+def user_agents(monkeypatch):
+    monkeypatch.setattr(
+        identity_pool, "get_user_agent", lambda: FakeUserAgent("ua-1", "ua-1", "ua-2")
+    )
+
+
+@pytest.fixture
+async def mock_pool(user_agents, monkeypatch):
+    """Route the scraper's requests through a pool of two mocked identities."""
+    requests = []
+    responses = []
+
+    def handler(request):
+        requests.append(request)
+        if responses:
+            return responses.pop(0)
+        return httpx.Response(200, headers={"set-cookie": "visitor=1; Path=/"})
+
+    pool = IdentityPool(size=2, requests_per_minute=0)
+    for identity in pool.identities:
+        await identity.client.aclose()
+        identity.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            headers={"User-Agent": identity.user_agent},
+        )
+    monkeypatch.setattr(http_client, "identity_pool", pool)
+    yield pool, requests, responses
+    await pool.aclose()
+
+
+def _send(url, **kwargs):
+    quick = http_client.send_request.retry_with(
+        wait=wait_none(), stop=stop_after_attempt(3)
+    )
+    return quick(url, **kwargs)
+
+
+def test_identity_paces_its_own_requests():
+    identity = ClientIdentity("ua", requests_per_minute=30)
+
+    assert identity.reserve(100.0) == 0.0
+    assert identity.reserve(100.0) == 2.0
+    assert identity.reserve(105.0) == 0.0
+
+
+def test_throttled_identity_cools_down(monkeypatch):
+    monkeypatch.setattr(identity_pool.time, "monotonic", lambda: 100.0)
+    identity = ClientIdentity("ua", requests_per_minute=60)
+
+    identity.cool_down(httpx.Response(429, headers={"Retry-After": "30"}))
+    assert identity.next_request_at == 130.0
+    identity.cool_down(httpx.Response(429, headers={"Retry-After": "soon"}))
+    assert identity.next_request_at == 100.0 + DEFAULT_COOL_DOWN
+
+
+@pytest.mark.anyio
+async def test_pool_spreads_requests_over_distinct_identities(user_agents):
+    pool = IdentityPool(size=2, requests_per_minute=6000)
+
+    used = [await pool.acquire() for _ in range(6)]
+    await pool.aclose()
+
+    assert [identity.user_agent for identity in used[:2]] == ["ua-1", "ua-2"]
+    assert {identity.user_agent: identity.requests for identity in used} == {
+        "ua-1": 3,
+        "ua-2": 3,
+    }
+    assert pool._identities == []
+
+
+@pytest.mark.anyio
+async def test_identities_keep_site_cookies_but_not_call_cookies(mock_pool):
+    pool, requests, _ = mock_pool
+
+    for _ in range(2):
+        await _send("https://auto.example.com/a", cookies={"token": "t"})
+    await _send("https://auto.example.com/b")
+    await _send("https://auto.example.com/b")
+
+    cookies = [request.headers.get("cookie") for request in requests]
+    assert cookies == ["token=t", "token=t", "visitor=1", "visitor=1"]
+    assert [request.headers["user-agent"] for request in requests] == [
+        "ua-1",
+        "ua-2",
+        "ua-1",
+        "ua-2",
+    ]
+
+
+@pytest.mark.anyio
+async def test_throttled_request_is_retried_by_another_identity(mock_pool):
+    pool, requests, responses = mock_pool
+    responses.extend(
+        [httpx.Response(429, headers={"Retry-After": "600"}), httpx.Response(502)]
+    )
+
+    response = await _send("https://auto.example.com/")
+
+    assert response.status_code == 200
+    assert [request.headers["user-agent"] for request in requests] == [
+        "ua-1",
+        "ua-2",
+        "ua-2",
+    ]
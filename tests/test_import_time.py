@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from starlette.exceptions import HTTPException
+
+from app.exceptions.car_exceptions import CarNotFoundException
+from app.scraper.parsers.factory import available_sites, load_parser_class
+from app.utils.import_time import parse_import_time
+
+IMPORT_TIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       5000 |     json.decoder
+import time:       300 |      12000 |   json
+import time:       900 |      40000 |   app.conf
+import time:      1500 |      60000 | app.scraper.job
+"""
+
+# Run in a fresh interpreter, since the test session has imported everything
+COLD_IMPORT = """
+import sys
+import app.scraper.job
+from app import conf
+from app.scraper.parsers.factory import create_parser
+
+create_parser("autobazar")
+print(",".join(m for m in ("fastapi", "bs4", "pyarrow", "fake_useragent") if m in sys.modules))
+print(conf.mongo_client is None, conf.ua is None)
+conf.get_database()
+client = conf.mongo_client
+conf.get_database()
+print(client is not None, conf.mongo_client is client)
+"""
+
+
+def test_parse_import_time_reports_the_module_and_its_direct_imports():
+    total, imports = parse_import_time(IMPORT_TIME_OUTPUT, "app.scraper.job")
+
+    assert total == 60.0
+    assert imports == [("app.conf", 40.0), ("json", 12.0), ("_io", 0.12)]
+
+
+def test_scraper_imports_skip_unused_dependencies_and_clients():
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_IMPORT],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+
+    assert output == ["", "True True", "True True"]
+
+
+def test_parsers_are_registered_by_path():
+    assert available_sites() == ["autoria", "autobazar"]
+    assert load_parser_class("AutoRia").__name__ == "AutoRiaParser"
+    assert load_parser_class("nope") is None
+
+
+def test_exceptions_are_handled_as_starlette_http_exceptions():
+    assert isinstance(CarNotFoundException(), HTTPException)
@@ -0,0 +1,68 @@
+import dataclasses
+
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.scraper.parsers.autobazar_parser import AutoBazarParser
+from app.scraper.utils.car_writer import CarWriter
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.sinks import MongoSink
+from tests.conftest import make_car
+
+BASE_URL = "https://avtobazar.ua"
+
+AUTOBAZAR_ITEM = {
+    "make": {"title": "Skoda"},
+    "model_title": "Octavia",
+    "year": "2019",
+    "price": [{"currency": "usd", "value": 100}, {"currency": "uah", "value": 4200}],
+    "mileage": "120000",
+    "capacity": 1.6,
+    "location": {"title": "Одеса"},
+    "gearbox": {"title": "Механіка"},
+    "engine": {"title": "Дизель"},
+    "permalink": "/cars/skoda-octavia-1/",
+}
+
+
+def test_listing_is_slotted():
+    listing = Listing(**make_car(1))
+
+    assert not hasattr(listing, "__dict__")
+    with pytest.raises(AttributeError):
+        listing.site_name = "AutoRia"
+    assert dataclasses.asdict(listing) == make_car(1)
+
+
+def test_autobazar_items_become_listings():
+    parser = AutoBazarParser(BASE_URL, "AutoBazar")
+
+    cars = parser.parse_data([AUTOBAZAR_ITEM, {"model_title": "Fabia"}, None])
+
+    assert cars == [
+        Listing(
+            make="Skoda",
+            model="Octavia",
+            year=2019,
+            price=4200.0,
+            mileage=120000,
+            engine_type="Дизель",
+            engine_capacity="1.6",
+            transmission="Механіка",
+            location="Одеса",
+            image_url=f"{BASE_URL}/cars/skoda-octavia-1/",
+            source_url=f"{BASE_URL}/cars/skoda-octavia-1/",
+            source_site="AutoBazar",
+        )
+    ]
+
+
+@pytest.mark.anyio
+async def test_listings_are_stored_as_plain_documents():
+    async with CarWriter(MongoSink(), flush_interval_ms=10) as writer:
+        future = await writer.put(Listing(**make_car(1)))
+        assert await future == "created"
+
+    stored = await CarCRUD().collection.find_one({})
+    assert stored["source_url"] == make_car(1)["source_url"]
+    assert isinstance(stored["source_url"], str)
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+from passlib.hash import bcrypt
+
+import app.conf as conf
+from app.db.users_db import UserCRUD
+from app.utils import passwords
+
+
+@pytest.mark.anyio
+async def test_hashing_runs_on_the_worker_pool(monkeypatch):
+    seen = {}
+    hash_password = passwords.pwd_context.hash
+
+    def record(password):
+        seen["thread"] = threading.current_thread()
+        seen["depth"] = passwords.password_queue_depth()
+        return hash_password(password)
+
+    monkeypatch.setattr(passwords.pwd_context, "hash", record)
+
+    hashed = await passwords.hash_password("secret-password")
+
+    assert seen["thread"] is not threading.main_thread()
+    assert seen["depth"] == 1
+    assert passwords.password_queue_depth() == 0
+    assert await passwords.verify_password("secret-password", hashed) == (True, None)
+
+
+@pytest.mark.anyio
+async def test_verify_flags_hashes_with_another_cost():
+    old_hash = bcrypt.using(rounds=conf.BCRYPT_ROUNDS + 1).hash("secret-password")
+
+    valid, new_hash = await passwords.verify_password("secret-password", old_hash)
+    invalid = await passwords.verify_password("wrong-password", old_hash)
+
+    assert valid
+    assert bcrypt.from_string(new_hash).rounds == conf.BCRYPT_ROUNDS
+    assert invalid == (False, None)
+
+
+def test_login_stores_the_rehashed_password(client):
+    old_hash = bcrypt.using(rounds=conf.BCRYPT_ROUNDS + 1).hash(
+        conf.DEFAULT_USER_PASSWORD
+    )
+    users = UserCRUD().collection
+    client.portal.call(
+        users.update_one,
+        {"email": conf.DEFAULT_USER_EMAIL},
+        {"$set": {"password_hash": old_hash}},
+    )
+
+    response = client.post(
+        "/auth/login",
+        json={"email": conf.DEFAULT_USER_EMAIL, "password": conf.DEFAULT_USER_PASSWORD},
+    )
+
+    assert response.status_code == 200
+    user = client.portal.call(users.find_one, {"email": conf.DEFAULT_USER_EMAIL})
+    assert bcrypt.from_string(user["password_hash"]).rounds == conf.BCRYPT_ROUNDS
+
+
+def test_metrics_report_the_hashing_queue(client, auth_headers):
+    response = client.get("/admin/metrics", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"password_hash_queue_depth": 0}
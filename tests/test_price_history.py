@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.db.car_stats_db import CarStatsCRUD
+from tests.conftest import make_car
+
+
+async def _history(car_crud, car_id):
+    return [point["price"] for point in await car_crud.get_price_history(car_id)]
+
+
+@pytest.mark.anyio
+async def test_upsert_updates_listings_in_place():
+    car_crud = CarCRUD()
+    [(created, car)] = await car_crud.upsert_listings([make_car(1)])
+    first = await car_crud.collection.find_one({})
+    # Mongo keeps milliseconds, so let the clock move between crawls
+    await asyncio.sleep(0.01)
+    [(unchanged, same)] = await car_crud.upsert_listings([make_car(1)])
+    seen = await car_crud.collection.find_one({})
+    await asyncio.sleep(0.01)
+    [(updated, cheaper)] = await car_crud.upsert_listings([make_car(1, price=9000.0)])
+    changed = await car_crud.collection.find_one({})
+
+    assert [created, unchanged, updated] == ["created", "unchanged", "updated"]
+    assert same["id"] == cheaper["id"] == car["id"]
+    # Only a real change moves updated_at; every crawl moves last_seen_at
+    assert seen["updated_at"] == first["updated_at"]
+    assert seen["last_seen_at"] > first["last_seen_at"]
+    assert changed["updated_at"] > first["updated_at"]
+    assert await car_crud.collection.count_documents({}) == 1
+    assert await _history(car_crud, car["id"]) == [10000.0, 9000.0]
+    [stats] = await CarStatsCRUD().get_stats()
+    assert (stats["count"], stats["mean_price"]) == (1, 9000.0)
+
+
+@pytest.mark.anyio
+async def test_upsert_writes_the_last_copy_of_a_repeated_listing():
+    car_crud = CarCRUD()
+
+    results = await car_crud.upsert_listings(
+        [make_car(1, price=1.0), make_car(2), make_car(1, price=2.0)]
+    )
+
+    assert [status for status, _ in results] == ["unchanged", "created", "created"]
+    stored = await car_crud.collection.find_one(
+        {"source_url": make_car(1)["source_url"]}
+    )
+    assert stored["price"] == 2.0
+
+
+def test_history_endpoint_follows_api_updates(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+    client.put(f"/cars/{car['id']}", json={"mileage": 96000}, headers=auth_headers)
+    client.put(f"/cars/{car['id']}", json={"location": "Lviv"}, headers=auth_headers)
+
+    response = client.get(f"/cars/{car['id']}/history", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [point["mileage"] for point in response.json()] == [95000, 96000]
+
+
+def test_history_is_deleted_with_its_car(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+
+    client.delete(f"/cars/{car['id']}", headers=auth_headers)
+
+    history = client.get(f"/cars/{car['id']}/history", headers=auth_headers)
+    assert history.status_code == 404
+    points = client.portal.call(CarCRUD().history.collection.count_documents, {})
+    assert points == 0
+
+
+@pytest.mark.anyio
+async def test_merge_duplicate_listings_keeps_the_newest_document():
+    car_crud = CarCRUD()
+    first_seen = datetime(2024, 1, 1)
+    copies = [
+        {**make_car(1, price=price), "created_at": created, "updated_at": created}
+        for price, created in [
+            (12000.0, first_seen),
+            (10000.0, first_seen + timedelta(days=2)),
+            (11000.0, first_seen + timedelta(days=1)),
+        ]
+    ]
+    without_url = make_car(2, source_url="https://auto.example.com/")
+    await car_crud.collection.insert_many(copies + [without_url, dict(without_url)])
+
+    counts = await car_crud.merge_duplicate_listings()
+
+    assert counts == {"merged": 2, "archived": 2}
+    [kept] = await car_crud.collection.find().to_list(length=None)
+    assert kept["price"] == 10000.0
+    assert kept["created_at"] == first_seen
+    assert await _history(car_crud, str(kept["_id"])) == [12000.0, 11000.0, 10000.0]
+    assert await car_crud.archive.count_documents({}) == 2
+    await car_crud.create_indexes()
+
+
+@pytest.mark.anyio
+async def test_listing_without_history_gets_a_point_per_document():
+    car_crud = CarCRUD()
+    now = datetime.now()
+    await car_crud.collection.insert_many(
+        [{**make_car(1), "updated_at": now}, {**make_car(1), "updated_at": now}]
+    )
+
+    await car_crud.merge_duplicate_listings()
+
+    [kept] = await car_crud.collection.find().to_list(length=None)
+    assert len(await _history(car_crud, str(kept["_id"]))) == 2
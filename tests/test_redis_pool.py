@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from redis.asyncio import BlockingConnectionPool
+
+import app.conf as conf
+from app.app import app
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(conf, "redis_client", None)
+
+
+@pytest.mark.anyio
+async def test_get_redis_yields_one_shared_client(no_redis):
+    async with conf.get_redis() as first:
+        async with conf.get_redis() as second:
+            assert first is second is conf.redis_client
+
+    pool = first.connection_pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == conf.REDIS_MAX_CONNECTIONS
+    assert pool.timeout == conf.REDIS_POOL_TIMEOUT
+    await conf.close_redis()
+
+
+@pytest.mark.anyio
+async def test_close_redis_drops_the_shared_client(no_redis):
+    client = conf.init_redis()
+
+    await conf.close_redis()
+
+    assert conf.redis_client is None
+    assert conf.init_redis() is not client
+    await conf.close_redis()
+
+
+def test_app_lifespan_closes_the_shared_client():
+    shared = conf.redis_client
+    with TestClient(app):
+        assert conf.redis_client is shared
+
+    assert conf.redis_client is None
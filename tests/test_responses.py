@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import msgpack
+import pytest
+from bson import ObjectId
+
+from app.schemas.cars import CarResponse
+from app.utils.responses import MSGPACK_MEDIA_TYPE, MsgPackResponse
+from tests.conftest import make_car
+
+
+def test_car_reads_match_the_response_schema(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+
+    for path in ["/cars/", f"/cars/{car['id']}", "/cars/make/Audi", "/cars/year/2015"]:
+        response = client.get(path, headers=auth_headers)
+
+        assert response.status_code == 200, path
+        body = response.json()
+        rows = body if isinstance(body, list) else [body]
+        assert [CarResponse.model_validate(row).id for row in rows] == [car["id"]]
+
+
+def test_msgpack_is_served_on_request(client, auth_headers):
+    car = client.post("/cars/", json=make_car(1), headers=auth_headers).json()
+    as_json = client.get(f"/cars/{car['id']}", headers=auth_headers).json()
+
+    response = client.get(
+        f"/cars/{car['id']}", headers={**auth_headers, "Accept": MSGPACK_MEDIA_TYPE}
+    )
+
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(response.content) == as_json
+
+
+def test_msgpack_encodes_mongo_types():
+    car_id = ObjectId()
+    seen = datetime(2024, 1, 2, 3, 4, 5)
+
+    body = MsgPackResponse({"_id": car_id, "updated_at": seen}).body
+
+    assert msgpack.unpackb(body) == {
+        "_id": str(car_id),
+        "updated_at": "2024-01-02T03:04:05",
+    }
+    with pytest.raises(TypeError):
+        MsgPackResponse({"value": object()})
@@ -0,0 +1,84 @@
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from jose import jwt
+
+import app.conf as conf
+from app.utils import token as token_utils
+from app.utils.revocation import BLACKLIST_PREFIX, RevocationFilter
+
+
+def test_filter_entries_drop_out_at_exp():
+    revoked = RevocationFilter()
+
+    revoked.add("live", time.time() + 60)
+    revoked.add("expired", time.time() - 1)
+    revoked.add("forever", None)
+
+    assert revoked.contains("live")
+    assert revoked.contains("forever")
+    assert not revoked.contains("expired")
+    assert not revoked.contains("unknown")
+
+
+@pytest.mark.anyio
+async def test_seed_loads_revoked_keys_with_their_ttl():
+    await conf.redis_client.setex(f"{BLACKLIST_PREFIX}abc", 60, "blacklisted")
+    await conf.redis_client.set("other", "1")
+    revoked = RevocationFilter()
+
+    await revoked.seed(conf.redis_client)
+
+    assert revoked.synced
+    assert revoked.contains("abc")
+    assert not revoked.contains("other")
+
+
+@pytest.mark.anyio
+async def test_synced_filter_answers_without_redis(monkeypatch):
+    revoked = RevocationFilter()
+    revoked.add("jti-1", time.time() + 60)
+    revoked.synced = True
+    monkeypatch.setattr(token_utils, "revocation_filter", revoked)
+
+    @asynccontextmanager
+    async def no_redis():
+        raise AssertionError("Redis was queried")
+        yield
+
+    monkeypatch.setattr(token_utils, "get_redis", no_redis)
+
+    assert await token_utils.is_token_blacklisted("token", "jti-1")
+    assert not await token_utils.is_token_blacklisted("token", "jti-2")
+
+
+@pytest.mark.anyio
+async def test_unsynced_filter_falls_back_to_redis():
+    await conf.redis_client.setex(f"{BLACKLIST_PREFIX}jti-1", 60, "blacklisted")
+
+    assert await token_utils.is_token_blacklisted("token", "jti-1")
+    assert not await token_utils.is_token_blacklisted("token", "jti-2")
+
+
+def test_logout_revokes_the_token_by_jti(client, auth_headers):
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    jti = jwt.get_unverified_claims(token)["jti"]
+
+    response = client.post("/auth/logout", headers=auth_headers)
+
+    assert response.status_code == 200
+    # The token is cached by now, so revocation is checked on cache hits too
+    assert client.get("/users/", headers=auth_headers).status_code == 401
+    assert token_utils.revocation_filter.contains(jti)
+
+
+@pytest.mark.anyio
+async def test_blacklist_stores_the_jti_key():
+    expire_time = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+    assert await token_utils.blacklist_token("token", expire_time, "jti-1")
+
+    assert await conf.redis_client.exists(f"{BLACKLIST_PREFIX}jti-1")
+    assert not await conf.redis_client.exists(f"{BLACKLIST_PREFIX}token")
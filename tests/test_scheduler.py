@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.conf import CRAWL_MAX_INTERVAL, CRAWL_MIN_INTERVAL, CRAWL_TARGET_CHANGES
+from app.scraper import scheduler
+from app.scraper.scheduler import (
+    CrawlScheduler,
+    RequestBudget,
+    next_interval,
+    priority,
+)
+
+NOW = datetime(2024, 1, 1, 12)
+
+
+def _entry(**fields):
+    return {
+        "interval": 3600.0,
+        "churn_rate": 0.0,
+        "last_run_at": NOW - timedelta(hours=1),
+        "runs": 0,
+        **fields,
+    }
+
+
+def test_interval_targets_the_expected_changes_per_crawl():
+    churn_rate, interval = next_interval(_entry(), processed=20, changed=10, now=NOW)
+
+    assert churn_rate == 10
+    assert interval == CRAWL_TARGET_CHANGES / 10 * 3600
+
+
+def test_churn_rate_is_smoothed_after_the_first_run():
+    churn_rate, _ = next_interval(
+        _entry(runs=3, churn_rate=2.0), processed=20, changed=10, now=NOW
+    )
+
+    assert churn_rate == 6
+
+
+def test_quiet_makes_back_off_up_to_the_maximum():
+    _, doubled = next_interval(_entry(), processed=20, changed=0, now=NOW)
+    _, capped = next_interval(
+        _entry(interval=CRAWL_MAX_INTERVAL), processed=20, changed=0, now=NOW
+    )
+
+    assert doubled == 7200
+    assert capped == CRAWL_MAX_INTERVAL
+
+
+def test_fully_new_page_halves_the_interval():
+    _, interval = next_interval(
+        _entry(interval=7200.0), processed=1, changed=1, now=NOW
+    )
+
+    assert interval == max(3600, CRAWL_MIN_INTERVAL)
+
+
+def test_priority_is_the_expected_pending_changes():
+    assert priority(_entry(last_run_at=None), NOW) == float("inf")
+    assert priority(_entry(churn_rate=3.0), NOW) == 3.0
+
+
+def test_budget_refills_over_time(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: clock[0])
+    budget = RequestBudget(requests_per_hour=3600)
+
+    assert budget.available() == 60
+    budget.take(60)
+    assert budget.available() == 0
+    clock[0] += 10
+    assert budget.available() == 10
+    clock[0] += 3600
+    assert budget.available() == 60
+
+
+class FakeParser:
+    site_name = "AutoRia"
+    crawl_pages = [1]
+
+    async def get_car_brands(self, preferred_makes):
+        return preferred_makes
+
+
+@pytest.mark.anyio
+async def test_run_once_starts_the_most_urgent_crawls_within_budget(monkeypatch):
+    crawled = []
+
+    async def fake_process_make(parser, make, semaphore, writer=None):
+        crawled.append(make)
+        return {"processed": 10, "saved": 5, "errors": 0}
+
+    monkeypatch.setattr(scheduler, "create_parser", lambda site: FakeParser())
+    monkeypatch.setattr(scheduler, "process_make", fake_process_make)
+    crawl_scheduler = CrawlScheduler(
+        ["autoria"], ["Audi", "BMW", "Skoda"], requests_per_hour=180, concurrency=5
+    )
+    await crawl_scheduler.setup()
+    now = datetime.now()
+    collection = crawl_scheduler.schedule.collection
+    for make, churn_rate in [("Audi", 1.0), ("BMW", 9.0), ("Skoda", 4.0)]:
+        await collection.update_one(
+            {"make": make},
+            {
+                "$set": {
+                    "churn_rate": churn_rate,
+                    "last_run_at": now - timedelta(hours=1),
+                    "runs": 1,
+                }
+            },
+        )
+
+    # setup spent one of the three requests in the bucket on the makes list
+    await crawl_scheduler.run_once()
+    await asyncio.gather(*crawl_scheduler.tasks)
+
+    assert crawled == ["BMW", "Skoda"]
+    entries = {e["make"]: e async for e in collection.find()}
+    assert entries["BMW"]["runs"] == 2
+    assert entries["BMW"]["next_run_at"] > now
+    assert entries["Audi"]["runs"] == 1
+    assert not crawl_scheduler.running
+
+
+@pytest.mark.anyio
+async def test_claimed_entries_are_not_due_while_running(monkeypatch):
+    monkeypatch.setattr(scheduler, "create_parser", lambda site: FakeParser())
+    crawl_scheduler = CrawlScheduler(["autoria"], ["Audi"], requests_per_hour=3600)
+    await crawl_scheduler.setup()
+    [entry] = await crawl_scheduler.schedule.get_due("AutoRia", ["Audi"], NOW.max)
+
+    await crawl_scheduler.schedule.claim(entry, datetime.now() + timedelta(hours=1))
+
+    assert (
+        await crawl_scheduler.schedule.get_due("AutoRia", ["Audi"], datetime.now())
+        == []
+    )
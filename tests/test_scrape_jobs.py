@@ -0,0 +1,208 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.db.scrape_jobs_db import ScrapeJobCRUD
+from app.exceptions.scrape_exceptions import (
+    ScrapeJobLimitException,
+    ScrapeJobStartException,
+)
+from app.schemas.scrape import ScrapeJobCreate
+from app.scraper import job as job_worker
+from app.utils import scrape_jobs
+from app.utils.scrape_jobs import ScrapeJobManager, scrape_job_manager
+
+
+@pytest.fixture
+async def jobs():
+    job_crud = ScrapeJobCRUD()
+    await job_crud.create_indexes()
+    return job_crud
+
+
+def _exiting_with(code):
+    """Replace the job worker command with a process exiting with ``code``."""
+
+    async def create_subprocess_exec(*args, **kwargs):
+        return await asyncio.subprocess.create_subprocess_exec(
+            sys.executable, "-c", f"raise SystemExit({code})"
+        )
+
+    return create_subprocess_exec
+
+
+@pytest.mark.anyio
+async def test_jobs_are_admitted_into_free_slots_only(jobs):
+    results = await asyncio.gather(
+        *(
+            jobs.create_job(ScrapeJobCreate(site="autoria"), max_jobs=2)
+            for _ in range(5)
+        ),
+        return_exceptions=True,
+    )
+    admitted = [result for result in results if isinstance(result, dict)]
+
+    assert sorted(job["slot"] for job in admitted) == [0, 1]
+    assert all(
+        isinstance(result, ScrapeJobLimitException)
+        for result in results
+        if not isinstance(result, dict)
+    )
+
+    await jobs.finish(admitted[0]["id"], "completed")
+    again = await jobs.create_job(ScrapeJobCreate(site="autoria"), max_jobs=2)
+    assert again["slot"] == admitted[0]["slot"]
+
+
+@pytest.mark.anyio
+async def test_orphaned_jobs_are_failed_and_free_their_slot(jobs):
+    stale = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    live = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    await jobs.collection.update_one(
+        {"_id": ObjectId(stale["id"])},
+        {"$set": {"heartbeat_at": datetime.now() - timedelta(hours=1)}},
+    )
+
+    assert await jobs.fail_orphaned() == 1
+
+    failed = await jobs.get_job(stale["id"])
+    assert failed["status"] == "failed"
+    assert "slot" not in failed
+    assert (await jobs.get_job(live["id"]))["status"] == "queued"
+
+
+@pytest.mark.anyio
+async def test_failed_spawn_fails_the_job(jobs, monkeypatch):
+    async def no_fork(*args, **kwargs):
+        raise OSError("fork failed")
+
+    monkeypatch.setattr(scrape_jobs.asyncio, "create_subprocess_exec", no_fork)
+    job = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+
+    with pytest.raises(ScrapeJobStartException):
+        await ScrapeJobManager().start(job["id"])
+
+    failed = await jobs.get_job(job["id"])
+    assert failed["status"] == "failed"
+    assert "fork failed" in failed["error"]
+
+
+@pytest.mark.anyio
+async def test_worker_exit_status_decides_the_job_status(jobs, monkeypatch):
+    monkeypatch.setattr(scrape_jobs.asyncio, "create_subprocess_exec", _exiting_with(3))
+    manager = ScrapeJobManager()
+    crashed = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    cancelled = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    await jobs.request_cancel(cancelled["id"])
+
+    await manager.start(crashed["id"])
+    await manager.start(cancelled["id"])
+    await asyncio.wait(manager._watchers)
+
+    assert (await jobs.get_job(crashed["id"]))["error"] == "Worker exited with 3"
+    assert (await jobs.get_job(cancelled["id"]))["status"] == "cancelled"
+    assert not manager.processes
+
+
+@pytest.mark.anyio
+async def test_shutdown_terminates_running_workers(jobs, monkeypatch):
+    async def sleeping_worker(*args, **kwargs):
+        return await asyncio.subprocess.create_subprocess_exec(
+            sys.executable, "-c", "import time; time.sleep(30)"
+        )
+
+    monkeypatch.setattr(scrape_jobs.asyncio, "create_subprocess_exec", sleeping_worker)
+    manager = ScrapeJobManager()
+    job = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    await manager.start(job["id"])
+    process = manager.processes[job["id"]]
+
+    await manager.shutdown(timeout=5)
+
+    assert process.returncode is not None
+    assert not manager.processes
+
+
+@pytest.mark.anyio
+async def test_run_job_records_progress_and_stops_on_cancel(jobs, monkeypatch):
+    job = await jobs.create_job(ScrapeJobCreate(site="autoria", makes=["Audi"]))
+
+    async def fake_run(site, threads, makes, on_make_done):
+        await on_make_done({"processed": 4, "saved": 3, "errors": 1})
+        await jobs.request_cancel(job["id"])
+        await on_make_done({"processed": 2, "saved": 0, "errors": 0})
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(job_worker, "run", fake_run)
+
+    assert await job_worker.run_job(job["id"]) == "cancelled"
+
+    stored = await jobs.get_job(job["id"])
+    assert stored["status"] == "cancelled"
+    assert stored["progress"] == {
+        "makes_done": 2,
+        "processed": 6,
+        "saved": 3,
+        "errors": 1,
+    }
+
+
+@pytest.mark.anyio
+async def test_run_job_reports_scraper_failures(jobs):
+    job = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+    await jobs.collection.update_one(
+        {"_id": ObjectId(job["id"])}, {"$set": {"site": "unknown"}}
+    )
+
+    assert await job_worker.run_job(job["id"]) == "failed"
+
+    assert "unknown" in (await jobs.get_job(job["id"]))["error"]
+
+
+@pytest.mark.anyio
+async def test_reaped_job_stops_itself(jobs, monkeypatch):
+    job = await jobs.create_job(ScrapeJobCreate(site="autoria"))
+
+    async def stalled_run(site, threads, makes, on_make_done):
+        reaped.append(await jobs.fail_orphaned(timeout=-1))
+        await asyncio.sleep(5)
+
+    reaped = []
+
+    monkeypatch.setattr(job_worker, "SCRAPE_JOB_HEARTBEAT", 0.01)
+    monkeypatch.setattr(job_worker, "run", stalled_run)
+
+    assert await asyncio.wait_for(job_worker.run_job(job["id"]), 2) == "cancelled"
+    assert reaped == [1]
+    assert (await jobs.get_job(job["id"]))["status"] == "failed"
+
+
+def test_job_endpoints(client, auth_headers, monkeypatch):
+    started = []
+
+    async def start(job_id):
+        started.append(job_id)
+
+    monkeypatch.setattr(scrape_job_manager, "start", start)
+
+    created = client.post(
+        "/scrape/jobs",
+        json={"site": "autoria", "makes": ["Audi"]},
+        headers=auth_headers,
+    )
+    job_id = created.json()["id"]
+    cancelled = client.post(f"/scrape/jobs/{job_id}/cancel", headers=auth_headers)
+    client.portal.call(ScrapeJobCRUD().finish, job_id, "cancelled")
+    again = client.post(f"/scrape/jobs/{job_id}/cancel", headers=auth_headers)
+
+    assert created.status_code == 202
+    assert started == [job_id]
+    assert cancelled.json()["cancel_requested"] is True
+    assert again.status_code == 409
+    assert client.get("/scrape/jobs/nope", headers=auth_headers).status_code == 404
+    assert [
+        job["status"] for job in client.get("/scrape/jobs", headers=auth_headers).json()
+    ] == ["cancelled"]
@@ -0,0 +1,116 @@
+import gzip
+
+import orjson
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.schemas.cars import CarCreate
+from app.scraper import scraper
+from app.scraper.parsers.base import BaseParser
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.sinks import (
+    FanOutSink,
+    JsonlSink,
+    MongoSink,
+    NullSink,
+    create_sink,
+)
+from tests.conftest import days_ago, make_car
+
+
+class FakeParser(BaseParser):
+    async def get_content(self, make, page=1):
+        return None
+
+    def parse_data(self, content, make=""):
+        return []
+
+    async def stream_cars(self, make):
+        for index in range(3):
+            yield Listing(
+                **make_car(index, make=make, source_url=f"https://x.com/{make}/{index}")
+            )
+
+    async def get_car_brands(self, preferred_makes):
+        return preferred_makes
+
+
+@pytest.fixture
+def fake_site(monkeypatch):
+    monkeypatch.setattr(
+        scraper, "create_parser", lambda site: FakeParser("https://x.com", "AutoRia")
+    )
+
+
+def _lines(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as file:
+        return [orjson.loads(line) for line in file.read().splitlines()]
+
+
+def test_create_sink_builds_sinks_from_a_spec(tmp_path):
+    fanout = create_sink(f"mongo, jsonl:{tmp_path}/cars.jsonl")
+
+    assert isinstance(create_sink("null"), NullSink)
+    assert isinstance(fanout, FanOutSink)
+    assert [type(sink) for sink in fanout.sinks] == [MongoSink, JsonlSink]
+    with pytest.raises(ValueError):
+        create_sink("kafka:cars")
+    with pytest.raises(ValueError):
+        create_sink("jsonl")
+    with pytest.raises(ValueError):
+        create_sink(" , ")
+
+
+@pytest.mark.anyio
+async def test_jsonl_sink_buffers_and_appends(tmp_path):
+    path = tmp_path / "out" / "cars.jsonl.gz"
+    cars = [CarCreate(**make_car(index)) for index in range(3)]
+
+    sink = JsonlSink(str(path), buffer_bytes=1 << 20)
+    assert await sink.write(cars[:2]) == ["created", "created"]
+    assert sink.buffered > 0
+    await sink.close()
+    sink = JsonlSink(str(path), buffer_bytes=1)
+    await sink.write(cars[2:])
+    assert sink.buffered == 0
+    await sink.close()
+
+    lines = _lines(path)
+    assert [line["source_url"] for line in lines] == [
+        make_car(index)["source_url"] for index in range(3)
+    ]
+    assert all("scraped_at" in line for line in lines)
+
+
+@pytest.mark.anyio
+async def test_run_writes_to_a_file_without_touching_mongo(fake_site, tmp_path):
+    path = tmp_path / "cars.jsonl"
+
+    results = await scraper.run("fake", 2, ["Audi", "BMW"], sink=f"jsonl:{path}")
+
+    assert results == {"processed": 6, "saved": 6, "errors": 0}
+    assert len(_lines(path)) == 6
+    assert await CarCRUD().collection.count_documents({}) == 0
+
+
+@pytest.mark.anyio
+async def test_run_fans_out_and_mongo_archives_unseen_listings(fake_site, tmp_path):
+    path = tmp_path / "cars.jsonl"
+    car_crud = CarCRUD()
+    await car_crud.create_car(make_car(9, source_url="https://x.com/Audi/9"))
+    await car_crud.collection.update_many({}, {"$set": {"last_seen_at": days_ago(90)}})
+
+    results = await scraper.run("fake", 2, ["Audi"], sink=f"mongo,jsonl:{path}")
+
+    assert results["saved"] == 3
+    assert len(_lines(path)) == 3
+    assert await car_crud.collection.count_documents({}) == 3
+    assert await car_crud.archive.count_documents({}) == 1
+
+
+@pytest.mark.anyio
+async def test_null_sink_counts_nothing_as_saved(fake_site):
+    results = await scraper.run("fake", 2, ["Audi"], sink="null")
+
+    assert results == {"processed": 3, "saved": 0, "errors": 0}
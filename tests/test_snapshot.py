@@ -0,0 +1,99 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from bson import ObjectId
+
+from app.db.car_db import CarCRUD
+from app.endpoints import admin
+from app.utils.snapshot import STATE_FILE, SNAPSHOT_SCHEMA, write_snapshot
+from tests.conftest import make_car
+
+
+def _read(path):
+    return pq.read_table(path, partitioning=None)
+
+
+@pytest.mark.anyio
+async def test_full_snapshot_partitions_by_site_and_year(tmp_path):
+    car_crud = CarCRUD()
+    await car_crud.create_car(make_car(1, year=2015))
+    await car_crud.create_car(make_car(2, year=2015))
+    await car_crud.create_car(make_car(3, year=2018, source_site="Auto Bazar"))
+
+    summary = await write_snapshot(str(tmp_path), incremental=False, batch_size=1)
+
+    assert summary["rows"] == 3
+    assert summary["files"] == 2
+    autoria = list((tmp_path / "source_site=AutoRia" / "year=2015").glob("*.parquet"))
+    bazar = list(
+        (tmp_path / "source_site=Auto%20Bazar" / "year=2018").glob("*.parquet")
+    )
+    assert len(autoria) == len(bazar) == 1
+
+    parquet = pq.ParquetFile(autoria[0])
+    table = _read(autoria[0])
+    assert table.num_rows == 2
+    # One row group per cursor batch
+    assert parquet.metadata.num_row_groups == 2
+    assert table.schema.field("price").type == pa.float64()
+    assert table.schema.field("make").type == SNAPSHOT_SCHEMA.field("make").type
+
+
+@pytest.mark.anyio
+async def test_incremental_snapshot_appends_changed_cars_only(tmp_path):
+    car_crud = CarCRUD()
+    first = await car_crud.create_car(make_car(1))
+    await car_crud.create_car(make_car(2))
+    await write_snapshot(str(tmp_path))
+
+    unchanged = await write_snapshot(str(tmp_path))
+    await car_crud.collection.update_one(
+        {"_id": ObjectId(first["id"])},
+        {"$set": {"updated_at": datetime.now() + timedelta(seconds=1)}},
+    )
+    changed = await write_snapshot(str(tmp_path))
+
+    assert unchanged["rows"] == 0
+    assert changed["rows"] == 1
+    state = json.loads((tmp_path / STATE_FILE).read_text())
+    assert state["run_id"] == changed["run_id"]
+    parts = sorted((tmp_path / "source_site=AutoRia" / "year=2015").glob("*.parquet"))
+    assert sum(_read(part).num_rows for part in parts) == 3
+
+
+@pytest.mark.anyio
+async def test_full_snapshot_only_clears_snapshot_files(tmp_path):
+    await CarCRUD().create_car(make_car(1))
+    await write_snapshot(str(tmp_path))
+    await write_snapshot(str(tmp_path), incremental=False)
+    (tmp_path / "notes.txt").write_text("keep me")
+
+    await write_snapshot(str(tmp_path), incremental=False)
+
+    assert len(list(tmp_path.glob("source_site=*/year=*/*.parquet"))) == 1
+    assert (tmp_path / "notes.txt").read_text() == "keep me"
+
+
+def test_admin_snapshot_runs_in_background(client, auth_headers, monkeypatch, tmp_path):
+    monkeypatch.setattr(admin, "SNAPSHOT_DIR", str(tmp_path))
+    client.post("/cars/", json=make_car(1), headers=auth_headers)
+
+    response = client.post("/admin/snapshots", headers=auth_headers)
+
+    assert response.status_code == 202
+    assert json.loads((tmp_path / STATE_FILE).read_text())["rows"] == 1
+    assert not admin.snapshot_lock.locked()
+
+
+def test_admin_snapshot_rejects_overlapping_runs(client, auth_headers, monkeypatch):
+    lock = asyncio.Lock()
+    monkeypatch.setattr(admin, "snapshot_lock", lock)
+    asyncio.run(lock.acquire())
+
+    response = client.post("/admin/snapshots", headers=auth_headers)
+
+    assert response.status_code == 409
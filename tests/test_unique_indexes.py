@@ -0,0 +1,69 @@
+import pytest
+
+from app.db.car_db import CarCRUD
+from app.db.users_db import UserCRUD
+from app.exceptions.car_exceptions import CarAlreadyExistsException
+from app.exceptions.user_exceptions import UserAlreadyExistsException
+from app.schemas.users import UserCreate, UserUpdate
+from tests.conftest import make_car
+
+
+def _user(username, email):
+    return UserCreate(username=username, email=email, password="password1")
+
+
+@pytest.mark.anyio
+async def test_duplicate_users_are_rejected_by_the_indexes():
+    user_crud = UserCRUD()
+    await user_crud.create_indexes()
+    await user_crud.create_user(_user("alice", "alice@example.com"))
+    bob = await user_crud.create_user(_user("bob", "bob@example.com"))
+
+    with pytest.raises(UserAlreadyExistsException):
+        await user_crud.create_user(_user("alice2", "alice@example.com"))
+    with pytest.raises(UserAlreadyExistsException):
+        await user_crud.create_user(_user("alice", "other@example.com"))
+    with pytest.raises(UserAlreadyExistsException):
+        await user_crud.update_user(bob["id"], UserUpdate(username="alice"))
+
+
+@pytest.mark.anyio
+async def test_user_indexes_fail_while_duplicates_are_stored():
+    user_crud = UserCRUD()
+    await user_crud.collection.insert_many(
+        [
+            {"email": "a@example.com", "username": "a"},
+            {"email": "a@example.com", "username": "b"},
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="unique email index"):
+        await user_crud.create_indexes()
+
+
+@pytest.mark.anyio
+async def test_duplicate_listing_is_rejected_by_the_index():
+    car_crud = CarCRUD()
+    await car_crud.create_indexes()
+    await car_crud.create_car(make_car(1))
+
+    with pytest.raises(CarAlreadyExistsException):
+        await car_crud.create_car(make_car(1, price=1.0))
+    assert await car_crud.collection.count_documents({}) == 1
+
+
+@pytest.mark.anyio
+async def test_car_indexes_fail_while_duplicate_listings_are_stored():
+    car_crud = CarCRUD()
+    await car_crud.collection.insert_many([make_car(1), make_car(1)])
+
+    with pytest.raises(RuntimeError, match="merge-listings"):
+        await car_crud.create_indexes()
+
+
+def test_duplicate_user_returns_409(client, auth_headers):
+    user = {"username": "admin", "email": "new@example.com", "password": "password1"}
+
+    response = client.post("/users/", json=user, headers=auth_headers)
+
+    assert response.status_code == 409
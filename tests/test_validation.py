@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.schemas.cars import CarCreate
+from app.scraper.scraper import process_make
+from app.scraper.utils.car_writer import CarWriter
+from app.scraper.utils.listing import Listing
+from app.scraper.utils.sinks import NullSink
+from app.scraper.utils.validation import validate_cars
+from tests.conftest import make_car
+
+
+def _listing(index, **fields):
+    return Listing(**make_car(index, **fields))
+
+
+def test_valid_batch_is_validated_in_order():
+    listings = [_listing(index) for index in range(3)]
+
+    cars, reasons = validate_cars(listings)
+
+    assert reasons == {}
+    assert cars == [
+        CarCreate.model_validate(listing, from_attributes=True) for listing in listings
+    ]
+
+
+def test_invalid_rows_are_reported_with_every_reason():
+    listings = [
+        _listing(1),
+        _listing(2, year=1800, price=-1.0),
+        _listing(3, source_url="not a url"),
+    ]
+
+    cars, reasons = validate_cars(listings)
+
+    assert cars[0].make == "Audi"
+    assert cars[1:] == [None, None]
+    assert [reason.split(":")[0] for reason in reasons[1]] == ["year", "price"]
+    assert [reason.split(":")[0] for reason in reasons[2]] == ["source_url"]
+
+
+@pytest.mark.anyio
+async def test_invalid_rows_count_as_errors_of_their_make():
+    class Parser:
+        async def stream_cars(self, make):
+            yield _listing(1)
+            yield _listing(2, model="")
+            yield _listing(3)
+
+    async with CarWriter(NullSink(), flush_interval_ms=10) as writer:
+        results = await process_make(
+            Parser(), "Audi", asyncio.Semaphore(1), writer=writer
+        )
+
+    assert results == {"processed": 3, "saved": 0, "errors": 1}
+    assert (writer.invalid, writer.written) == (1, 2)